@@ -0,0 +1,116 @@
+"""Import-time regression check based on `python -X importtime`.
+
+Each target module is imported in a fresh interpreter with `DB_URL` unset.
+The check fails if a target pulls in a module it must not depend on, fails
+to import, or takes longer than its budget (best of several runs, since
+single measurements are noisy).
+
+Usage:
+    python -m benchmarks.import_time [--runs N]
+
+Exits with status 1 if any check fails.
+"""
+import argparse
+import os
+import subprocess
+import sys
+from dataclasses import dataclass, field
+
+HEAVY = ("sqlalchemy", "bcrypt", "asyncpg", "aiosqlite", "pydantic")
+
+
+@dataclass
+class ImportCheck:
+    module: str
+    budget_ms: float
+    forbidden: tuple[str, ...] = field(default_factory=tuple)
+
+
+CHECKS = [
+    ImportCheck("project_management_core.domain.services", budget_ms=50, forbidden=HEAVY),
+    ImportCheck(
+        "project_management_core.domain.services.project_service",
+        budget_ms=400,
+        forbidden=("sqlalchemy", "bcrypt", "asyncpg", "aiosqlite"),
+    ),
+    ImportCheck(
+        "project_management_core.domain.services.user_service",
+        budget_ms=50,
+        forbidden=HEAVY,
+    ),
+    ImportCheck(
+        "project_management_core.infrastructure.repositories.db.connection",
+        budget_ms=1000,
+        forbidden=("asyncpg", "aiosqlite"),
+    ),
+]
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """Import `module` in a fresh interpreter.
+
+    Returns:
+        The cumulative import time of `module` in milliseconds, and the
+        names of every module imported along the way.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    env = {key: value for key, value in os.environ.items() if key != "DB_URL"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+
+    cumulative_us = 0
+    imported = set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        imported.add(name)
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+def run(checks: list[ImportCheck], runs: int) -> bool:
+    """Run every check and print a report; return True if all passed."""
+    ok = True
+    for check in checks:
+        try:
+            samples = [measure(check.module) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"FAIL {check.module}: import failed: {e}")
+            ok = False
+            continue
+        best_ms = min(ms for ms, _ in samples)
+        imported = samples[0][1]
+        leaked = sorted(
+            name for name in check.forbidden
+            if any(mod == name or mod.startswith(name + ".") for mod in imported)
+        )
+        passed = not leaked and best_ms <= check.budget_ms
+        ok &= passed
+        status = "ok  " if passed else "FAIL"
+        print(f"{status} {check.module}: {best_ms:.1f} ms (budget {check.budget_ms:.0f} ms)")
+        if leaked:
+            print(f"     imports forbidden modules: {', '.join(leaked)}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="imports per module; the fastest counts")
+    args = parser.parse_args()
+    sys.exit(0 if run(CHECKS, args.runs) else 1)
+
+
+if __name__ == "__main__":
+    main()
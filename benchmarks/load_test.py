@@ -0,0 +1,338 @@
+"""Mixed-workload load generator for the application services.
+
+Simulates `--concurrency` users, each repeatedly picking an operation from
+the workload mix and running it through `UserService`, `ProjectService`
+or `DocumentService` on a fresh session, as a request handler would. After
+`--duration` seconds it prints throughput, error rates and p50/p95/p99
+latency per operation, plus how long operations waited for their first
+pooled connection.
+
+Runs against a throwaway SQLite file by default; pass `--url` (or set
+`LOAD_TEST_DB_URL`) to use a local PostgreSQL database instead. With
+`--sqlite-profile`, a SQLite database is opened through the embedded
+profile (one writer, `--sqlite-readers` readers, WAL and tuned pragmas)
+instead of a plain pool. All tables are dropped and recreated, so never
+point it at real data.
+
+Usage:
+    python -m benchmarks.load_test [--url URL] [--concurrency N] [--duration S]
+        [--mix register=1,login=4,...] [--pool-size N] [--json PATH]
+        [--sqlite-profile [--sqlite-readers N]]
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter, defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.services.document_service import DocumentService
+from project_management_core.domain.services.password_hasher import PasswordHasher, UnknownEmailCache
+from project_management_core.domain.services.project_service import ProjectService
+from project_management_core.domain.services.user_service import UserService
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    Base,
+    ProjectModel,
+    UserModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.routing import RoutingSession
+from project_management_core.infrastructure.repositories.db.sqlite import create_sqlite_engines
+from project_management_core.infrastructure.repositories.db.user_repository_impl import (
+    UserRepositoryImpl,
+)
+
+OPERATIONS = (
+    "register", "login", "create_project", "add_member", "upload_document", "list_documents", "delete_document",
+)
+DEFAULT_MIX = (
+    "register=1,login=4,create_project=1,add_member=1,upload_document=2,list_documents=6,delete_document=1"
+)
+PASSWORD = "load-test-password"
+CONNECTED_KEY = "load_test_connected"
+
+
+class Skip(Exception):
+    """Raised by an operation whose preconditions aren't met yet (e.g. no documents)."""
+
+
+@dataclass
+class WorkloadState:
+    """Users, projects and documents created so far, shared by all virtual users."""
+    users: list[tuple[int, str]] = field(default_factory=list)
+    projects: list[tuple[int, int]] = field(default_factory=list)
+    documents: dict[int, tuple[int, int]] = field(default_factory=dict)
+
+
+@dataclass
+class OperationStats:
+    latencies: list[float] = field(default_factory=list)
+    pool_waits: list[float] = field(default_factory=list)
+    errors: Counter = field(default_factory=Counter)
+
+    @property
+    def count(self) -> int:
+        return len(self.latencies) + sum(self.errors.values())
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `samples`; 0 if there are none."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))]
+
+
+class Workload:
+    """The operations a virtual user can run, bound to shared state."""
+    def __init__(self, state: WorkloadState, upload_dir: str, hasher: PasswordHasher, file_size: int):
+        self.state = state
+        self.upload_dir = upload_dir
+        self.hasher = hasher
+        self.unknown_emails = UnknownEmailCache()
+        self.file_size = file_size
+
+    def users(self, session: AsyncSession) -> UserService:
+        return UserService(UserRepositoryImpl(session), self.hasher, self.unknown_emails)
+
+    def projects(self, session: AsyncSession) -> ProjectService:
+        return ProjectService(ProjectRepositoryImpl(session))
+
+    def documents(self, session: AsyncSession) -> DocumentService:
+        return DocumentService(DocumentRepositoryImpl(session), upload_dir=self.upload_dir)
+
+    async def register(self, session: AsyncSession) -> None:
+        email = f"load-{uuid.uuid4().hex}@example.com"
+        user = await self.users(session).register_user(email, PASSWORD)
+        self.state.users.append((user.id, email))
+
+    async def login(self, session: AsyncSession) -> None:
+        _, email = random.choice(self.state.users)
+        await self.users(session).authenticate(email, PASSWORD)
+
+    async def create_project(self, session: AsyncSession) -> None:
+        owner_id, _ = random.choice(self.state.users)
+        project = await self.projects(session).create_project("Load test", "Created by the load generator", owner_id)
+        self.state.projects.append((project.id, owner_id))
+
+    async def add_member(self, session: AsyncSession) -> None:
+        project_id, owner_id = random.choice(self.state.projects)
+        user_id, _ = random.choice(self.state.users)
+        if user_id == owner_id:
+            raise Skip()
+        owner = User(id=owner_id, email="", password_hash="")
+        await self.projects(session).add_user_to_project(project_id, user_id, owner)
+
+    async def upload_document(self, session: AsyncSession) -> None:
+        project_id, owner_id = random.choice(self.state.projects)
+        document = await self.documents(session).upload_document(
+            io.BytesIO(os.urandom(self.file_size)), "load.bin", "application/octet-stream", project_id, owner_id
+        )
+        self.state.documents[document.id] = (document.project_id, owner_id)
+
+    async def list_documents(self, session: AsyncSession) -> None:
+        if not self.state.documents:
+            raise Skip()
+        project_id, _ = random.choice(list(self.state.documents.values()))
+        await self.documents(session).get_documents_for_project(project_id)
+
+    async def delete_document(self, session: AsyncSession) -> None:
+        if not self.state.documents:
+            raise Skip()
+        document_id = random.choice(list(self.state.documents))
+        _, owner_id = self.state.documents.pop(document_id)
+        await self.documents(session).delete_document(document_id, owner_id)
+
+
+def parse_mix(spec: str) -> dict[str, int]:
+    """Parse "op=weight,..." into a mapping, validating operation names."""
+    mix = {}
+    for part in filter(None, spec.split(",")):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation: {name}")
+        mix[name] = int(weight or 1)
+    if not mix or not any(mix.values()):
+        raise argparse.ArgumentTypeError("workload mix is empty")
+    return mix
+
+
+async def seed(session_maker: async_sessionmaker, hasher: PasswordHasher, state: WorkloadState, users: int) -> None:
+    """Insert `users` users that can log in, each owning one project."""
+    password_hash = await hasher.hash(PASSWORD)
+    async with session_maker() as session:
+        rows = (await session.execute(
+            UserModel.__table__.insert().returning(UserModel.id, UserModel.email),
+            [{"email": f"seed-{i}@example.com", "password_hash": password_hash} for i in range(users)],
+        )).all()
+        state.users.extend((row.id, row.email) for row in rows)
+        projects = (await session.execute(
+            ProjectModel.__table__.insert().returning(ProjectModel.id, ProjectModel.owner_id),
+            [{"name": f"Seed {user_id}", "description": "Seed project", "owner_id": user_id} for user_id, _ in state.users],
+        )).all()
+        state.projects.extend((row.id, row.owner_id) for row in projects)
+        await session.commit()
+
+
+async def virtual_user(
+    session_maker: async_sessionmaker,
+    operations: list[tuple[str, Callable[[AsyncSession], Awaitable[None]]]],
+    weights: list[int],
+    deadline: float,
+    stats: dict[str, OperationStats],
+) -> None:
+    while time.perf_counter() < deadline:
+        name, operation = random.choices(operations, weights)[0]
+        started = time.perf_counter()
+        try:
+            async with session_maker() as session:
+                await operation(session)
+                connected = session.info.get(CONNECTED_KEY, started)
+        except Skip:
+            await asyncio.sleep(0)
+            continue
+        except Exception as e:
+            stats[name].errors[type(e).__name__] += 1
+            continue
+        finished = time.perf_counter()
+        stats[name].latencies.append(finished - started)
+        stats[name].pool_waits.append(connected - started)
+
+
+def report(stats: dict[str, OperationStats], elapsed: float) -> dict:
+    """Print a summary table and return the same figures as a dict."""
+    summary = {"elapsed_s": elapsed, "operations": {}}
+    print(f"{'operation':<15}{'count':>8}{'ops/s':>9}{'errors':>8}{'err %':>7}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'pool p95':>10}")
+    all_waits = []
+    total = errors = 0
+    for name, op in sorted(stats.items()):
+        error_count = sum(op.errors.values())
+        row = {
+            "count": op.count,
+            "ops_per_s": op.count / elapsed,
+            "errors": dict(op.errors),
+            "error_rate": error_count / op.count if op.count else 0.0,
+            "p50_ms": percentile(op.latencies, 50) * 1000,
+            "p95_ms": percentile(op.latencies, 95) * 1000,
+            "p99_ms": percentile(op.latencies, 99) * 1000,
+            "pool_wait_p95_ms": percentile(op.pool_waits, 95) * 1000,
+        }
+        summary["operations"][name] = row
+        all_waits += op.pool_waits
+        total += op.count
+        errors += error_count
+        print(f"{name:<15}{row['count']:>8}{row['ops_per_s']:>9.1f}{error_count:>8}{row['error_rate'] * 100:>7.1f}"
+              f"{row['p50_ms']:>9.1f}{row['p95_ms']:>9.1f}{row['p99_ms']:>9.1f}{row['pool_wait_p95_ms']:>10.1f}")
+        for error, count in op.errors.most_common(3):
+            print(f"    {count} x {error}")
+    summary.update(
+        total=total,
+        throughput_ops_per_s=total / elapsed,
+        error_rate=errors / total if total else 0.0,
+        pool_wait_ms={
+            "mean": sum(all_waits) / len(all_waits) * 1000 if all_waits else 0.0,
+            "p50": percentile(all_waits, 50) * 1000,
+            "p95": percentile(all_waits, 95) * 1000,
+            "p99": percentile(all_waits, 99) * 1000,
+        },
+    )
+    wait = summary["pool_wait_ms"]
+    print(f"total: {total} operations in {elapsed:.1f} s = {summary['throughput_ops_per_s']:.1f} ops/s, "
+          f"{summary['error_rate'] * 100:.2f}% errors")
+    print(f"pool wait: mean {wait['mean']:.1f} ms, p50 {wait['p50']:.1f} ms, "
+          f"p95 {wait['p95']:.1f} ms, p99 {wait['p99']:.1f} ms")
+    return summary
+
+
+def _mark_connected(session: Session, transaction, connection) -> None:
+    # The first transaction starts as soon as the first connection is checked out.
+    session.info.setdefault(CONNECTED_KEY, time.perf_counter())
+
+
+async def run(args: argparse.Namespace, url: str, upload_dir: str) -> dict:
+    if args.sqlite_profile:
+        engine, readers = create_sqlite_engines(url, readers=args.sqlite_readers, pool_timeout=args.pool_timeout)
+        session_maker = async_sessionmaker(
+            engine, expire_on_commit=False, sync_session_class=RoutingSession, replicas=readers
+        )
+    else:
+        engine = create_async_engine(url, pool_size=args.pool_size, max_overflow=0, pool_timeout=args.pool_timeout)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    hasher = PasswordHasher(rounds=args.bcrypt_rounds, max_concurrency=args.hash_concurrency)
+    state = WorkloadState()
+    await seed(session_maker, hasher, state, args.seed_users)
+    workload = Workload(state, upload_dir, hasher, args.file_size)
+    operations = [(name, getattr(workload, name)) for name in args.mix]
+    weights = list(args.mix.values())
+    stats: dict[str, OperationStats] = defaultdict(OperationStats)
+
+    profile = " (SQLite profile)" if args.sqlite_profile else ""
+    print(f"{args.concurrency} users for {args.duration:.0f} s against {engine.url.render_as_string()}{profile}")
+    event.listen(Session, "after_begin", _mark_connected)
+    try:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(session_maker, operations, weights, deadline, stats) for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+    finally:
+        event.remove(Session, "after_begin", _mark_connected)
+    await engine.dispose()
+    if args.sqlite_profile and readers is not None:
+        for reader in readers.replicas:
+            await reader.dispose()
+    return report(stats, elapsed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("LOAD_TEST_DB_URL"),
+                        help="database to use (default: a temporary SQLite file)")
+    parser.add_argument("--concurrency", type=int, default=500, help="number of simulated users")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to generate load for")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+                        help=f"operation weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--pool-size", type=int, default=20, help="database connections in the pool")
+    parser.add_argument("--pool-timeout", type=float, default=30.0, help="seconds to wait for a connection")
+    parser.add_argument("--seed-users", type=int, default=100, help="users (each with a project) created up front")
+    parser.add_argument("--file-size", type=int, default=16 * 1024, help="bytes per uploaded document")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="bcrypt work factor for register/login")
+    parser.add_argument("--hash-concurrency", type=int, default=4, help="bcrypt hashes computed at once")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--sqlite-profile", action="store_true",
+                        help="open SQLite through the embedded profile instead of a plain pool")
+    parser.add_argument("--sqlite-readers", type=int, default=4, help="reader connections of the SQLite profile")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'load_test.db')}"
+        summary = asyncio.run(run(args, url, os.path.join(tmp, "uploads")))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
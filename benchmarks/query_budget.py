@@ -0,0 +1,148 @@
+"""Query budgets of the service calls.
+
+Seeds a database, runs each service call below under a `QueryBudget`
+and reports the statements it issued. The harness fails when a call
+issues more statements than its budget, or repeats one statement shape
+(an N+1 query: one statement per row instead of one for all rows). Set a
+budget to what the call needs today; lowering it after an optimization
+keeps the saving from regressing, and raising it is a reviewable change.
+
+Runs against a throwaway SQLite file by default; pass `--url` (or set
+`QUERY_BUDGET_DB_URL`) to use an empty PostgreSQL database instead. All
+tables are dropped and recreated, so never point it at real data.
+
+Usage:
+    python -m benchmarks.query_budget [--url URL] [--verbose]
+
+Exits with status 1 if any call exceeds its budget.
+"""
+import argparse
+import asyncio
+import io
+import os
+import sys
+import tempfile
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.query_plans import seed
+from project_management_core.domain.entities.document import DocumentFilter
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.services.document_service import DocumentService
+from project_management_core.domain.services.password_hasher import PasswordHasher
+from project_management_core.domain.services.project_service import ProjectService
+from project_management_core.domain.services.user_service import UserService
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import Base
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+)
+from project_management_core.infrastructure.repositories.db.user_repository_impl import (
+    UserRepositoryImpl,
+)
+
+SCALE = 50
+
+
+@dataclass
+class Budget:
+    """A service call and the most statements it may issue."""
+    name: str
+    max_queries: int
+    call: Callable[[AsyncSession, str], Awaitable[object]]
+
+
+def users(session: AsyncSession) -> UserService:
+    return UserService(UserRepositoryImpl(session), PasswordHasher(rounds=4))
+
+
+def projects(session: AsyncSession) -> ProjectService:
+    return ProjectService(ProjectRepositoryImpl(session))
+
+
+def documents(session: AsyncSession, upload_dir: str) -> DocumentService:
+    return DocumentService(DocumentRepositoryImpl(session), upload_dir=upload_dir)
+
+
+def owner(project_id: int) -> User:
+    return User(id=project_id, email=f"user{project_id}@example.com", password_hash="h")
+
+
+BUDGETS = [
+    Budget("UserService.register_user", 4,
+           lambda s, d: users(s).register_user("budget@example.com", "password")),
+    Budget("UserService.get_by_email", 1, lambda s, d: users(s).get_by_email("user2@example.com")),
+    Budget("ProjectService.create_project", 2,
+           lambda s, d: projects(s).create_project("Budget", "Query budget", 1)),
+    Budget("ProjectService.get_projects_for_user", 1, lambda s, d: projects(s).get_projects_for_user(1)),
+    Budget("ProjectService.get_project", 2, lambda s, d: projects(s).get_project(1)),
+    Budget("ProjectService.get_project_overview", 3, lambda s, d: projects(s).get_project_overview(1, 1)),
+    Budget("ProjectService.add_user_to_project", 5,
+           lambda s, d: projects(s).add_user_to_project(2, 40, owner(2))),
+    Budget("ProjectService.remove_user_from_project", 5,
+           lambda s, d: projects(s).remove_user_from_project(2, 40, owner(2))),
+    Budget("ProjectService.changes_since", 4, lambda s, d: projects(s).changes_since(1)),
+    Budget("DocumentService.upload_document", 6,
+           lambda s, d: documents(s, d).upload_document(io.BytesIO(b"budget"), "budget.txt", "text/plain", 1, 1)),
+    Budget("DocumentService.get_documents_for_project", 1,
+           lambda s, d: documents(s, d).get_documents_for_project(1)),
+    Budget("DocumentService.get_project_stats", 2, lambda s, d: documents(s, d).get_project_stats(1)),
+    Budget("DocumentService.list_documents", 1,
+           lambda s, d: documents(s, d).list_documents(1, DocumentFilter(min_size=1002), sort="file_size")),
+    Budget("DocumentService.search_documents", 1, lambda s, d: documents(s, d).search_documents(1, "report")),
+    Budget("DocumentService.get_recent_documents", 1, lambda s, d: documents(s, d).get_recent_documents(1)),
+    Budget("DocumentService.delete_document", 7,
+           lambda s, d: documents(s, d).delete_document(1, 2)),
+]
+
+
+async def run(url: str, upload_dir: str, verbose: bool) -> bool:
+    engine = create_async_engine(url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_maker, SCALE)
+
+    ok = True
+    for budget in BUDGETS:
+        checked = QueryBudget(budget.max_queries, label=budget.name)
+        async with session_maker() as session:
+            try:
+                async with checked:
+                    await budget.call(session, upload_dir)
+            except QueryBudgetExceededError:
+                pass
+        problems = checked.violations()
+        ok &= not problems
+        print(f"{'FAIL' if problems else 'ok  '} {budget.name}: {checked.count} statement(s), "
+              f"budget {budget.max_queries}" + (f" ({'; '.join(problems)})" if problems else ""))
+        if verbose or problems:
+            for recorded in checked.statements:
+                print("     " + " ".join(recorded.statement.split()))
+    await engine.dispose()
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("QUERY_BUDGET_DB_URL"),
+                        help="database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--verbose", action="store_true", help="print every statement issued")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'query_budget.db')}"
+        ok = asyncio.run(run(url, tmp, args.verbose))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
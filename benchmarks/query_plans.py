@@ -0,0 +1,323 @@
+"""Query-plan regression harness for the `*_repository_impl.py` modules.
+
+Seeds a database, calls every public method of the SQLAlchemy repository
+implementations while recording the SQL they issue, then runs `EXPLAIN`
+on each recorded statement. The harness fails when a hot query reads a
+whole table instead of using an index, or when a repository method has no
+scenario here (so new queries can't slip in unchecked).
+
+Runs against a throwaway SQLite file by default; pass `--url` (or set
+`QUERY_PLAN_DB_URL`) to check an empty PostgreSQL database instead. All
+tables are dropped and recreated, so never point it at real data. With
+`--sqlite-profile` the repositories run through the embedded SQLite
+profile (one writer connection, reads routed to a reader pool).
+
+Usage:
+    python -m benchmarks.query_plans [--url URL] [--scale N] [--sqlite-profile]
+
+Exits with status 1 if any check fails.
+"""
+import argparse
+import asyncio
+import inspect
+import os
+import re
+import sys
+import tempfile
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from project_management_core.domain.entities.document import Document, DocumentFilter
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    Base,
+    DocumentModel,
+    ProjectMember,
+    ProjectModel,
+    UserModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.routing import RoutingSession
+from project_management_core.infrastructure.repositories.db.sqlite import create_sqlite_engines
+from project_management_core.infrastructure.repositories.db.user_repository_impl import (
+    UserRepositoryImpl,
+)
+
+REPOSITORIES = (UserRepositoryImpl, ProjectRepositoryImpl, DocumentRepositoryImpl)
+
+
+@dataclass
+class Scenario:
+    """One repository call to record and explain.
+
+    `hot` scenarios must not scan whole tables; the rest (exports, rebuilds)
+    are reported but allowed to.
+    """
+    repository: type
+    method: str
+    call: Callable[[AsyncSession], Awaitable[object]]
+    hot: bool = True
+
+
+@dataclass
+class PlanReport:
+    scenario: Scenario
+    statements: list[tuple[str, list[str], list[str]]] = field(default_factory=list)
+
+    @property
+    def full_scans(self) -> list[str]:
+        return [table for _, _, scans in self.statements for table in scans]
+
+
+def scenarios(scale: int) -> list[Scenario]:
+    """Build the scenarios against the data produced by `seed`."""
+    user_id, project_id, member_id = 1, 1, 2
+    users = lambda s: UserRepositoryImpl(s)  # noqa: E731
+    projects = lambda s: ProjectRepositoryImpl(s)  # noqa: E731
+    documents = lambda s: DocumentRepositoryImpl(s)  # noqa: E731
+
+    async def update_user(s):
+        user = await users(s).get_by_id(user_id)
+        user.password_hash = "rehashed"
+        return await users(s).update(user)
+
+    async def stream_emails(s):
+        return [email async for email in users(s).stream_emails()]
+
+    async def stream_users(s):
+        return [user async for user in users(s).stream_all()]
+
+    async def stream_documents(s):
+        return [document async for document in documents(s).stream_by_project(project_id)]
+
+    async def feed_page_two(s):
+        page = await documents(s).get_feed_for_user(member_id, limit=5)
+        return await documents(s).get_feed_for_user(member_id, limit=5, before=page.next_cursor)
+
+    async def update_project(s):
+        project = await projects(s).get_by_id(project_id)
+        project.name = "renamed"
+        return await projects(s).update(project)
+
+    async def create_document(s):
+        return await documents(s).create(Document(
+            original_filename="new.pdf", generated_filename="new.pdf", file_path="new.pdf",
+            file_size=1, content_type="application/pdf", project_id=project_id, uploaded_by=user_id,
+        ))
+
+    async def insert_documents(s):
+        return await documents(s).insert_many([
+            {"original_filename": f"imported{i}.pdf", "generated_filename": f"imported{i}.pdf",
+             "file_path": f"imported{i}.pdf", "file_size": 1, "content_type": "application/pdf",
+             "project_id": project_id, "uploaded_by": user_id}
+            for i in range(2)
+        ])
+
+    return [
+        Scenario(UserRepositoryImpl, "create", lambda s: users(s).create(User(None, "new@example.com", "h"))),
+        Scenario(UserRepositoryImpl, "get_by_id", lambda s: users(s).get_by_id(user_id)),
+        Scenario(UserRepositoryImpl, "get_by_email", lambda s: users(s).get_by_email("user5@example.com")),
+        Scenario(UserRepositoryImpl, "email_exists", lambda s: users(s).email_exists("User5@Example.com")),
+        Scenario(UserRepositoryImpl, "stream_emails", stream_emails, hot=False),
+        Scenario(UserRepositoryImpl, "list_all", lambda s: users(s).list_all(), hot=False),
+        Scenario(UserRepositoryImpl, "stream_all", stream_users, hot=False),
+        Scenario(UserRepositoryImpl, "update", update_user),
+        Scenario(UserRepositoryImpl, "delete", lambda s: users(s).delete(scale)),
+        Scenario(ProjectRepositoryImpl, "create",
+                 lambda s: projects(s).create(Project(name="new", description="new", owner_id=user_id))),
+        Scenario(ProjectRepositoryImpl, "get_by_id", lambda s: projects(s).get_by_id(project_id)),
+        Scenario(ProjectRepositoryImpl, "get_for_user", lambda s: projects(s).get_for_user(member_id)),
+        Scenario(ProjectRepositoryImpl, "search_projects", lambda s: projects(s).search_projects(user_id, "project")),
+        Scenario(ProjectRepositoryImpl, "update", update_project),
+        Scenario(ProjectRepositoryImpl, "add_user_to_project",
+                 lambda s: projects(s).add_user_to_project(project_id, scale - 1)),
+        Scenario(ProjectRepositoryImpl, "add_members",
+                 lambda s: projects(s).add_members(project_id, {scale - 2: "participant", scale - 3: "participant"})),
+        Scenario(ProjectRepositoryImpl, "get_overview", lambda s: projects(s).get_overview(project_id)),
+        Scenario(ProjectRepositoryImpl, "get_project_with_members",
+                 lambda s: projects(s).get_project_with_members(project_id)),
+        Scenario(ProjectRepositoryImpl, "remove_user_from_project",
+                 lambda s: projects(s).remove_user_from_project(project_id, member_id + 1)),
+        Scenario(ProjectRepositoryImpl, "changes_since",
+                 lambda s: projects(s).changes_since(member_id, datetime.now() - timedelta(hours=1))),
+        Scenario(ProjectRepositoryImpl, "delete", lambda s: projects(s).delete(scale)),
+        Scenario(DocumentRepositoryImpl, "create", create_document),
+        Scenario(DocumentRepositoryImpl, "insert_many", insert_documents),
+        Scenario(DocumentRepositoryImpl, "get_by_id", lambda s: documents(s).get_by_id(1)),
+        Scenario(DocumentRepositoryImpl, "get_by_project", lambda s: documents(s).get_by_project(project_id)),
+        Scenario(DocumentRepositoryImpl, "stream_by_project", stream_documents),
+        Scenario(DocumentRepositoryImpl, "get_feed_for_user", feed_page_two),
+        Scenario(DocumentRepositoryImpl, "get_feed_for_user",
+                 lambda s: documents(s).get_feed_for_user(member_id, uploaded_by_user=True)),
+        Scenario(DocumentRepositoryImpl, "list_documents",
+                 lambda s: documents(s).list_documents(project_id, DocumentFilter(content_type="application/pdf"))),
+        Scenario(DocumentRepositoryImpl, "list_documents",
+                 lambda s: documents(s).list_documents(
+                     project_id, DocumentFilter(min_size=1002, max_size=1008), sort="file_size", descending=False
+                 )),
+        Scenario(DocumentRepositoryImpl, "list_documents",
+                 lambda s: documents(s).list_documents(
+                     project_id,
+                     DocumentFilter(uploaded_by=member_id, uploaded_after=datetime(2024, 1, 1),
+                                    uploaded_before=datetime(2024, 1, 2)),
+                     offset=20,
+                 )),
+        Scenario(DocumentRepositoryImpl, "search_by_filename",
+                 lambda s: documents(s).search_by_filename(project_id, "report")),
+        Scenario(DocumentRepositoryImpl, "get_project_stats", lambda s: documents(s).get_project_stats(project_id)),
+        Scenario(DocumentRepositoryImpl, "rebuild_project_stats",
+                 lambda s: documents(s).rebuild_project_stats(), hot=False),
+        Scenario(DocumentRepositoryImpl, "delete", lambda s: documents(s).delete(2)),
+    ]
+
+
+def uncovered_methods(checked: list[Scenario]) -> list[str]:
+    """Return public repository methods that no scenario exercises."""
+    covered = {(s.repository, s.method) for s in checked}
+    missing = []
+    for repository in REPOSITORIES:
+        for name, member in vars(repository).items():
+            if not name.startswith("_") and inspect.iscoroutinefunction(member) and (repository, name) not in covered:
+                missing.append(f"{repository.__name__}.{name}")
+    return missing
+
+
+async def seed(session_maker: async_sessionmaker, scale: int) -> None:
+    """Insert `scale` users and projects, 4 members and 10 documents per project."""
+    now = datetime(2024, 1, 1)
+    async with session_maker() as session:
+        await session.execute(UserModel.__table__.insert(), [
+            {"id": i, "email": f"user{i}@example.com", "password_hash": "h"} for i in range(1, scale + 1)
+        ])
+        await session.execute(ProjectModel.__table__.insert(), [
+            {"id": i, "name": f"Project {i}", "description": f"Project number {i}", "owner_id": i}
+            for i in range(1, scale + 1)
+        ])
+        await session.execute(ProjectMember.__table__.insert(), [
+            {"user_id": (p + k) % scale + 1, "project_id": p, "role": "participant"}
+            for p in range(1, scale + 1) for k in range(1, 5)
+        ])
+        await session.execute(DocumentModel.__table__.insert(), [
+            {
+                "original_filename": f"report_{p}_{k}.pdf", "generated_filename": f"{p}-{k}.pdf",
+                "file_path": f"uploads/{p}-{k}.pdf", "file_size": 1000 + k, "content_type": "application/pdf",
+                "project_id": p, "uploaded_by": (p + k) % scale + 1, "uploaded_at": now + timedelta(minutes=k),
+            }
+            for p in range(1, scale + 1) for k in range(10)
+        ])
+        await session.commit()
+        await DocumentRepositoryImpl(session).rebuild_project_stats()
+
+
+def full_scans(plan: list[str], dialect: str, tables: set[str]) -> list[str]:
+    """Return the base tables a plan reads in full."""
+    if dialect == "postgresql":
+        pattern = re.compile(r"Seq Scan on (\w+)")
+    else:
+        pattern = re.compile(r"^SCAN (\w+)(?! VIRTUAL TABLE)")
+    return [m.group(1) for line in plan if (m := pattern.search(line.strip())) and m.group(1) in tables]
+
+
+async def explain(engine, statement: str, parameters) -> list[str]:
+    prefix = "EXPLAIN " if engine.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN "
+    async with engine.connect() as conn:
+        result = await conn.exec_driver_sql(prefix + statement, parameters)
+        rows = result.all()
+    if engine.dialect.name == "postgresql":
+        return [row[0] for row in rows]
+    return [row[-1] for row in rows]
+
+
+async def run(url: str, scale: int, sqlite_profile: bool = False) -> bool:
+    readers = None
+    if sqlite_profile:
+        engine, readers = create_sqlite_engines(url)
+        session_maker = async_sessionmaker(
+            engine, expire_on_commit=False, sync_session_class=RoutingSession, replicas=readers
+        )
+    else:
+        engine = create_async_engine(url)
+        session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    engines = [engine, *(readers.replicas if readers is not None else [])]
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_maker, scale)
+    async with engine.begin() as conn:
+        await conn.exec_driver_sql("ANALYZE")
+
+    recorded: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and re.match(r"\s*(SELECT|UPDATE|DELETE|INSERT INTO \S+ \(.*\) SELECT|WITH)", statement, re.S):
+            recorded.append((statement, parameters))
+
+    tables = set(Base.metadata.tables)
+    checked = scenarios(scale)
+    reports = []
+    for scenario in checked:
+        recorded.clear()
+        for recorded_engine in engines:
+            event.listen(recorded_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            async with session_maker() as session:
+                await scenario.call(session)
+        finally:
+            for recorded_engine in engines:
+                event.remove(recorded_engine.sync_engine, "before_cursor_execute", record)
+        report = PlanReport(scenario)
+        for statement, parameters in list(recorded):
+            plan = await explain(engine, statement, parameters)
+            report.statements.append((statement, plan, full_scans(plan, engine.dialect.name, tables)))
+        reports.append(report)
+    for used_engine in engines:
+        await used_engine.dispose()
+
+    ok = True
+    for report in reports:
+        scenario = report.scenario
+        name = f"{scenario.repository.__name__}.{scenario.method}"
+        scans = report.full_scans
+        failed = bool(scans) and scenario.hot
+        ok &= not failed
+        status = "FAIL" if failed else ("scan" if scans else "ok  ")
+        print(f"{status} {name}: {len(report.statements)} statement(s)"
+              + (f", full scan of {', '.join(sorted(set(scans)))}" if scans else ""))
+        if failed:
+            for statement, plan, table_scans in report.statements:
+                if table_scans:
+                    print("     " + " ".join(statement.split()))
+                    for line in plan:
+                        print("       " + line)
+    missing = uncovered_methods(checked)
+    for method in missing:
+        print(f"FAIL {method}: no query-plan scenario")
+    return ok and not missing
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=os.getenv("QUERY_PLAN_DB_URL"),
+                        help="database to seed (default: a temporary SQLite file)")
+    parser.add_argument("--scale", type=int, default=2000, help="number of users and projects to seed")
+    parser.add_argument("--sqlite-profile", action="store_true",
+                        help="run the repositories through the embedded SQLite profile")
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite+aiosqlite:///{os.path.join(tmp, 'query_plans.db')}"
+        ok = asyncio.run(run(url, args.scale, args.sqlite_profile))
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
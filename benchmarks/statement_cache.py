@@ -0,0 +1,158 @@
+"""Per-call CPU cost of the hot repository queries, rebuilt vs cached.
+
+The hottest repository methods run statements built once per model and
+reused with bound parameters (`AsyncRepository._statement`), so every
+call skips constructing the statement and computing its cache key, and
+hits SQLAlchemy's compiled cache and asyncpg's prepared statements with
+the same SQL. This benchmark runs each method as it was before
+(statement rebuilt on every call, literal values inlined) and as it is
+now, on the same seeded database, and reports the process CPU time per
+call of each.
+
+Runs against a throwaway SQLite file by default; pass `--url` (or set
+`STATEMENT_CACHE_DB_URL`) to use an empty PostgreSQL database instead.
+All tables are dropped and recreated, so never point it at real data.
+
+Usage:
+    python -m benchmarks.statement_cache [--url URL] [--calls N]
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import func, literal, select, union
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.query_plans import seed
+from project_management_core.domain.value_objects.email import normalize_email
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+    to_document,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    Base,
+    DocumentModel,
+    ProjectMember,
+    ProjectModel,
+    UserModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectRepositoryImpl,
+    _to_project,
+)
+from project_management_core.infrastructure.repositories.db.user_repository_impl import (
+    UserRepositoryImpl,
+    _to_user,
+)
+
+Call = Callable[[AsyncSession, int], Awaitable[object]]
+
+
+async def rebuilt_get_by_project(session: AsyncSession, i: int):
+    query = select(DocumentModel).where(DocumentModel.project_id == i)
+    return [to_document(doc) for doc in (await session.execute(query)).scalars().all()]
+
+
+async def rebuilt_get_for_user(session: AsyncSession, i: int):
+    accessible_ids = union(
+        select(ProjectModel.id).where(ProjectModel.owner_id == i),
+        select(ProjectMember.project_id).where(ProjectMember.user_id == i),
+    )
+    query = select(ProjectModel).where(ProjectModel.id.in_(accessible_ids))
+    return [_to_project(row) for row in (await session.execute(query)).scalars().all()]
+
+
+async def rebuilt_get_by_email(session: AsyncSession, i: int):
+    query = select(UserModel).where(func.lower(UserModel.email) == normalize_email(f"User{i}@example.com"))
+    return _to_user((await session.execute(query)).scalar_one())
+
+
+async def rebuilt_add_member(session: AsyncSession, i: int):
+    repository = ProjectRepositoryImpl(session)
+    user_id = i % 50 + 1
+    candidate = select(
+        literal(user_id), ProjectModel.id, literal("participant")
+    ).where(ProjectModel.id == i, ProjectModel.owner_id != user_id)
+    stmt = (
+        repository._insert(ProjectMember)
+        .from_select(["user_id", "project_id", "role"], candidate)
+        .on_conflict_do_nothing(index_elements=["user_id", "project_id"])
+        .returning(ProjectMember.id)
+    )
+    members = (
+        select(
+            ProjectModel.id, ProjectModel.name, ProjectModel.description,
+            ProjectModel.owner_id, ProjectModel.version, ProjectMember.user_id,
+        )
+        .outerjoin(ProjectMember, ProjectMember.project_id == ProjectModel.id)
+        .where(ProjectModel.id == i)
+        .order_by(ProjectMember.id)
+    )
+    (await session.execute(stmt)).first()
+    rows = (await session.execute(members)).all()
+    await session.commit()
+    return rows
+
+
+async def cached_add_member(session: AsyncSession, i: int):
+    return await ProjectRepositoryImpl(session).add_user_to_project(i, i % 50 + 1)
+
+
+CASES: list[tuple[str, Call, Call]] = [
+    ("DocumentRepositoryImpl.get_by_project", rebuilt_get_by_project,
+     lambda s, i: DocumentRepositoryImpl(s).get_by_project(i)),
+    ("ProjectRepositoryImpl.get_for_user", rebuilt_get_for_user,
+     lambda s, i: ProjectRepositoryImpl(s).get_for_user(i)),
+    ("UserRepositoryImpl.get_by_email", rebuilt_get_by_email,
+     lambda s, i: UserRepositoryImpl(s).get_by_email(f"User{i}@example.com")),
+    ("ProjectRepositoryImpl.add_user_to_project", rebuilt_add_member, cached_add_member),
+]
+
+
+async def measure(session_maker: async_sessionmaker, call: Call, calls: int, scale: int) -> float:
+    """Return the process CPU seconds per call, after a warm-up round."""
+    async with session_maker() as session:
+        for i in range(1, 51):
+            await call(session, i)
+        started = time.process_time()
+        for n in range(calls):
+            await call(session, n % scale + 1)
+        return (time.process_time() - started) / calls
+
+
+async def run(url: str, calls: int, scale: int) -> None:
+    engine = create_async_engine(url)
+    session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    await seed(session_maker, scale)
+
+    print(f"{'query':<42} {'rebuilt':>10} {'cached':>10} {'saved':>10}")
+    for name, rebuilt, cached in CASES:
+        before = await measure(session_maker, rebuilt, calls, scale)
+        after = await measure(session_maker, cached, calls, scale)
+        print(f"{name:<42} {before * 1e6:>8.1f}us {after * 1e6:>8.1f}us "
+              f"{(before - after) * 1e6:>7.1f}us ({(before - after) / before:>4.0%})")
+    await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=os.environ.get("STATEMENT_CACHE_DB_URL"))
+    parser.add_argument("--calls", type=int, default=2000, help="calls measured per query")
+    parser.add_argument("--scale", type=int, default=200, help="users and projects seeded")
+    args = parser.parse_args()
+
+    if args.url:
+        asyncio.run(run(args.url, args.calls, args.scale))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(run(f"sqlite+aiosqlite:///{tmp}/statement_cache.db", args.calls, args.scale))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.project import Project
+
+
+class MembershipChange(BaseModel):
+    """Current state of a project membership that was added or changed."""
+    project_id: int
+    user_id: int
+    role: str
+
+
+class Tombstone(BaseModel):
+    """Record of a deleted project, membership or document."""
+    entity_type: str
+    entity_id: int
+    project_id: int
+    user_id: int | None = None
+    deleted_at: datetime
+
+
+class ChangeSet(BaseModel):
+    """Everything a user can see that changed since a sync cursor.
+
+    `cursor` is passed to the next `changes_since` call. It trails the
+    newest change slightly, so a row may be returned twice but never
+    missed; clients should apply changes idempotently.
+    """
+    projects: list[Project] = Field(default_factory=list)
+    memberships: list[MembershipChange] = Field(default_factory=list)
+    documents: list[Document] = Field(default_factory=list)
+    deletions: list[Tombstone] = Field(default_factory=list)
+    cursor: datetime
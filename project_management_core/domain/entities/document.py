@@ -1,6 +1,7 @@
 from datetime import datetime
+from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Document(BaseModel):
@@ -14,6 +15,7 @@ class Document(BaseModel):
     project_id: int
     uploaded_by: int
     uploaded_at: datetime | None = None
+    file_metadata: dict[str, Any] = Field(default_factory=dict)
 
     def get_metadata(self) -> dict:
         """Return a metadata dictionary for this document.
@@ -26,4 +28,56 @@ class Document(BaseModel):
             "file_size": self.file_size,
             "content_type": self.content_type,
             "uploaded_at": self.uploaded_at
-        }
\ No newline at end of file
+        }
+
+
+class DocumentFeedCursor(BaseModel):
+    """Position in a document feed: the last document of the previous page."""
+    uploaded_at: datetime
+    id: int
+
+
+class DocumentFeedPage(BaseModel):
+    """One page of a user's document feed, newest first.
+
+    `next_cursor` is passed back to fetch the following page; it is None
+    on the last page.
+    """
+    documents: list[Document] = Field(default_factory=list)
+    next_cursor: DocumentFeedCursor | None = None
+
+
+# Columns a project's document listing can be sorted by.
+DOCUMENT_SORT_KEYS = ("uploaded_at", "file_size")
+
+
+class DocumentFilter(BaseModel):
+    """Criteria for listing a project's documents; unset fields match everything.
+
+    Size bounds are inclusive. `uploaded_after` is inclusive and
+    `uploaded_before` exclusive, so consecutive ranges don't overlap.
+    """
+    content_type: str | None = None
+    min_size: int | None = None
+    max_size: int | None = None
+    uploaded_by: int | None = None
+    uploaded_after: datetime | None = None
+    uploaded_before: datetime | None = None
+
+
+class DocumentPage(BaseModel):
+    """One page of a filtered document listing.
+
+    `total` is the number of documents matching the filter across all pages.
+    """
+    documents: list[Document] = Field(default_factory=list)
+    total: int = 0
+
+
+class DocumentStats(BaseModel):
+    """Aggregate document counters for a single project."""
+    project_id: int
+    document_count: int = 0
+    total_bytes: int = 0
+    bytes_by_content_type: dict[str, int] = Field(default_factory=dict)
+    last_uploaded_at: datetime | None = None
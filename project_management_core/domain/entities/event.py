@@ -0,0 +1,17 @@
+from datetime import datetime
+
+from pydantic import BaseModel, Field
+
+
+class DomainEvent(BaseModel):
+    """Change notification about a user, project or document.
+
+    Written to the outbox in the same transaction as the change itself and
+    delivered to downstream systems afterwards.
+    """
+    id: int | None = None
+    event_type: str
+    aggregate_type: str
+    aggregate_id: int
+    payload: dict = Field(default_factory=dict)
+    occurred_at: datetime | None = None
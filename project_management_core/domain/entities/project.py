@@ -1,4 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
+
+from project_management_core.domain.entities.document import Document, DocumentStats
 
 
 class UserError(Exception):
@@ -43,6 +45,25 @@ class Project(BaseModel):
     description: str
     owner_id: int
     participants: list[int] = Field(default_factory=list)
+    version: int | None = None
+    _persisted: dict = PrivateAttr(default_factory=dict)
+
+    def mark_persisted(self) -> None:
+        """Record the current name and description as the stored state."""
+        self._persisted = {"name": self.name, "description": self.description}
+
+    def changed_fields(self) -> dict:
+        """Return the editable fields that differ from the stored state.
+
+        Returns:
+            Mapping of field name to new value. All editable fields if the
+            project was never marked as persisted.
+        """
+        current = {"name": self.name, "description": self.description}
+        return {
+            key: value for key, value in current.items()
+            if key not in self._persisted or self._persisted[key] != value
+        }
 
     def add_user(self, user_id: int) -> None:
         """Add a user to the project's participants.
@@ -128,4 +149,23 @@ class Project(BaseModel):
         return True
 
 
-    
\ No newline at end of file
+class ProjectMembership(BaseModel):
+    """Outcome of adding a user to a project."""
+    project: Project
+    added: bool
+
+
+class ProjectMemberInfo(BaseModel):
+    """A project participant as shown on the project page."""
+    user_id: int
+    email: str
+    role: str
+
+
+class ProjectOverview(BaseModel):
+    """Everything the project page shows, read in one go."""
+    project: Project
+    owner_email: str
+    members: list[ProjectMemberInfo] = Field(default_factory=list)
+    recent_documents: list[Document] = Field(default_factory=list)
+    document_stats: DocumentStats
@@ -24,7 +24,14 @@ class User:
     Holds identity and authentication state, and exposes operations
     related to account lifecycle such as password change and activation.
     """
-    def __init__(self, id: int, email: str, password_hash: str, is_active: bool = True):
+    def __init__(
+        self,
+        id: int,
+        email: str,
+        password_hash: str,
+        is_active: bool = True,
+        version: int | None = None,
+    ):
         """Initialize a new `User` entity.
 
         Args:
@@ -32,11 +39,35 @@ class User:
             email: Email address of the user.
             password_hash: Hashed password.
             is_active: Whether the account is active. Defaults to True.
+            version: Stored row version used for optimistic locking. Defaults to None.
         """
         self.id = id
         self.email = email
         self.password_hash = password_hash
         self.is_active = is_active
+        self.version = version
+        self._persisted = {}
+
+    def mark_persisted(self):
+        """Record the current email and password hash as the stored state."""
+        self._persisted = {"email": self.email, "password_hash": self.password_hash}
+
+    def persisted_value(self, field: str, default=None):
+        """Return the stored value of `field`, or `default` if never marked as persisted."""
+        return self._persisted.get(field, default)
+
+    def changed_fields(self) -> dict:
+        """Return the stored fields that differ from the stored state.
+
+        Returns:
+            Mapping of field name to new value. All stored fields if the
+            user was never marked as persisted.
+        """
+        current = {"email": self.email, "password_hash": self.password_hash}
+        return {
+            key: value for key, value in current.items()
+            if key not in self._persisted or self._persisted[key] != value
+        }
 
     def change_password(self, new_hash: str):
         """Set a new password hash for the user.
@@ -1,6 +1,19 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
-from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.document import (
+    Document,
+    DocumentFeedCursor,
+    DocumentFeedPage,
+    DocumentFilter,
+    DocumentPage,
+    DocumentStats,
+)
+from project_management_core.domain.repositories.errors import RepositoryError
+
+
+class ProjectQuotaExceededError(RepositoryError):
+    """Adding the document would take its project over the storage quota."""
 
 
 class DocumentRepository(ABC):
@@ -10,12 +23,22 @@ class DocumentRepository(ABC):
     """
 
     @abstractmethod
-    def create(self, document: Document) -> Document:
-        """Persist a new document entity.
+    def create(
+        self,
+        document: Document,
+        processing_priority: int | None = 0,
+        quota_bytes: int | None = None,
+    ) -> Document:
+        """Persist a new document entity and queue its post-upload processing.
         Args:
             document (Document): The document to be created.
+            processing_priority (int | None): Priority of the processing job; None skips processing.
+            quota_bytes (int | None): Most bytes the project may hold including this document;
+                checked atomically with the insert. None means no quota.
         Returns:
             Document: The newly created document with any generated fields populated.
+        Raises:
+            ProjectQuotaExceededError: If the document would exceed `quota_bytes`.
         """
         pass
 
@@ -38,6 +61,97 @@ class DocumentRepository(ABC):
             list[Document]: A list of documents linked to the project."""
         pass
 
+    @abstractmethod
+    def stream_by_project(self, project_id: int) -> AsyncIterator[Document]:
+        """Iterate over a project's documents without loading them all into memory.
+        Args:
+            project_id (int): The ID of the project.
+        Returns:
+            AsyncIterator[Document]: The project's documents, in ID order."""
+        pass
+
+    @abstractmethod
+    def list_documents(
+        self,
+        project_id: int,
+        filters: DocumentFilter | None = None,
+        sort: str = "uploaded_at",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> DocumentPage:
+        """Retrieve one page of a project's documents matching the given filters.
+        Args:
+            project_id (int): The ID of the project.
+            filters (DocumentFilter | None): Content type, size, uploader and upload date criteria.
+            sort (str): Column to order by, one of `DOCUMENT_SORT_KEYS`.
+            descending (bool): Largest or newest first.
+            limit (int): Maximum number of documents to return.
+            offset (int): Number of sorted results to skip.
+        Returns:
+            DocumentPage: The page of documents and the total number matching.
+        """
+        pass
+
+    @abstractmethod
+    def search_by_filename(
+        self,
+        project_id: int,
+        query: str,
+        content_type: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[Document]:
+        """Search a project's documents by prefix or substring of their original filename.
+        Args:
+            project_id (int): The ID of the project to search in.
+            query (str): Text to look for in `original_filename`.
+            content_type (str | None): Optional MIME type the results must match.
+            limit (int): Maximum number of documents to return.
+            offset (int): Number of ranked results to skip.
+        Returns:
+            list[Document]: Matching documents, most relevant first.
+        """
+        pass
+
+    @abstractmethod
+    def get_feed_for_user(
+        self,
+        user_id: int,
+        limit: int = 50,
+        before: DocumentFeedCursor | None = None,
+        uploaded_by_user: bool = False,
+    ) -> DocumentFeedPage:
+        """Retrieve the newest documents across every project a user can access.
+        Args:
+            user_id (int): The user whose owned and joined projects are included.
+            limit (int): Maximum number of documents to return.
+            before (DocumentFeedCursor | None): `next_cursor` of the previous page.
+            uploaded_by_user (bool): Only include documents the user uploaded.
+        Returns:
+            DocumentFeedPage: Documents ordered by upload time, newest first.
+        """
+        pass
+
+    @abstractmethod
+    def get_project_stats(self, project_id: int) -> DocumentStats:
+        """Retrieve the maintained document counters for a project.
+        Args:
+            project_id (int): The ID of the project.
+        Returns:
+            DocumentStats: Document count, total bytes, bytes per content type and
+            last upload time. Zeroed if the project has no documents.
+        """
+        pass
+
+    @abstractmethod
+    def rebuild_project_stats(self, project_id: int | None = None) -> None:
+        """Recompute document counters from the stored documents.
+        Args:
+            project_id (int | None): The project to rebuild, or None to rebuild every project.
+        """
+        pass
+
     @abstractmethod
     def delete(self, document_id: int) -> None:
         """Delete a document by its unique identifier.
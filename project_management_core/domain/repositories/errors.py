@@ -0,0 +1,2 @@
+class RepositoryError(Exception):
+    """Base class for errors raised by repository implementations."""
@@ -1,6 +1,13 @@
 from abc import ABC, abstractmethod
+from datetime import datetime
 
-from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.change import ChangeSet
+from project_management_core.domain.entities.project import Project, ProjectOverview
+from project_management_core.domain.repositories.errors import RepositoryError
+
+
+class ProjectVersionConflictError(RepositoryError):
+    """Project was modified concurrently since it was loaded."""
 
 
 class ProjectRepository(ABC):
@@ -37,6 +44,32 @@ class ProjectRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def search_projects(
+        self, user_id: int, query: str, limit: int = 20, offset: int = 0
+    ) -> list[Project]:
+        """Full-text search over the names and descriptions of projects a user can access.
+        Args:
+            user_id (int): The ID of the user; only owned or joined projects are returned.
+            query (str): Search terms; all must match, the last one as a prefix.
+            limit (int): Maximum number of projects to return.
+            offset (int): Number of ranked results to skip.
+        Returns:
+            list[Project]: Matching projects, most relevant first.
+        """
+        pass
+
+    @abstractmethod
+    def get_overview(self, project_id: int, document_limit: int = 20) -> ProjectOverview:
+        """Retrieve a project with its members, recent documents and document counters.
+        Args:
+            project_id (int): The ID of the project.
+            document_limit (int): Maximum number of recent documents to include.
+        Returns:
+            ProjectOverview: The aggregated project data.
+        """
+        pass
+
     @abstractmethod
     def update(self, project: Project) -> Project:
         """Update an existing project.
@@ -54,3 +87,25 @@ class ProjectRepository(ABC):
             project_id (int): The ID of the project to delete.
         """
         pass
+
+    @abstractmethod
+    def remove_user_from_project(self, project_id: int, user_id: int) -> bool:
+        """Remove a participant from a project.
+        Args:
+            project_id (int): The ID of the project.
+            user_id (int): The ID of the participant to remove.
+        Returns:
+            bool: True if the user was a participant and was removed.
+        """
+        pass
+
+    @abstractmethod
+    def changes_since(self, user_id: int, cursor: datetime | None = None) -> ChangeSet:
+        """Retrieve projects, memberships and documents a user can see that changed after a cursor.
+        Args:
+            user_id (int): The ID of the syncing user.
+            cursor (datetime | None): Cursor from the previous call, or None for everything.
+        Returns:
+            ChangeSet: Changed rows, deletions, and the cursor for the next call.
+        """
+        pass
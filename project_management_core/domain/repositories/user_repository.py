@@ -1,6 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 
 from project_management_core.domain.entities.user import User
+from project_management_core.domain.repositories.errors import RepositoryError
+
+
+class UserRecordNotFoundError(RepositoryError):
+    """User not found in database."""
+
+
+class UserVersionConflictError(RepositoryError):
+    """User was modified concurrently since it was loaded."""
 
 
 class UserRepository(ABC):
@@ -38,6 +48,32 @@ class UserRepository(ABC):
         """
         pass
 
+    @abstractmethod
+    def email_exists(self, email) -> bool:
+        """Check whether a user is registered with an email address.
+        Args:
+            email (str): The email address, compared case-insensitively.
+        Returns:
+            bool: True if a user has that email.
+        """
+        pass
+
+    @abstractmethod
+    def stream_emails(self) -> AsyncIterator[str]:
+        """Iterate over the normalized email addresses of all users.
+        Returns:
+            AsyncIterator[str]: Lowercased email addresses, in no particular order.
+        """
+        pass
+
+    @abstractmethod
+    def stream_all(self) -> AsyncIterator[User]:
+        """Iterate over all users without loading them all into memory.
+        Returns:
+            AsyncIterator[User]: All user entities, in ID order.
+        """
+        pass
+
     @abstractmethod
     def list_all(self) -> list[User]:
         """Retrieve all users.
@@ -53,6 +89,8 @@ class UserRepository(ABC):
             user (User): The user with updated data.
         Returns:
             User: The updated user entity.
+        Raises:
+            UserVersionConflictError: If the user changed since it was loaded.
         """
         pass
 
@@ -1,3 +1,35 @@
-from .document_service import( Document as Document, DocumentRepository as DocumentRepository, DocumentService as DocumentService)
-from .project_service import (Project as Project, ProjectService as ProjectService , ProjectRepository as ProjectRepository )
-from .user_service import (User as User, UserService as UserService, UserRepository as UserRepository)
\ No newline at end of file
+"""Application services.
+
+Names are resolved lazily on first access so that importing this package
+stays cheap; a service's dependencies are only loaded when it is used.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .document_service import Document as Document, DocumentRepository as DocumentRepository, DocumentService as DocumentService
+    from .project_service import Project as Project, ProjectRepository as ProjectRepository, ProjectService as ProjectService
+    from .user_service import User as User, UserRepository as UserRepository, UserService as UserService
+
+_EXPORTS = {
+    "Document": ".document_service",
+    "DocumentRepository": ".document_service",
+    "DocumentService": ".document_service",
+    "Project": ".project_service",
+    "ProjectRepository": ".project_service",
+    "ProjectService": ".project_service",
+    "User": ".user_service",
+    "UserRepository": ".user_service",
+    "UserService": ".user_service",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
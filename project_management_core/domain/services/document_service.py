@@ -2,9 +2,18 @@ import os
 from typing import BinaryIO
 from uuid import uuid4
 
-from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.document import (
+    DOCUMENT_SORT_KEYS,
+    Document,
+    DocumentFeedCursor,
+    DocumentFeedPage,
+    DocumentFilter,
+    DocumentPage,
+    DocumentStats,
+)
 from project_management_core.domain.repositories.document_repository import (
     DocumentRepository,
+    ProjectQuotaExceededError,
 )
 
 
@@ -24,20 +33,47 @@ class DocumentFilenameRequiredError(DocumentError):
     """Filename is required for upload."""
     pass
 
+class DocumentQuotaExceededError(DocumentError):
+    """Upload would exceed the project's storage quota."""
+    pass
+
+
+COPY_CHUNK_SIZE = 1024 * 1024
 
 
+def _fsync_directory(path: str) -> None:
+    """Make a new directory entry durable; a no-op where unsupported."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 
 class DocumentService:
     """Application service for managing document uploads and lifecycle."""
-    def __init__(self, document_repository: DocumentRepository, upload_dir: str = "uploads"):
+    def __init__(
+        self,
+        document_repository: DocumentRepository,
+        upload_dir: str = "uploads",
+        project_quota_bytes: int | None = None,
+    ):
         """Initialize the document service.
 
         Args:
             document_repository: Repository used to persist documents.
             upload_dir: Directory where uploaded files are stored. Defaults to "uploads".
+            project_quota_bytes: Maximum total size of a project's documents.
+                Defaults to None (no quota).
         """
         self.document_repository = document_repository
         self.upload_dir = upload_dir
+        self.project_quota_bytes = project_quota_bytes
         os.makedirs(upload_dir, exist_ok=True)
 
     async def upload_document(
@@ -46,34 +82,63 @@ class DocumentService:
         original_filename: str,
         content_type: str,
         project_id: int,
-        uploaded_by: int
+        uploaded_by: int,
+        processing_priority: int | None = 0,
     ) -> Document:
         """Upload a file and persist its `Document` record.
 
+        Returns once the file is fsynced and the record committed. The
+        checksum, content sniffing and text extraction run afterwards in
+        a background worker and are written to `Document.file_metadata`.
+
         Args:
             file: File-like object open for reading binary data.
             original_filename: Original name of the uploaded file.
             content_type: MIME type of the uploaded file.
             project_id: Identifier of the project the document belongs to.
             uploaded_by: Identifier of the uploading user.
+            processing_priority: Priority of the post-upload processing job;
+                higher runs first. None skips processing.
 
         Returns:
             The created `Document` entity.
 
         Raises:
             DocumentFilenameRequiredError: If the original filename is empty.
+            DocumentQuotaExceededError: If the upload would exceed the project's quota.
         """
         if not original_filename:
             raise DocumentFilenameRequiredError("Filename is required")
 
+        quota_error = f"Project {project_id} storage quota of {self.project_quota_bytes} bytes exceeded"
+        # Bytes the project has left, read up front so an upload that
+        # can't fit is refused before it is written; the binding check is
+        # made atomically with the insert.
+        remaining = None
+        if self.project_quota_bytes is not None:
+            stats = await self.document_repository.get_project_stats(project_id)
+            remaining = self.project_quota_bytes - stats.total_bytes
+            if remaining < 0:
+                raise DocumentQuotaExceededError(quota_error)
+
         file_extension = os.path.splitext(original_filename)[1]
         unique_filename = f"{uuid4()}{file_extension}"
         file_path = os.path.join(self.upload_dir, unique_filename)
 
-        with open(file_path, "wb") as f:
-            f.write(file.read())
-
-        file_size = os.path.getsize(file_path)
+        file_size = 0
+        try:
+            with open(file_path, "wb") as f:
+                while chunk := file.read(COPY_CHUNK_SIZE):
+                    file_size += len(chunk)
+                    if remaining is not None and file_size > remaining:
+                        raise DocumentQuotaExceededError(quota_error)
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+        except BaseException:
+            os.remove(file_path)
+            raise
+        _fsync_directory(self.upload_dir)
 
         document = Document(
             original_filename=original_filename,
@@ -84,7 +149,13 @@ class DocumentService:
             project_id=project_id,
             uploaded_by=uploaded_by
         )
-        return await self.document_repository.create(document)
+        try:
+            return await self.document_repository.create(
+                document, processing_priority=processing_priority, quota_bytes=self.project_quota_bytes
+            )
+        except ProjectQuotaExceededError as e:
+            os.remove(file_path)
+            raise DocumentQuotaExceededError(quota_error) from e
     
     async def get_documents_for_project(self, project_id: int) -> list[Document]:
         """Return all documents for a given project.
@@ -97,6 +168,127 @@ class DocumentService:
         """
         return await self.document_repository.get_by_project(project_id)
 
+    async def get_project_stats(self, project_id: int) -> DocumentStats:
+        """Return document count and storage usage for a project.
+
+        Args:
+            project_id: Identifier of the project.
+
+        Returns:
+            The project's `DocumentStats`, read from maintained counters.
+        """
+        return await self.document_repository.get_project_stats(project_id)
+
+    async def reconcile_project_stats(self, project_id: int | None = None) -> None:
+        """Rebuild document counters from stored documents.
+
+        Args:
+            project_id: Project to reconcile, or None for every project.
+        """
+        await self.document_repository.rebuild_project_stats(project_id)
+
+    async def list_documents(
+        self,
+        project_id: int,
+        filters: DocumentFilter | None = None,
+        sort: str = "uploaded_at",
+        descending: bool = True,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> DocumentPage:
+        """List a project's documents matching the filters, sorted by date or size.
+
+        Args:
+            project_id: Identifier of the project.
+            filters: Content type, size range, uploader and upload date
+                range to match; None lists every document.
+            sort: "uploaded_at" or "file_size".
+            descending: Newest or largest first. Defaults to True.
+            page: 1-based page number.
+            page_size: Number of documents per page.
+
+        Returns:
+            A `DocumentPage` with the requested page and the total number
+            of matching documents.
+
+        Raises:
+            ValueError: If `sort` is unknown, or `page` or `page_size` is
+                not positive.
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+        if sort not in DOCUMENT_SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(DOCUMENT_SORT_KEYS)}")
+        return await self.document_repository.list_documents(
+            project_id,
+            filters,
+            sort=sort,
+            descending=descending,
+            limit=page_size,
+            offset=(page - 1) * page_size,
+        )
+
+    async def search_documents(
+        self,
+        project_id: int,
+        query: str,
+        content_type: str | None = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> list[Document]:
+        """Search a project's documents by filename, most relevant first.
+
+        Args:
+            project_id: Identifier of the project to search in.
+            query: Prefix or substring of the original filename.
+            content_type: Optional MIME type to restrict results to.
+            page: 1-based page number.
+            page_size: Number of documents per page.
+
+        Returns:
+            A list of matching `Document` entities for the requested page.
+
+        Raises:
+            ValueError: If `page` or `page_size` is not positive.
+        """
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive")
+        return await self.document_repository.search_by_filename(
+            project_id,
+            query,
+            content_type=content_type,
+            limit=page_size,
+            offset=(page - 1) * page_size,
+        )
+
+    async def get_recent_documents(
+        self,
+        user_id: int,
+        page_size: int = 50,
+        cursor: DocumentFeedCursor | None = None,
+        only_uploaded_by_user: bool = False,
+    ) -> DocumentFeedPage:
+        """Return the newest documents across all projects the user can access.
+
+        Args:
+            user_id: Identifier of the user whose feed is read.
+            page_size: Number of documents per page.
+            cursor: `next_cursor` of the previous page; None for the first page.
+            only_uploaded_by_user: Only include the user's own uploads
+                ("my recent uploads").
+
+        Returns:
+            A `DocumentFeedPage`, newest first.
+
+        Raises:
+            ValueError: If `page_size` is not positive.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be positive")
+        return await self.document_repository.get_feed_for_user(
+            user_id, limit=page_size, before=cursor, uploaded_by_user=only_uploaded_by_user
+        )
+
     async def delete_document(self, document_id: int, user_id: int) -> None:
         """Delete a document if the user has permission and remove the file.
 
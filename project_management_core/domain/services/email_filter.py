@@ -0,0 +1,78 @@
+import hashlib
+import math
+from collections.abc import AsyncIterable
+
+from project_management_core.domain.value_objects.email import normalize_email
+
+
+class EmailBloomFilter:
+    """In-process counting Bloom filter over registered email addresses.
+
+    A negative answer from `might_contain` is definite, so callers can skip
+    the database for emails that are certainly not registered. A positive
+    answer is wrong for roughly `false_positive_rate` of unregistered
+    emails once `capacity` emails are stored, and must be confirmed.
+
+    Each slot is a small counter rather than a bit so that deleted users
+    can be removed again. A counter that reaches 255 is never decremented,
+    which can only cause extra false positives.
+
+    Until `load` has run the filter answers "maybe" for every email. It
+    only knows about writes made in this process, so enable it only when
+    every user write goes through this process.
+    """
+    def __init__(self, capacity: int = 100_000, false_positive_rate: float = 0.01):
+        """Initialize an empty filter.
+
+        Args:
+            capacity: Number of emails the filter is sized for.
+            false_positive_rate: Target false-positive rate at `capacity`.
+        """
+        self.size = max(1, math.ceil(-capacity * math.log(false_positive_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.ready = False
+        self._counters = bytearray(self.size)
+
+    def _positions(self, email: str) -> list[int]:
+        digest = hashlib.blake2b(normalize_email(email).encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, email: str) -> None:
+        """Record `email` as registered."""
+        for position in self._positions(email):
+            if self._counters[position] < 255:
+                self._counters[position] += 1
+
+    def discard(self, email: str) -> None:
+        """Record that `email` is no longer registered.
+
+        Only call this for emails that were added, or other entries may
+        start returning false negatives.
+        """
+        for position in self._positions(email):
+            if 0 < self._counters[position] < 255:
+                self._counters[position] -= 1
+
+    def might_contain(self, email: str) -> bool:
+        """Return False only if `email` is certainly not registered."""
+        if not self.ready:
+            return True
+        return all(self._counters[position] for position in self._positions(email))
+
+    async def load(self, emails: AsyncIterable[str]) -> int:
+        """Add every email from `emails` and start answering lookups.
+
+        Args:
+            emails: All registered emails, e.g. `UserRepository.stream_emails()`.
+
+        Returns:
+            Number of emails added.
+        """
+        count = 0
+        async for email in emails:
+            self.add(email)
+            count += 1
+        self.ready = True
+        return count
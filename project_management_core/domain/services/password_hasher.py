@@ -0,0 +1,118 @@
+import time
+import weakref
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification run in worker threads.
+
+    bcrypt is deliberately slow, so calls are moved off the event loop and
+    at most `max_concurrency` of them run at a time on each event loop; the
+    rest wait their turn instead of starving the thread pool. One hasher
+    can be shared by several loops, e.g. the process-wide `default_hasher`
+    across tests that each run their own loop.
+    """
+    def __init__(self, rounds: int = 12, max_concurrency: int = 4):
+        """Initialize the hasher.
+
+        Args:
+            rounds: bcrypt work factor for new hashes. Existing hashes made
+                with a different factor are reported by `needs_rehash`.
+            max_concurrency: Maximum number of hashes computed at once.
+        """
+        self.rounds = rounds
+        self.max_concurrency = max_concurrency
+        # Semaphores are bound to the loop they are first used on.
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._dummy_hash: bytes | None = None
+
+    async def hash(self, password: str) -> str:
+        """Hash `password` with a fresh salt at the configured work factor."""
+        import bcrypt
+
+        salt = bcrypt.gensalt(self.rounds)
+        hashed = await self._run(bcrypt.hashpw, password.encode(), salt)
+        return hashed.decode()
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """Return whether `password` matches `password_hash`."""
+        import bcrypt
+
+        try:
+            return await self._run(bcrypt.checkpw, password.encode(), password_hash.encode())
+        except ValueError:
+            return False
+
+    async def verify_dummy(self, password: str) -> None:
+        """Spend as long as `verify` would, without a stored hash.
+
+        Used when no user matches, so a failed login takes the same time
+        whether or not the email is registered.
+        """
+        import bcrypt
+
+        if self._dummy_hash is None:
+            self._dummy_hash = await self._run(bcrypt.hashpw, b"dummy password", bcrypt.gensalt(self.rounds))
+        await self._run(bcrypt.checkpw, password.encode(), self._dummy_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Return whether `password_hash` was made with a different work factor."""
+        try:
+            return int(password_hash.split("$")[2]) != self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    async def _run(self, func, *args):
+        # asyncio is imported here to keep this module cheap to import.
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = self._slots[loop] = asyncio.Semaphore(self.max_concurrency)
+        async with slots:
+            return await asyncio.to_thread(func, *args)
+
+
+class UnknownEmailCache:
+    """Short-lived record of emails that matched no user.
+
+    Lets repeated logins for unregistered emails skip the database. Entries
+    expire after `ttl` seconds, so a user registered by another worker can
+    log in here after at most that long.
+    """
+    def __init__(self, ttl: float = 30.0, max_size: int = 10_000):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid.
+            max_size: Maximum number of entries; the oldest are evicted first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        self._expires: dict[str, float] = {}
+
+    def __contains__(self, email: str) -> bool:
+        expires = self._expires.get(email)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            del self._expires[email]
+            return False
+        return True
+
+    def add(self, email: str) -> None:
+        """Remember `email` as unknown for the next `ttl` seconds."""
+        self._expires.pop(email, None)
+        while len(self._expires) >= self.max_size:
+            del self._expires[next(iter(self._expires))]
+        self._expires[email] = time.monotonic() + self.ttl
+
+    def discard(self, email: str) -> None:
+        """Forget `email`, e.g. because it was just registered."""
+        self._expires.pop(email, None)
+
+
+# Shared by every UserService so the concurrency cap and cache are per
+# process, not per request.
+default_hasher = PasswordHasher()
+unknown_emails = UnknownEmailCache()
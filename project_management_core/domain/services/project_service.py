@@ -1,13 +1,21 @@
-from project_management_core.domain.entities.project import Project
+import asyncio
+from datetime import datetime
+
+from project_management_core.domain.entities.change import ChangeSet
+from project_management_core.domain.entities.project import (
+    Project,
+    ProjectMembership,
+    ProjectOverview,
+    UserUnauthorizedError,
+)
 from project_management_core.domain.entities.user import User
 
+from project_management_core.domain.repositories.errors import RepositoryError
 from project_management_core.domain.repositories.project_repository import (
     ProjectRepository,
+    ProjectVersionConflictError,
 )
 from project_management_core.domain.services.user_service import UserNotFoundError
-from project_management_core.infrastructure.repositories.db.project_repository_impl import (
-    RepositoryError,
-)
 
 
 class ProjectServiceError(Exception):
@@ -30,6 +38,14 @@ class OwnerValidationError(ProjectServiceError):
     """Raised when owner_id is missing or invalid."""
     pass
 
+class ProjectConflictError(ProjectServiceError):
+    """Raised when a project was modified concurrently by another request."""
+    pass
+
+class ProjectOverviewTimeoutError(ProjectServiceError):
+    """Raised when a project overview could not be read within its latency budget."""
+    pass
+
 class ProjectService:
     """Application service for managing `Project` entities.
 
@@ -86,6 +102,33 @@ class ProjectService:
             raise ProjectNotFoundError(f"Projects not found for user {user_id}.")
         return project_list
 
+    async def search_projects(
+        self, user_id: int, query: str, page: int = 1, page_size: int = 20
+    ) -> list[Project]:
+        """Search the names and descriptions of projects the user can access.
+
+        Args:
+            user_id: Identifier of the user performing the search.
+            query: Free-text search terms.
+            page: 1-based page number.
+            page_size: Number of projects per page.
+
+        Returns:
+            A list of matching `Project` instances, most relevant first.
+
+        Raises:
+            ProjectValidationError: If `page` or `page_size` is not positive.
+            ProjectServiceError: If the repository operation fails.
+        """
+        if page < 1 or page_size < 1:
+            raise ProjectValidationError("page and page_size must be positive")
+        try:
+            return await self.project_repository.search_projects(
+                user_id, query, limit=page_size, offset=(page - 1) * page_size
+            )
+        except RepositoryError as e:
+            raise ProjectServiceError(str(e))
+
     async def get_project(self, project_id: int) -> Project:
         """Retrieve a project by its identifier.
 
@@ -103,6 +146,49 @@ class ProjectService:
         except RepositoryError as e:
             raise ProjectNotFoundError(e)
 
+    async def get_project_overview(
+        self,
+        project_id: int,
+        user_id: int,
+        document_limit: int = 20,
+        budget: float | None = 1.0,
+    ) -> ProjectOverview:
+        """Retrieve everything the project page shows in a single call.
+
+        The project, its members with their emails, the most recent
+        documents and the document counters are read with a fixed number
+        of queries, independent of the member count.
+
+        Args:
+            project_id: Identifier of the project.
+            user_id: Identifier of the user viewing the project.
+            document_limit: Maximum number of recent documents to include.
+            budget: Seconds the read may take before it is abandoned, or
+                None for no limit. After a timeout the repository's session
+                should be discarded.
+
+        Returns:
+            The project's `ProjectOverview`.
+
+        Raises:
+            ProjectNotFoundError: If the project does not exist.
+            ProjectAccessDeniedError: If the user is neither owner nor member.
+            ProjectOverviewTimeoutError: If `budget` elapsed first.
+        """
+        try:
+            overview = await asyncio.wait_for(
+                self.project_repository.get_overview(project_id, document_limit), timeout=budget
+            )
+        except asyncio.TimeoutError:
+            raise ProjectOverviewTimeoutError(f"Overview of project {project_id} exceeded {budget}s")
+        except RepositoryError as e:
+            raise ProjectNotFoundError(e)
+        try:
+            overview.project.has_access(user_id)
+        except UserUnauthorizedError as e:
+            raise ProjectAccessDeniedError(str(e))
+        return overview
+
     async def update_project(self, project_id: int, name: str, description: str) -> Project:
         """Update a project's name and description.
 
@@ -116,6 +202,7 @@ class ProjectService:
 
         Raises:
             ProjectNotFoundError: If `project_id` is invalid or the project does not exist.
+            ProjectConflictError: If the project was modified concurrently.
         """
         if not project_id:
             raise ProjectNotFoundError("Invalid project_id")
@@ -124,7 +211,10 @@ class ProjectService:
             raise ProjectNotFoundError("Project does not exists")
         project.change_name(name)
         project.change_description(description)        
-        return await self.project_repository.update(project)
+        try:
+            return await self.project_repository.update(project)
+        except ProjectVersionConflictError as e:
+            raise ProjectConflictError(str(e))
 
     async def delete_project(self, project_id: int) -> None:
         """Delete a project by its identifier.
@@ -144,12 +234,69 @@ class ProjectService:
         except RepositoryError as e:
             raise ProjectServiceError(str(e)) 
     
-    async def add_user_to_project(self, project_id: int, user_id: int, current_user: User) -> Project:
+    async def add_user_to_project(self, project_id: int, user_id: int, current_user: User) -> ProjectMembership:
+        """Add a user to a project; adding an existing participant is a no-op.
+
+        Args:
+            project_id: Identifier of the project.
+            user_id: Identifier of the user to add.
+            current_user: User performing the invitation.
+
+        Returns:
+            The project with its participants and whether the user was newly added.
+
+        Raises:
+            ProjectAccessDeniedError: If `current_user` has no access to the project.
+        """
         project = await self.get_project(project_id)
         if not project.has_access(current_user.id):
             raise ProjectAccessDeniedError("Only project owner can invite participants")
         return await self.project_repository.add_user_to_project(project_id, user_id)
     
+    async def remove_user_from_project(self, project_id: int, user_id: int, current_user: User) -> bool:
+        """Remove a participant from a project; removing a non-participant is a no-op.
+
+        Args:
+            project_id: Identifier of the project.
+            user_id: Identifier of the participant to remove.
+            current_user: User performing the removal; must be the owner
+                unless removing themselves.
+
+        Returns:
+            True if the user was removed, False if they were not a participant.
+
+        Raises:
+            ProjectAccessDeniedError: If `current_user` may not remove the user.
+            ProjectServiceError: If the repository operation fails.
+        """
+        project = await self.get_project(project_id)
+        if current_user.id != project.owner_id and current_user.id != user_id:
+            raise ProjectAccessDeniedError("Only project owner can remove participants")
+        try:
+            return await self.project_repository.remove_user_from_project(project_id, user_id)
+        except RepositoryError as e:
+            raise ProjectServiceError(str(e))
+
+    async def changes_since(self, user_id: int, cursor: datetime | None = None) -> ChangeSet:
+        """Return what changed in the user's projects since the last sync.
+
+        Args:
+            user_id: Identifier of the syncing user.
+            cursor: `ChangeSet.cursor` from the previous call, or None for
+                a full sync.
+
+        Returns:
+            The changed projects, memberships, documents and deletions,
+            with the cursor to pass next time.
+
+        Raises:
+            ProjectServiceError: If the repository operation fails.
+        """
+        try:
+            return await self.project_repository.changes_since(user_id, cursor)
+        except RepositoryError as e:
+            raise ProjectServiceError(str(e))
+
     async def get_project(self, project_id: int) -> Project:
         """Retrieve a project with participants loaded."""
         project_model = await self.project_repository.get_project_with_members(project_id)
@@ -1,7 +1,22 @@
-import bcrypt
+from typing import TYPE_CHECKING
 
 from project_management_core.domain.entities.user import User
-from project_management_core.domain.repositories.user_repository import UserRepository
+from project_management_core.domain.repositories.errors import RepositoryError
+from project_management_core.domain.repositories.user_repository import (
+    UserRecordNotFoundError,
+    UserRepository,
+    UserVersionConflictError,
+)
+from project_management_core.domain.services.password_hasher import (
+    PasswordHasher,
+    UnknownEmailCache,
+    default_hasher,
+    unknown_emails,
+)
+from project_management_core.domain.value_objects.email import normalize_email
+
+if TYPE_CHECKING:
+    from project_management_core.domain.services.email_filter import EmailBloomFilter
 
 
 class UserError(Exception):
@@ -16,15 +31,56 @@ class UserAlreadyDeactivatedError(UserError):
     """Raised when trying to deactivate an already inactive user."""
     pass
 
+class UserAlreadyExistsError(UserError):
+    """Raised when registering an email that is already taken."""
+    pass
+
+class InvalidCredentialsError(UserError):
+    """Raised when an email and password do not match an active user."""
+    pass
+
+class UserConflictError(UserError):
+    """Raised when a user was modified concurrently while being updated."""
+    pass
+
 class UserService():
     """Application service for user registration and account management."""
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        password_hasher: PasswordHasher | None = None,
+        unknown_email_cache: UnknownEmailCache | None = None,
+        email_filter: "EmailBloomFilter | None" = None,
+    ):
         """Initialize the user service.
 
         Args:
             user_repository: Repository used to persist and fetch users.
+            password_hasher: Hasher for passwords. Defaults to the
+                process-wide hasher.
+            unknown_email_cache: Cache of emails that matched no user.
+                Defaults to the process-wide cache.
+            email_filter: Optional Bloom filter of registered emails, shared
+                by the services of this process and filled once with
+                `load_email_filter`. Lets definite misses skip the database.
         """
         self.user_repository = user_repository
+        self.password_hasher = password_hasher or default_hasher
+        self.unknown_emails = unknown_email_cache if unknown_email_cache is not None else unknown_emails
+        self.email_filter = email_filter
+
+    def _may_exist(self, email: str) -> bool:
+        return self.email_filter is None or self.email_filter.might_contain(email)
+
+    async def load_email_filter(self) -> int:
+        """Fill the email filter from the repository; call once at startup.
+
+        Returns:
+            Number of emails loaded, or 0 if no filter is configured.
+        """
+        if self.email_filter is None:
+            return 0
+        return await self.email_filter.load(self.user_repository.stream_emails())
 
     async def register_user(self, email: str, password_hash: str):
         """Register a new user with a hashed password.
@@ -35,15 +91,26 @@ class UserService():
 
         Returns:
             The created `User` entity.
+
+        Raises:
+            UserAlreadyExistsError: If a user already has that email,
+                ignoring case.
         """
-        password_hashed = bcrypt.hashpw(password_hash.encode(), bcrypt.gensalt()).decode()
+        # Checked before hashing so duplicates don't cost a bcrypt round.
+        if self._may_exist(email) and await self.user_repository.email_exists(email):
+            raise UserAlreadyExistsError("User with this email already exists")
+        password_hashed = await self.password_hasher.hash(password_hash)
         user = User(
             id = None,
             email= email,
             password_hash= password_hashed,
             is_active=True
         )
-        return await self.user_repository.create(user)
+        user = await self.user_repository.create(user)
+        self.unknown_emails.discard(normalize_email(email))
+        if self.email_filter is not None:
+            self.email_filter.add(email)
+        return user
 
     async def change_user_password(self, user_id: int, new_hash: str): 
         """Change a user's password.
@@ -57,14 +124,17 @@ class UserService():
 
         Raises:
             UserNotFoundError: If the user cannot be found.
+            UserConflictError: If the user was modified concurrently.
         """
         user = await self.user_repository.get_by_id(user_id)
         if not user:
             raise UserNotFoundError("User not found")
         if user and len(new_hash) > 8:
-            new_hash = bcrypt.hashpw(new_hash.encode(), bcrypt.gensalt()).decode()
-            user.password_hash = new_hash
-        return await self.user_repository.update(user)
+            user.password_hash = await self.password_hasher.hash(new_hash)
+        try:
+            return await self.user_repository.update(user)
+        except UserVersionConflictError as e:
+            raise UserConflictError(str(e))
     
     async def deactivate_user(self,user_id: int):
         """Deactivate a user's account.
@@ -78,6 +148,7 @@ class UserService():
         Raises:
             UserNotFoundError: If the user cannot be found.
             UserAlreadyDeactivatedError: If the user is already inactive.
+            UserConflictError: If the user was modified concurrently.
         """
         user =await  self.user_repository.get_by_id(user_id)
         if not user:
@@ -86,7 +157,10 @@ class UserService():
             raise UserAlreadyDeactivatedError("User alreadt deactivated")
         else:
             user.is_active = False
-            return await self.user_repository.update(user)
+            try:
+                return await self.user_repository.update(user)
+            except UserVersionConflictError as e:
+                raise UserConflictError(str(e))
 
     async def get_by_email(self, email: str) -> User:
         """Fetch a user by email address.
@@ -100,9 +174,71 @@ class UserService():
         Raises:
             UserNotFoundError: If no user exists with that email.
         """
-        user = await self.user_repository.get_by_email(email)
+        if not self._may_exist(email):
+            raise UserNotFoundError("User not found")
+        try:
+            user = await self.user_repository.get_by_email(email)
+        except UserRecordNotFoundError:
+            user = None
         if not user:
             raise UserNotFoundError("User not found")
         return user
 
-    
+    async def delete_user(self, user_id: int) -> None:
+        """Delete a user's account.
+
+        Args:
+            user_id: Identifier of the user to delete.
+
+        Raises:
+            UserNotFoundError: If the user cannot be found.
+        """
+        try:
+            user = await self.user_repository.get_by_id(user_id)
+            await self.user_repository.delete(user_id)
+        except UserRecordNotFoundError:
+            raise UserNotFoundError("User not found")
+        if self.email_filter is not None:
+            self.email_filter.discard(user.email)
+
+    async def authenticate(self, email: str, password: str) -> User:
+        """Check a user's email and password.
+
+        A failed login takes about as long whether or not the email is
+        registered. If the stored hash was made with a different work
+        factor than the current one, it is replaced by a fresh hash of the
+        same password.
+
+        Args:
+            email: Email address of the user.
+            password: Raw password to check.
+
+        Returns:
+            The authenticated `User` entity.
+
+        Raises:
+            InvalidCredentialsError: If no active user matches the email
+                and password.
+        """
+        user = None
+        key = normalize_email(email)
+        if key not in self.unknown_emails and self._may_exist(email):
+            try:
+                user = await self.user_repository.get_by_email(email)
+            except UserRecordNotFoundError:
+                pass
+            if user is None:
+                self.unknown_emails.add(key)
+        if user is None:
+            await self.password_hasher.verify_dummy(password)
+            raise InvalidCredentialsError("Invalid email or password")
+        if not await self.password_hasher.verify(password, user.password_hash) or not user.is_active:
+            raise InvalidCredentialsError("Invalid email or password")
+        if self.password_hasher.needs_rehash(user.password_hash):
+            user.password_hash = await self.password_hasher.hash(password)
+            try:
+                user = await self.user_repository.update(user)
+            except RepositoryError:
+                # The login itself succeeded; the rehash is retried next time.
+                pass
+        return user
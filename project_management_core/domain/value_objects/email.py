@@ -5,4 +5,9 @@ class Email:
     def __init__(self, email) -> None:
         if not re.fullmatch(REGEX, email):
             raise ValueError("Email is incorrect")
-        self.email = email
\ No newline at end of file
+        self.email = email
+
+
+def normalize_email(email: str) -> str:
+    """Return the canonical form of `email` used for lookups and uniqueness."""
+    return email.strip().lower()
@@ -0,0 +1,524 @@
+import asyncio
+import json
+import os
+import tarfile
+import time
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO
+
+from sqlalchemy import bindparam, func, select, union
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.value_objects.email import normalize_email
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    AsyncRepository,
+)
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    DocumentModel,
+    ProjectMember,
+    ProjectModel,
+    UserModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectRepositoryImpl,
+)
+
+ARCHIVE_FORMAT = 1
+BLOCK_SIZE = tarfile.BLOCKSIZE
+_PATH_SEPARATORS = {"/", "\\", os.sep, os.altsep} - {None}
+
+
+class ProjectArchiveError(Exception):
+    """Raised when a project archive cannot be written or restored.
+
+    `project_id` is set when an import failed after creating the target
+    project; pass it back as `resume_project_id` to continue the import.
+    """
+    def __init__(self, message: str, project_id: int | None = None):
+        super().__init__(message)
+        self.project_id = project_id
+
+
+@dataclass
+class ArchiveProgress:
+    """Running totals of an export or import."""
+    project_id: int | None = None
+    documents: int = 0
+    documents_skipped: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the transfer started."""
+        return time.monotonic() - self.started
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average throughput so far."""
+        return self.bytes / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class _FilePart:
+    path: str
+    size: int
+
+
+@dataclass
+class _Manifest:
+    """A validated `project.json`, with normalized emails."""
+    name: str
+    description: str
+    owner: str
+    members: dict[str, str]
+    users: set[str]
+
+
+def _parse_manifest(data: bytes) -> _Manifest:
+    """Validate `project.json` before anything is written."""
+    try:
+        manifest = json.loads(data)
+        if manifest.get("format") != ARCHIVE_FORMAT:
+            raise ProjectArchiveError(f"Unsupported archive format: {manifest.get('format')}")
+        project = Project(
+            name=manifest["project"]["name"], description=manifest["project"]["description"], owner_id=0
+        )
+        parsed = _Manifest(
+            name=project.name,
+            description=project.description,
+            owner=normalize_email(manifest["owner"]),
+            members={normalize_email(member["email"]): member["role"] for member in manifest["members"]},
+            users={normalize_email(email) for email in manifest["users"]},
+        )
+    except (AttributeError, KeyError, TypeError, ValueError) as e:
+        raise ProjectArchiveError(f"Invalid project.json: {e!r}") from e
+    unlisted = sorted(({parsed.owner} | set(parsed.members)) - parsed.users)
+    if unlisted:
+        raise ProjectArchiveError(f"Invalid project.json: users not listed: {', '.join(unlisted)}")
+    return parsed
+
+
+def _header(name: str, size: int, mtime: float = 0) -> bytes:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(mtime)
+    info.mode = 0o644
+    return info.tobuf(tarfile.USTAR_FORMAT, "utf-8", "strict")
+
+
+def _padding(size: int) -> bytes:
+    return b"\0" * (-size % BLOCK_SIZE)
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _json_member(name: str, value: dict, mtime: float = 0) -> bytes:
+    data = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+    return _header(name, len(data), mtime) + data + _padding(len(data))
+
+
+class _StreamReader:
+    """Reads exact byte counts from an async byte stream or a binary file."""
+    def __init__(self, stream: AsyncIterable[bytes] | BinaryIO, chunk_size: int):
+        self._chunks = self._read_file(stream, chunk_size) if hasattr(stream, "read") else aiter(stream)
+        self._buffer = bytearray()
+
+    @staticmethod
+    async def _read_file(file: BinaryIO, chunk_size: int) -> AsyncIterator[bytes]:
+        while chunk := await asyncio.to_thread(file.read, chunk_size):
+            yield chunk
+
+    async def _fill(self) -> None:
+        try:
+            self._buffer += await anext(self._chunks)
+        except StopAsyncIteration:
+            raise ProjectArchiveError("Archive is truncated")
+
+    async def read_exactly(self, size: int) -> bytes:
+        while len(self._buffer) < size:
+            await self._fill()
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    async def iter_exactly(self, size: int) -> AsyncIterator[bytes]:
+        remaining = size
+        while remaining:
+            if not self._buffer:
+                await self._fill()
+            take = min(remaining, len(self._buffer))
+            yield bytes(self._buffer[:take])
+            del self._buffer[:take]
+            remaining -= take
+
+
+class ProjectArchiver:
+    """Exports projects to, and restores them from, streamed tar archives.
+
+    An archive holds `project.json` (the project, owner and members, with
+    users identified by email) followed by one `meta.json` and one
+    `content` member per document, in document ID order. Neither direction
+    holds more than one chunk of file data or one batch of document rows
+    in memory.
+    """
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        upload_dir: str = "uploads",
+        chunk_size: int = 1024 * 1024,
+        batch_size: int = 100,
+    ):
+        """Initialize the archiver.
+
+        Args:
+            session_maker: Factory for sessions on the primary database.
+            upload_dir: Directory imported files are written to.
+            chunk_size: Bytes read or written per file operation.
+            batch_size: Documents read or inserted per transaction.
+        """
+        self.session_maker = session_maker
+        self.upload_dir = upload_dir
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+
+    async def export_project(
+        self,
+        project_id: int,
+        offset: int = 0,
+        on_progress: Callable[[ArchiveProgress], None] | None = None,
+    ) -> AsyncIterator[bytes]:
+        """Stream a project as a tar archive.
+
+        The archive is byte-for-byte reproducible while the project is not
+        modified, so an interrupted download can resume from `offset`;
+        files before the offset are skipped without being read.
+
+        Args:
+            project_id: Identifier of the project to export.
+            offset: Number of leading archive bytes to leave out.
+            on_progress: Called after each document with running totals.
+
+        Yields:
+            Consecutive chunks of the archive.
+
+        Raises:
+            ProjectArchiveError: If the project does not exist or a
+                document's file is missing.
+        """
+        progress = ArchiveProgress(project_id=project_id)
+        position = 0
+        async for part in self._export_parts(project_id, progress, on_progress):
+            size = part.size if isinstance(part, _FilePart) else len(part)
+            if position + size <= offset:
+                position += size
+                continue
+            skip = max(0, offset - position)
+            position += size
+            if isinstance(part, _FilePart):
+                async for chunk in self._read_file(part.path, skip, part.size):
+                    progress.bytes += len(chunk)
+                    yield chunk
+            else:
+                progress.bytes += size - skip
+                yield part[skip:]
+
+    async def _export_parts(
+        self,
+        project_id: int,
+        progress: ArchiveProgress,
+        on_progress: Callable[[ArchiveProgress], None] | None,
+    ) -> AsyncIterator[bytes | _FilePart]:
+        async with self.session_maker() as session:
+            project = await session.get(ProjectModel, project_id)
+            if project is None:
+                raise ProjectArchiveError(f"Project {project_id} not found")
+            members = (await session.execute(
+                select(UserModel.email, ProjectMember.role)
+                .join(ProjectMember, ProjectMember.user_id == UserModel.id)
+                .where(ProjectMember.project_id == project_id)
+                .order_by(ProjectMember.id)
+            )).all()
+            user_ids = union(
+                select(ProjectModel.owner_id).where(ProjectModel.id == project_id),
+                select(ProjectMember.user_id).where(ProjectMember.project_id == project_id),
+                select(DocumentModel.uploaded_by).where(DocumentModel.project_id == project_id),
+            ).subquery()
+            users = (await session.scalars(
+                select(UserModel.email).where(UserModel.id.in_(select(user_ids))).order_by(UserModel.email)
+            )).all()
+            owner_email = await session.scalar(select(UserModel.email).where(UserModel.id == project.owner_id))
+            document_count = await session.scalar(
+                select(func.count()).select_from(DocumentModel).where(DocumentModel.project_id == project_id)
+            )
+            manifest = _json_member("project.json", {
+                "format": ARCHIVE_FORMAT,
+                "project": {"name": project.name, "description": project.description},
+                "owner": owner_email,
+                "members": [{"email": email, "role": role} for email, role in members],
+                "users": list(users),
+                "document_count": document_count,
+            })
+        yield manifest
+
+        # One short read per batch, keyed on the last document ID, so no
+        # session or transaction stays open while the archive is consumed.
+        documents = (
+            select(DocumentModel, UserModel.email)
+            .join(UserModel, UserModel.id == DocumentModel.uploaded_by)
+            .where(DocumentModel.project_id == project_id, DocumentModel.id > bindparam("after_id"))
+            .order_by(DocumentModel.id)
+            .limit(self.batch_size)
+        )
+        index = 0
+        after_id = 0
+        while True:
+            async with self.session_maker() as session:
+                batch = (await session.execute(documents, {"after_id": after_id})).all()
+            if not batch:
+                break
+            after_id = batch[-1][0].id
+            for document, uploader_email in batch:
+                try:
+                    size = os.path.getsize(document.file_path)
+                except OSError:
+                    raise ProjectArchiveError(f"File of document {document.id} is missing: {document.file_path}")
+                mtime = document.uploaded_at.timestamp() if document.uploaded_at else 0
+                prefix = f"documents/{index:08d}"
+                yield _json_member(f"{prefix}/meta.json", {
+                    "original_filename": document.original_filename,
+                    "generated_filename": document.generated_filename,
+                    "content_type": document.content_type,
+                    "file_size": size,
+                    "uploaded_by": uploader_email,
+                    "uploaded_at": document.uploaded_at.isoformat() if document.uploaded_at else None,
+                }, mtime)
+                yield _header(f"{prefix}/content", size, mtime)
+                yield _FilePart(document.file_path, size)
+                yield _padding(size)
+                index += 1
+                progress.documents += 1
+                if on_progress is not None:
+                    on_progress(progress)
+        yield b"\0" * (2 * BLOCK_SIZE)
+
+    async def _read_file(self, path: str, start: int, size: int) -> AsyncIterator[bytes]:
+        """Yield bytes `start`..`size` of a file, one chunk per thread hop."""
+        f = await asyncio.to_thread(open, path, "rb")
+        try:
+            await asyncio.to_thread(f.seek, start)
+            remaining = size - start
+            while remaining > 0:
+                chunk = await asyncio.to_thread(f.read, min(self.chunk_size, remaining))
+                if not chunk:
+                    raise ProjectArchiveError(f"File changed during export: {path}")
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            await asyncio.to_thread(f.close)
+
+    async def import_project(
+        self,
+        stream: AsyncIterable[bytes] | BinaryIO,
+        resume_project_id: int | None = None,
+        on_progress: Callable[[ArchiveProgress], None] | None = None,
+    ) -> ArchiveProgress:
+        """Restore a project from an archive made by `export_project`.
+
+        Users are matched by email and must already exist. Documents are
+        inserted in batches, each committed after its files are written,
+        so an interrupted import can be resumed: pass the `project_id` of
+        the `ProjectArchiveError` as `resume_project_id`, and documents
+        already imported are skipped without writing their files. This
+        assumes no documents were added to that project in between. The
+        project, its members and its documents are recorded in the outbox
+        as they are created, like any others.
+
+        Args:
+            stream: The archive, as an async iterable of byte chunks or a
+                binary file opened for reading.
+            resume_project_id: Project created by an earlier, interrupted
+                import of the same archive.
+            on_progress: Called after each document with running totals.
+
+        Returns:
+            Final totals, including the ID of the restored project.
+
+        Raises:
+            ProjectArchiveError: If the archive is invalid, references
+                unknown users, or the import fails part-way.
+        """
+        reader = _StreamReader(stream, self.chunk_size)
+        name, size = await self._next_member(reader)
+        if name != "project.json":
+            raise ProjectArchiveError("Archive does not start with project.json")
+        manifest = _parse_manifest(await self._read_member(reader, size))
+
+        progress = ArchiveProgress(project_id=resume_project_id)
+        os.makedirs(self.upload_dir, exist_ok=True)
+        async with self.session_maker() as session:
+            user_ids = await self._resolve_users(session, manifest.users)
+            if resume_project_id is None:
+                project = await ProjectRepositoryImpl(session).create(Project(
+                    name=manifest.name, description=manifest.description, owner_id=user_ids[manifest.owner],
+                ))
+                progress.project_id = project.id
+                already_imported = 0
+            else:
+                if await session.get(ProjectModel, resume_project_id) is None:
+                    raise ProjectArchiveError(f"Project {resume_project_id} not found")
+                already_imported = await AsyncRepository(session, DocumentModel).count(
+                    DocumentModel.project_id == resume_project_id
+                )
+            try:
+                await ProjectRepositoryImpl(session).add_members(
+                    progress.project_id, {user_ids[email]: role for email, role in manifest.members.items()}
+                )
+                await self._import_documents(session, reader, user_ids, progress, already_imported, on_progress)
+                await DocumentRepositoryImpl(session).rebuild_project_stats(progress.project_id)
+            except ProjectArchiveError as e:
+                await session.rollback()
+                e.project_id = progress.project_id
+                raise
+            except Exception as e:
+                await session.rollback()
+                raise ProjectArchiveError(
+                    f"Import into project {progress.project_id} failed: {e}", progress.project_id
+                ) from e
+        return progress
+
+    async def _import_documents(
+        self,
+        session,
+        reader: _StreamReader,
+        user_ids: dict[str, int],
+        progress: ArchiveProgress,
+        already_imported: int,
+        on_progress: Callable[[ArchiveProgress], None] | None,
+    ) -> None:
+        batch: list[dict] = []
+        try:
+            await self._import_document_members(
+                session, reader, user_ids, progress, already_imported, on_progress, batch
+            )
+        except BaseException:
+            # Files of documents whose rows were never committed.
+            for row in batch:
+                await asyncio.to_thread(_remove, row["file_path"])
+            raise
+
+    async def _import_document_members(
+        self,
+        session,
+        reader: _StreamReader,
+        user_ids: dict[str, int],
+        progress: ArchiveProgress,
+        already_imported: int,
+        on_progress: Callable[[ArchiveProgress], None] | None,
+        batch: list[dict],
+    ) -> None:
+        while True:
+            name, size = await self._next_member(reader)
+            if name is None:
+                break
+            if not name.endswith("/meta.json"):
+                raise ProjectArchiveError(f"Unexpected archive member: {name}")
+            meta = json.loads(await self._read_member(reader, size))
+            name, size = await self._next_member(reader)
+            if name is None or not name.endswith("/content"):
+                raise ProjectArchiveError(f"Document {meta['generated_filename']} has no content")
+
+            if already_imported:
+                already_imported -= 1
+                async for _ in reader.iter_exactly(size + len(_padding(size))):
+                    pass
+                progress.documents_skipped += 1
+                continue
+
+            # Never write under a name taken from the archive: it could
+            # point outside `upload_dir` or at another document's file.
+            archived_name = meta["generated_filename"]
+            if not archived_name or any(sep in archived_name for sep in _PATH_SEPARATORS):
+                raise ProjectArchiveError(f"Invalid document filename in archive: {archived_name!r}")
+            generated_filename = f"{uuid.uuid4()}{os.path.splitext(archived_name)[1]}"
+            path = os.path.join(self.upload_dir, generated_filename)
+            await self._write_file(reader, path, size)
+            await reader.read_exactly(len(_padding(size)))
+            batch.append({
+                "original_filename": meta["original_filename"],
+                "generated_filename": generated_filename,
+                "file_path": path,
+                "file_size": size,
+                "content_type": meta["content_type"],
+                "project_id": progress.project_id,
+                "uploaded_by": user_ids[normalize_email(meta["uploaded_by"])],
+                "uploaded_at": datetime.fromisoformat(meta["uploaded_at"]) if meta["uploaded_at"] else None,
+            })
+            progress.documents += 1
+            progress.bytes += size
+            if len(batch) >= self.batch_size:
+                await self._insert_documents(session, batch)
+            if on_progress is not None:
+                on_progress(progress)
+        await self._insert_documents(session, batch)
+
+    async def _insert_documents(self, session, batch: list[dict]) -> None:
+        if batch:
+            await DocumentRepositoryImpl(session).insert_many(batch)
+            batch.clear()
+
+    async def _write_file(self, reader: _StreamReader, path: str, size: int) -> None:
+        """Stream `size` bytes into `path`, replacing it only once complete."""
+        partial = path + ".part"
+        f = await asyncio.to_thread(open, partial, "wb")
+        try:
+            try:
+                async for chunk in reader.iter_exactly(size):
+                    await asyncio.to_thread(f.write, chunk)
+                await asyncio.to_thread(os.fsync, f.fileno())
+            finally:
+                await asyncio.to_thread(f.close)
+        except BaseException:
+            await asyncio.to_thread(_remove, partial)
+            raise
+        await asyncio.to_thread(os.replace, partial, path)
+
+    async def _resolve_users(self, session, emails: set[str]) -> dict[str, int]:
+        """Map normalized archive emails to local user IDs, failing on unknown ones."""
+        if not emails:
+            return {}
+        lowered = func.lower(UserModel.email)
+        rows = (await session.execute(select(lowered, UserModel.id).where(lowered.in_(emails)))).all()
+        found = dict(rows)
+        missing = sorted(emails - set(found))
+        if missing:
+            raise ProjectArchiveError(f"Unknown users in archive: {', '.join(missing)}")
+        return found
+
+    async def _next_member(self, reader: _StreamReader) -> tuple[str | None, int]:
+        """Read the next tar header; return (None, 0) at the end of the archive."""
+        block = await reader.read_exactly(BLOCK_SIZE)
+        if block == b"\0" * BLOCK_SIZE:
+            return None, 0
+        try:
+            info = tarfile.TarInfo.frombuf(block, "utf-8", "strict")
+        except tarfile.HeaderError as e:
+            raise ProjectArchiveError(f"Invalid archive header: {e}")
+        return info.name, info.size
+
+    async def _read_member(self, reader: _StreamReader, size: int) -> bytes:
+        data = await reader.read_exactly(size)
+        await reader.read_exactly(len(_padding(size)))
+        return data
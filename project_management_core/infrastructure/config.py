@@ -1,3 +1,6 @@
 from os import getenv
 
-DB_URL = getenv("DB_URL")
\ No newline at end of file
+DB_URL = getenv("DB_URL")
+DB_REPLICA_URLS = [url.strip() for url in getenv("DB_REPLICA_URLS", "").split(",") if url.strip()]
+DB_REPLICA_STRATEGY = getenv("DB_REPLICA_STRATEGY", "round_robin")
+DB_SQLITE_READERS = int(getenv("DB_SQLITE_READERS", "4"))
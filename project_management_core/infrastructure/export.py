@@ -0,0 +1,276 @@
+import asyncio
+import bz2
+import csv
+import io
+import json
+import lzma
+import os
+import time
+import zlib
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, BinaryIO
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.user_repository_impl import (
+    UserRepositoryImpl,
+)
+
+CSV = "csv"
+JSONL = "jsonl"
+FORMATS = (CSV, JSONL)
+
+# Incremental compressors; each has `compress(data)` and `flush()`.
+COMPRESSORS: dict[str, Callable[[], Any]] = {
+    "gzip": lambda: zlib.compressobj(6, zlib.DEFLATED, 31),
+    "bz2": lambda: bz2.BZ2Compressor(9),
+    "xz": lambda: lzma.LZMACompressor(),
+}
+
+USER_FIELDS = ("id", "email", "is_active")
+DOCUMENT_FIELDS = (
+    "id",
+    "project_id",
+    "original_filename",
+    "content_type",
+    "file_size",
+    "uploaded_by",
+    "uploaded_at",
+)
+
+# Where an export is written: a file path, a binary file object, or a
+# coroutine function called with each chunk of output.
+ExportSink = str | os.PathLike | BinaryIO | Callable[[bytes], Awaitable[None]]
+
+
+class ExportError(Exception):
+    """Raised when an export cannot be written."""
+
+
+@dataclass
+class ExportResult:
+    """Totals of a finished export."""
+    rows: int = 0
+    bytes: int = 0
+    started: float = field(default_factory=time.monotonic)
+    finished: float | None = None
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds the export took, or has taken so far."""
+        return (self.finished or time.monotonic()) - self.started
+
+
+def _value(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+class _Encoder:
+    """Turns records into CSV or JSONL lines."""
+    def __init__(self, format: str, fields: tuple[str, ...]):
+        if format not in FORMATS:
+            raise ValueError(f"Unknown export format: {format}")
+        self.format = format
+        self.fields = fields
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text, lineterminator="\n")
+
+    def header(self) -> bytes:
+        if self.format == JSONL:
+            return b""
+        return self._csv_line(self.fields)
+
+    def encode(self, record: Any) -> bytes:
+        values = [_value(getattr(record, name)) for name in self.fields]
+        if self.format == JSONL:
+            return json.dumps(dict(zip(self.fields, values)), separators=(",", ":")).encode() + b"\n"
+        return self._csv_line(["" if value is None else value for value in values])
+
+    def _csv_line(self, values) -> bytes:
+        self._text.seek(0)
+        self._text.truncate()
+        self._csv.writerow(values)
+        return self._text.getvalue().encode()
+
+
+class _Writer:
+    """Buffers, optionally compresses, and writes output to a sink.
+
+    Output is handed to the sink in chunks of about `buffer_size` bytes;
+    file writes run in a thread so the event loop keeps serving requests.
+    A path is written to `<path>.part` and renamed once complete, so a
+    failed export never leaves a truncated file under the final name.
+    """
+    def __init__(self, sink: ExportSink, compression: str | None, buffer_size: int):
+        if compression is not None and compression not in COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+        self.sink = sink
+        self.buffer_size = buffer_size
+        self.bytes = 0
+        self._compressor = COMPRESSORS[compression]() if compression else None
+        self._buffer = bytearray()
+        self._file: BinaryIO | None = None
+        self._path: str | None = None
+
+    async def open(self) -> None:
+        if isinstance(self.sink, (str, os.PathLike)):
+            self._path = os.fspath(self.sink)
+            self._file = await asyncio.to_thread(open, self._path + ".part", "wb")
+        elif hasattr(self.sink, "write"):
+            self._file = self.sink
+
+    async def write(self, data: bytes) -> None:
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            await self._drain()
+
+    async def _drain(self, final: bool = False) -> None:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        if self._compressor is not None:
+            data = self._compressor.compress(data)
+            if final:
+                data += self._compressor.flush()
+        if not data:
+            return
+        if self._file is not None:
+            await asyncio.to_thread(self._file.write, data)
+        else:
+            await self.sink(data)
+        self.bytes += len(data)
+
+    async def close(self) -> None:
+        await self._drain(final=True)
+        if self._path is not None:
+            await asyncio.to_thread(self._finish_file)
+
+    def _finish_file(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        os.replace(self._path + ".part", self._path)
+
+    async def abort(self) -> None:
+        if self._path is not None:
+            await asyncio.to_thread(self._discard_file)
+
+    def _discard_file(self) -> None:
+        # The file is None if opening it was what failed.
+        if self._file is not None:
+            self._file.close()
+        try:
+            os.remove(self._path + ".part")
+        except OSError:
+            pass
+
+
+class RecordExporter:
+    """Writes users and documents out as CSV or JSONL in constant memory.
+
+    Rows are read through server-side cursors `batch_size` at a time and
+    encoded one by one into a buffer of `buffer_size` bytes, so memory use
+    does not depend on the number of rows exported. Password hashes and
+    file paths are never exported.
+
+    Usage:
+        exporter = RecordExporter(get_session_maker())
+        await exporter.export_users("users.csv.gz", format="csv", compression="gzip")
+    """
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        batch_size: int = 1000,
+        buffer_size: int = 64 * 1024,
+    ):
+        """Initialize the exporter.
+
+        Args:
+            session_maker: Factory for the sessions exports read from.
+            batch_size: Rows fetched per database round trip.
+            buffer_size: Bytes of output collected before each write.
+        """
+        self.session_maker = session_maker
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+
+    async def export_users(
+        self,
+        sink: ExportSink,
+        format: str = JSONL,
+        compression: str | None = None,
+    ) -> ExportResult:
+        """Export every user.
+
+        Args:
+            sink: A file path, a binary file opened for writing, or a
+                coroutine function called with each chunk of output.
+            format: "csv" or "jsonl".
+            compression: None, "gzip", "bz2" or "xz".
+
+        Returns:
+            Row and byte counts of the export.
+
+        Raises:
+            ValueError: If `format` or `compression` is unknown.
+            ExportError: If the rows could not be read or written.
+        """
+        async with self.session_maker() as session:
+            records = UserRepositoryImpl(session).stream_all(batch_size=self.batch_size)
+            return await self._export(records, USER_FIELDS, sink, format, compression)
+
+    async def export_documents(
+        self,
+        project_id: int,
+        sink: ExportSink,
+        format: str = JSONL,
+        compression: str | None = None,
+    ) -> ExportResult:
+        """Export the metadata of every document in a project.
+
+        Args:
+            project_id: Project whose documents are exported.
+            sink: A file path, a binary file opened for writing, or a
+                coroutine function called with each chunk of output.
+            format: "csv" or "jsonl".
+            compression: None, "gzip", "bz2" or "xz".
+
+        Returns:
+            Row and byte counts of the export.
+
+        Raises:
+            ValueError: If `format` or `compression` is unknown.
+            ExportError: If the rows could not be read or written.
+        """
+        async with self.session_maker() as session:
+            records = DocumentRepositoryImpl(session).stream_by_project(project_id, batch_size=self.batch_size)
+            return await self._export(records, DOCUMENT_FIELDS, sink, format, compression)
+
+    async def _export(
+        self,
+        records: AsyncIterator[Any],
+        fields: tuple[str, ...],
+        sink: ExportSink,
+        format: str,
+        compression: str | None,
+    ) -> ExportResult:
+        encoder = _Encoder(format, fields)
+        writer = _Writer(sink, compression, self.buffer_size)
+        result = ExportResult()
+        try:
+            await writer.open()
+            await writer.write(encoder.header())
+            async for record in records:
+                await writer.write(encoder.encode(record))
+                result.rows += 1
+            await writer.close()
+        except Exception as e:
+            await writer.abort()
+            raise ExportError(f"Export failed after {result.rows} rows: {e}") from e
+        result.bytes = writer.bytes
+        result.finished = time.monotonic()
+        return result
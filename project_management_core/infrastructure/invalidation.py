@@ -0,0 +1,365 @@
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.domain.services.email_filter import EmailBloomFilter
+from project_management_core.domain.services.password_hasher import UnknownEmailCache
+from project_management_core.domain.value_objects.email import normalize_email
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    INVALIDATION_BUS_KEY,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def user_key(user_id: int) -> str:
+    """Cache key of a single user."""
+    return f"user:{user_id}"
+
+
+def user_email_key(email: str) -> str:
+    """Cache key of the user registered with `email`, if any."""
+    return f"user_email:{normalize_email(email)}"
+
+
+def project_key(project_id: int) -> str:
+    """Cache key of a single project, including its participants."""
+    return f"project:{project_id}"
+
+
+def user_projects_key(user_id: int) -> str:
+    """Cache key of the list of projects a user owns or has joined."""
+    return f"user_projects:{user_id}"
+
+
+class InvalidationTransport(ABC):
+    """Carries invalidation messages between worker processes."""
+
+    @abstractmethod
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        """Connect and call `on_message` for every message received."""
+        pass
+
+    @abstractmethod
+    async def send(self, message: str) -> None:
+        """Deliver `message` to every connected transport, this one included."""
+        pass
+
+    async def close(self) -> None:
+        """Disconnect; the transport can't be used afterwards."""
+        pass
+
+
+class InMemoryHub:
+    """Connects in-memory transports within one process, e.g. in tests."""
+    def __init__(self):
+        self._handlers: list[Callable[[str], None]] = []
+
+    def transport(self) -> "InMemoryTransport":
+        """Return a new transport connected to this hub."""
+        return InMemoryTransport(self)
+
+
+class InMemoryTransport(InvalidationTransport):
+    """Delivers messages to the other transports of an `InMemoryHub`."""
+    def __init__(self, hub: InMemoryHub | None = None):
+        """Initialize the transport.
+
+        Args:
+            hub: Hub to connect to. Defaults to a private hub.
+        """
+        self.hub = hub or InMemoryHub()
+        self._handler: Callable[[str], None] | None = None
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        self._handler = on_message
+        self.hub._handlers.append(on_message)
+
+    async def send(self, message: str) -> None:
+        loop = asyncio.get_running_loop()
+        for handler in list(self.hub._handlers):
+            loop.call_soon(handler, message)
+
+    async def close(self) -> None:
+        if self._handler in self.hub._handlers:
+            self.hub._handlers.remove(self._handler)
+
+
+class UnixSocketBroker:
+    """Relays newline-delimited messages between clients of a Unix socket.
+
+    Run one per host (e.g. in the process manager) for
+    `UnixSocketTransport` to connect to.
+    """
+    def __init__(self, path: str):
+        """Initialize the broker.
+
+        Args:
+            path: Filesystem path to listen on.
+        """
+        self.path = path
+        self._server: asyncio.AbstractServer | None = None
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Start accepting clients."""
+        self._server = await asyncio.start_unix_server(self._serve, self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._clients.add(writer)
+        self._handlers.add(asyncio.current_task())
+        try:
+            while line := await reader.readline():
+                for client in list(self._clients):
+                    client.write(line)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    async def close(self) -> None:
+        """Stop accepting clients and disconnect the connected ones."""
+        if self._server is not None:
+            self._server.close()
+        handlers = list(self._handlers)
+        for client in list(self._clients):
+            client.close()
+        await asyncio.gather(*handlers, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+
+class UnixSocketTransport(InvalidationTransport):
+    """Exchanges messages through a `UnixSocketBroker`."""
+    def __init__(self, path: str):
+        """Initialize the transport.
+
+        Args:
+            path: Filesystem path of the broker's socket.
+        """
+        self.path = path
+        self._writer: asyncio.StreamWriter | None = None
+        self._reader_task: asyncio.Task | None = None
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._reader_task = asyncio.create_task(self._read(reader, on_message))
+
+    async def _read(self, reader: asyncio.StreamReader, on_message: Callable[[str], None]) -> None:
+        while line := await reader.readline():
+            on_message(line.decode().rstrip("\n"))
+        logger.warning("Invalidation broker at %s closed the connection", self.path)
+
+    async def send(self, message: str) -> None:
+        self._writer.write(message.encode() + b"\n")
+        await self._writer.drain()
+
+    async def close(self) -> None:
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        if self._writer is not None:
+            self._writer.close()
+
+
+class PostgresNotifyTransport(InvalidationTransport):
+    """Exchanges messages through PostgreSQL `LISTEN`/`NOTIFY`.
+
+    Uses one dedicated asyncpg connection per worker, outside the
+    SQLAlchemy pool, since a listening connection can't be shared.
+    """
+    def __init__(self, dsn: str, channel: str = "cache_invalidation"):
+        """Initialize the transport.
+
+        Args:
+            dsn: PostgreSQL URL; a SQLAlchemy "postgresql+asyncpg://" URL
+                is accepted too.
+            channel: Notification channel shared by all workers.
+        """
+        self.dsn = dsn.replace("postgresql+asyncpg://", "postgresql://", 1)
+        self.channel = channel
+        self._connection = None
+        self._lock = asyncio.Lock()
+
+    async def start(self, on_message: Callable[[str], None]) -> None:
+        import asyncpg
+
+        self._connection = await asyncpg.connect(self.dsn)
+        await self._connection.add_listener(
+            self.channel, lambda connection, pid, channel, payload: on_message(payload)
+        )
+
+    async def send(self, message: str) -> None:
+        async with self._lock:
+            await self._connection.execute("SELECT pg_notify($1, $2)", self.channel, message)
+
+    async def close(self) -> None:
+        if self._connection is not None:
+            await self._connection.close()
+
+
+class InvalidationBus:
+    """Broadcasts stale cache keys to every worker process.
+
+    Repository writes publish keys (see `user_key`, `project_key`, ...)
+    once their transaction commits. Subscribers in the publishing process
+    are called at once; other processes receive the keys through the
+    transport. Keys published within `flush_interval` of each other are
+    de-duplicated and sent together, split into messages of at most
+    `max_message_bytes`, so a bulk operation costs a handful of messages.
+
+    Delivery is best effort: a message lost while a worker reconnects is
+    not replayed, so caches should still expire entries on their own.
+
+    Usage:
+        bus = InvalidationBus(PostgresNotifyTransport(config.DB_URL))
+        bus.install(get_session_maker())
+        bus.subscribe(lambda keys: cache.evict(keys))
+        await bus.start()
+    """
+    def __init__(
+        self,
+        transport: InvalidationTransport,
+        flush_interval: float = 0.05,
+        max_message_bytes: int = 7000,
+    ):
+        """Initialize the bus.
+
+        Args:
+            transport: How messages reach other processes.
+            flush_interval: Seconds to collect keys before sending them.
+            max_message_bytes: Size limit of one message; PostgreSQL
+                rejects notification payloads over 8000 bytes.
+        """
+        self.transport = transport
+        self.flush_interval = flush_interval
+        self.max_message_bytes = max_message_bytes
+        self.sender = uuid.uuid4().hex
+        self._subscribers: list[Callable[[frozenset[str]], None]] = []
+        self._pending: set[str] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flushing: set[asyncio.Task] = set()
+
+    def install(self, session_maker: async_sessionmaker) -> None:
+        """Make sessions from `session_maker` publish their writes to this bus."""
+        info = dict(session_maker.kw.get("info") or {})
+        info[INVALIDATION_BUS_KEY] = self
+        session_maker.configure(info=info)
+
+    def subscribe(self, callback: Callable[[frozenset[str]], None]) -> None:
+        """Call `callback` with each batch of stale keys, local or remote.
+
+        Callbacks run on the event loop and must not block.
+        """
+        self._subscribers.append(callback)
+
+    async def start(self) -> None:
+        """Connect the transport and send keys published so far."""
+        self._loop = asyncio.get_running_loop()
+        await self.transport.start(self._receive)
+        if self._pending:
+            self._schedule_flush()
+
+    def publish(self, keys: Iterable[str]) -> None:
+        """Invalidate `keys` in this process now and in the others shortly."""
+        keys = frozenset(keys)
+        if not keys:
+            return
+        self._notify(keys)
+        self._pending |= keys
+        if self._loop is not None:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self.flush_interval, self._start_flush)
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        task = self._loop.create_task(self.flush())
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    async def flush(self) -> None:
+        """Send all pending keys now."""
+        keys, self._pending = sorted(self._pending), set()
+        for message in self._messages(keys):
+            try:
+                await self.transport.send(message)
+            except Exception:
+                logger.exception("Could not send cache invalidations")
+
+    def _messages(self, keys: list[str]) -> Iterable[str]:
+        # Compact separators, so each key costs its quoted length plus one
+        # comma; ASCII-only output, so characters count as bytes.
+        def encode(batch: list[str]) -> str:
+            return json.dumps({"sender": self.sender, "keys": batch}, separators=(",", ":"))
+
+        batch: list[str] = []
+        size = 0
+        overhead = len(encode([]))
+        for key in keys:
+            key_size = len(json.dumps(key)) + 1
+            if batch and overhead + size + key_size > self.max_message_bytes:
+                yield encode(batch)
+                batch, size = [], 0
+            batch.append(key)
+            size += key_size
+        if batch:
+            yield encode(batch)
+
+    def _receive(self, message: str) -> None:
+        try:
+            data = json.loads(message)
+        except ValueError:
+            logger.warning("Ignoring malformed invalidation message: %.100s", message)
+            return
+        if data.get("sender") != self.sender:
+            self._notify(frozenset(data.get("keys", ())))
+
+    def _notify(self, keys: frozenset[str]) -> None:
+        for callback in self._subscribers:
+            try:
+                callback(keys)
+            except Exception:
+                logger.exception("Cache invalidation subscriber failed")
+
+    async def close(self) -> None:
+        """Send pending keys and disconnect."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        await asyncio.gather(*self._flushing)
+        if self._pending and self._loop is not None:
+            await self.flush()
+        await self.transport.close()
+
+
+def email_cache_subscriber(
+    unknown_emails: UnknownEmailCache, email_filter: EmailBloomFilter | None = None
+) -> Callable[[frozenset[str]], None]:
+    """Return a subscriber keeping `UserService`'s email caches in step with other workers.
+
+    Emails registered elsewhere are dropped from the unknown-email cache and
+    added to the Bloom filter. Deletions are not applied to the filter,
+    since a repeated message would decrement it twice; a stale entry only
+    costs one database lookup.
+    """
+    prefix = "user_email:"
+
+    def on_invalidate(keys: frozenset[str]) -> None:
+        for key in keys:
+            if key.startswith(prefix):
+                email = key[len(prefix):]
+                unknown_emails.discard(email)
+                if email_filter is not None:
+                    email_filter.add(email)
+    return on_invalidate
@@ -0,0 +1,460 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.domain.entities.document import Document
+from project_management_core.domain.repositories.document_repository import ProjectQuotaExceededError
+from project_management_core.domain.services.document_service import (
+    DocumentFilenameRequiredError,
+    DocumentQuotaExceededError,
+)
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    AsyncRepository,
+)
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    DocumentRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    UploadPartModel,
+    UploadSessionModel,
+)
+
+logger = logging.getLogger(__name__)
+
+OPEN = "open"
+COMPLETING = "completing"
+COMPLETED = "completed"
+
+MAX_PARTS = 10_000
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class MultipartUploadError(Exception):
+    """Raised when a multipart upload operation cannot be carried out."""
+
+class MultipartUploadNotFoundError(MultipartUploadError):
+    """The upload does not exist, was aborted, or has expired."""
+
+class MultipartChecksumMismatchError(MultipartUploadError):
+    """A part's contents don't match the checksum sent with it."""
+
+
+@dataclass
+class UploadSession:
+    """State of a multipart upload."""
+    id: str
+    project_id: int
+    uploaded_by: int
+    original_filename: str
+    content_type: str
+    status: str
+    created_at: datetime
+    expires_at: datetime
+    document_id: int | None = None
+
+
+@dataclass
+class UploadedPart:
+    """A part received for a multipart upload."""
+    part_number: int
+    size: int
+    checksum: str
+
+
+async def _chunks(data: bytes | BinaryIO | AsyncIterable[bytes], chunk_size: int) -> AsyncIterator[bytes]:
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        for start in range(0, len(data), chunk_size):
+            yield bytes(data[start:start + chunk_size])
+    elif hasattr(data, "read"):
+        while chunk := await asyncio.to_thread(data.read, chunk_size):
+            yield chunk
+    else:
+        async for chunk in data:
+            yield chunk
+
+
+class MultipartUploadManager:
+    """Resumable uploads of large files in independently sent parts.
+
+    A client calls `initiate`, sends numbered parts with `upload_part` -
+    in any order, in parallel, and re-sending any part that failed - and
+    finally calls `complete`, which joins the parts into one file and
+    registers it as a `Document` (queueing its post-upload processing), or
+    `abort`. `list_parts` tells a client that lost track which parts
+    arrived intact.
+
+    Parts are staged under `staging_dir/<upload ID>/`, each fsynced before
+    it is acknowledged. Every received part extends the upload's expiry by
+    `ttl`; `collect_expired` deletes uploads past their expiry together
+    with their staged parts and should run periodically (see `run`).
+
+    Usage:
+        uploads = MultipartUploadManager(get_session_maker())
+        upload = await uploads.initiate(project_id, user_id, "video.mp4", "video/mp4")
+        await uploads.upload_part(upload.id, 1, chunk, checksum=sha256_hex)
+        document = await uploads.complete(upload.id)
+    """
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        upload_dir: str = "uploads",
+        staging_dir: str | None = None,
+        ttl: timedelta = timedelta(hours=24),
+        max_part_size: int = 512 * 1024 * 1024,
+        project_quota_bytes: int | None = None,
+        chunk_size: int = 1024 * 1024,
+    ):
+        """Initialize the manager.
+
+        Args:
+            session_maker: Factory for sessions on the primary database.
+            upload_dir: Directory completed files are moved to; the same
+                as `DocumentService.upload_dir`.
+            staging_dir: Directory parts are kept in until completion.
+                Defaults to "<upload_dir>/.multipart"; keep it on the same
+                filesystem as `upload_dir`.
+            ttl: How long an upload stays open after its last activity.
+            max_part_size: Largest accepted part in bytes.
+            project_quota_bytes: Maximum total size of a project's
+                documents, checked on completion. Defaults to None (no quota).
+            chunk_size: Bytes read or written per file operation.
+        """
+        self.session_maker = session_maker
+        self.upload_dir = upload_dir
+        self.staging_dir = staging_dir or os.path.join(upload_dir, ".multipart")
+        self.ttl = ttl
+        self.max_part_size = max_part_size
+        self.project_quota_bytes = project_quota_bytes
+        self.chunk_size = chunk_size
+        os.makedirs(self.staging_dir, exist_ok=True)
+
+    def _part_path(self, upload_id: str, part_number: int) -> str:
+        return os.path.join(self.staging_dir, upload_id, f"{part_number:05d}")
+
+    async def initiate(
+        self, project_id: int, uploaded_by: int, original_filename: str, content_type: str
+    ) -> UploadSession:
+        """Start a multipart upload.
+
+        Args:
+            project_id: Project the document will belong to.
+            uploaded_by: Identifier of the uploading user.
+            original_filename: Original name of the uploaded file.
+            content_type: MIME type of the uploaded file.
+
+        Returns:
+            The new upload; its `id` is used for every further call.
+
+        Raises:
+            DocumentFilenameRequiredError: If the original filename is empty.
+        """
+        if not original_filename:
+            raise DocumentFilenameRequiredError("Filename is required")
+        now = _utcnow()
+        upload = UploadSession(
+            id=uuid.uuid4().hex,
+            project_id=project_id,
+            uploaded_by=uploaded_by,
+            original_filename=original_filename,
+            content_type=content_type,
+            status=OPEN,
+            created_at=now,
+            expires_at=now + self.ttl,
+        )
+        await asyncio.to_thread(os.makedirs, os.path.join(self.staging_dir, upload.id), exist_ok=True)
+        async with self.session_maker() as session:
+            await session.execute(UploadSessionModel.__table__.insert().values(**upload.__dict__))
+            await session.commit()
+        return upload
+
+    async def get_upload(self, upload_id: str) -> UploadSession:
+        """Return the current state of an upload.
+
+        Raises:
+            MultipartUploadNotFoundError: If the upload doesn't exist or has expired.
+        """
+        table = UploadSessionModel.__table__
+        async with self.session_maker() as session:
+            row = (await session.execute(select(table).where(table.c.id == upload_id))).first()
+        if row is None or row.expires_at <= _utcnow():
+            raise MultipartUploadNotFoundError(f"Upload {upload_id} not found or expired")
+        return UploadSession(**row._mapping)
+
+    async def upload_part(
+        self,
+        upload_id: str,
+        part_number: int,
+        data: bytes | BinaryIO | AsyncIterable[bytes],
+        checksum: str | None = None,
+    ) -> UploadedPart:
+        """Store one part, replacing an earlier copy of the same part.
+
+        Args:
+            upload_id: Identifier returned by `initiate`.
+            part_number: Position of the part, from 1 to 10000. Numbers may
+                have gaps; parts are joined in ascending order.
+            data: The part's bytes, a binary file, or an async iterable of chunks.
+            checksum: Expected hex SHA-256 of the part. When given, a part
+                that doesn't match is discarded.
+
+        Returns:
+            The stored part, with its computed checksum.
+
+        Raises:
+            ValueError: If `part_number` is out of range.
+            MultipartUploadNotFoundError: If the upload doesn't exist or has expired.
+            MultipartUploadError: If the upload is no longer open or the
+                part exceeds `max_part_size`.
+            MultipartChecksumMismatchError: If `checksum` doesn't match.
+        """
+        if not 1 <= part_number <= MAX_PARTS:
+            raise ValueError(f"part_number must be between 1 and {MAX_PARTS}")
+        upload = await self.get_upload(upload_id)
+        if upload.status != OPEN:
+            raise MultipartUploadError(f"Upload {upload_id} is {upload.status}")
+
+        path = self._part_path(upload_id, part_number)
+        partial = f"{path}.{uuid.uuid4().hex}.tmp"
+        digest = hashlib.sha256()
+        size = 0
+        f = await asyncio.to_thread(open, partial, "wb")
+        try:
+            try:
+                async for chunk in _chunks(data, self.chunk_size):
+                    size += len(chunk)
+                    if size > self.max_part_size:
+                        raise MultipartUploadError(f"Part exceeds {self.max_part_size} bytes")
+                    digest.update(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+                await asyncio.to_thread(os.fsync, f.fileno())
+            finally:
+                await asyncio.to_thread(f.close)
+            part = UploadedPart(part_number=part_number, size=size, checksum=digest.hexdigest())
+            if checksum is not None and checksum.lower() != part.checksum:
+                raise MultipartChecksumMismatchError(
+                    f"Part {part_number} has checksum {part.checksum}, expected {checksum.lower()}"
+                )
+            await asyncio.to_thread(os.replace, partial, path)
+        except BaseException:
+            await asyncio.to_thread(_remove, partial)
+            raise
+
+        async with self.session_maker() as session:
+            await AsyncRepository(session, UploadPartModel).bulk_upsert(
+                [{"session_id": upload_id, "uploaded_at": _utcnow(), **part.__dict__}],
+                index_elements=("session_id", "part_number"),
+            )
+            await session.execute(
+                update(UploadSessionModel.__table__)
+                .where(UploadSessionModel.__table__.c.id == upload_id)
+                .values(expires_at=_utcnow() + self.ttl)
+            )
+            await session.commit()
+        return part
+
+    async def list_parts(self, upload_id: str) -> list[UploadedPart]:
+        """Return the parts received so far, by part number.
+
+        Raises:
+            MultipartUploadNotFoundError: If the upload doesn't exist or has expired.
+        """
+        await self.get_upload(upload_id)
+        table = UploadPartModel.__table__
+        async with self.session_maker() as session:
+            rows = await session.execute(
+                select(table.c.part_number, table.c.size, table.c.checksum)
+                .where(table.c.session_id == upload_id)
+                .order_by(table.c.part_number)
+            )
+            return [UploadedPart(**row._mapping) for row in rows]
+
+    async def complete(self, upload_id: str, parts: list[UploadedPart] | None = None) -> Document:
+        """Join the parts into one file and register it as a document.
+
+        Calling this again for a completed upload returns the same document.
+
+        Args:
+            upload_id: Identifier returned by `initiate`.
+            parts: The parts the client sent, as returned by `upload_part`.
+                When given, the received parts must match them exactly, so
+                a part lost or replaced behind the client's back is caught.
+                Defaults to every received part.
+
+        Returns:
+            The created `Document` entity.
+
+        Raises:
+            MultipartUploadNotFoundError: If the upload doesn't exist or has expired.
+            MultipartUploadError: If no parts were received, the parts
+                don't match `parts`, or the upload is being completed by
+                another call.
+            DocumentQuotaExceededError: If the file would exceed the project's quota.
+        """
+        upload = await self.get_upload(upload_id)
+        if upload.status == COMPLETED:
+            async with self.session_maker() as session:
+                return await DocumentRepositoryImpl(session).get_by_id(upload.document_id)
+
+        received = await self.list_parts(upload_id)
+        if not received:
+            raise MultipartUploadError(f"Upload {upload_id} has no parts")
+        if parts is not None:
+            expected = sorted((p.part_number, p.checksum.lower()) for p in parts)
+            if expected != [(p.part_number, p.checksum) for p in received]:
+                raise MultipartUploadError(f"Parts of upload {upload_id} don't match the parts listed")
+        total_size = sum(part.size for part in received)
+
+        sessions = UploadSessionModel.__table__
+        async with self.session_maker() as session:
+            claimed = await session.execute(
+                update(sessions)
+                .where(sessions.c.id == upload_id, sessions.c.status == OPEN)
+                .values(status=COMPLETING, expires_at=_utcnow() + self.ttl)
+            )
+            await session.commit()
+        if claimed.rowcount != 1:
+            raise MultipartUploadError(f"Upload {upload_id} is already being completed")
+
+        file_extension = os.path.splitext(upload.original_filename)[1]
+        unique_filename = f"{uuid.uuid4()}{file_extension}"
+        file_path = os.path.join(self.upload_dir, unique_filename)
+        try:
+            if self.project_quota_bytes is not None:
+                async with self.session_maker() as session:
+                    stats = await DocumentRepositoryImpl(session).get_project_stats(upload.project_id)
+                if stats.total_bytes + total_size > self.project_quota_bytes:
+                    raise DocumentQuotaExceededError(
+                        f"Project {upload.project_id} storage quota of {self.project_quota_bytes} bytes exceeded"
+                    )
+            await asyncio.to_thread(self._assemble, upload_id, received, file_path)
+            async with self.session_maker() as session:
+                try:
+                    document = await DocumentRepositoryImpl(session).create(Document(
+                        original_filename=upload.original_filename,
+                        generated_filename=unique_filename,
+                        file_path=file_path,
+                        file_size=total_size,
+                        content_type=upload.content_type,
+                        project_id=upload.project_id,
+                        uploaded_by=upload.uploaded_by,
+                    ), quota_bytes=self.project_quota_bytes)
+                except ProjectQuotaExceededError as e:
+                    raise DocumentQuotaExceededError(
+                        f"Project {upload.project_id} storage quota of {self.project_quota_bytes} bytes exceeded"
+                    ) from e
+        except BaseException:
+            await asyncio.to_thread(_remove, file_path)
+            async with self.session_maker() as session:
+                await session.execute(update(sessions).where(sessions.c.id == upload_id).values(status=OPEN))
+                await session.commit()
+            raise
+
+        async with self.session_maker() as session:
+            await session.execute(delete(UploadPartModel.__table__).where(
+                UploadPartModel.__table__.c.session_id == upload_id
+            ))
+            await session.execute(
+                update(sessions).where(sessions.c.id == upload_id).values(status=COMPLETED, document_id=document.id)
+            )
+            await session.commit()
+        await asyncio.to_thread(shutil.rmtree, os.path.join(self.staging_dir, upload_id), True)
+        return document
+
+    def _assemble(self, upload_id: str, parts: list[UploadedPart], file_path: str) -> None:
+        """Concatenate staged parts into `file_path`, verifying each on the way."""
+        partial = file_path + ".part"
+        try:
+            with open(partial, "wb") as out:
+                for part in parts:
+                    digest = hashlib.sha256()
+                    with open(self._part_path(upload_id, part.part_number), "rb") as f:
+                        while chunk := f.read(self.chunk_size):
+                            digest.update(chunk)
+                            out.write(chunk)
+                    if digest.hexdigest() != part.checksum:
+                        raise MultipartChecksumMismatchError(
+                            f"Staged part {part.part_number} of upload {upload_id} is corrupt; upload it again"
+                        )
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(partial, file_path)
+        except BaseException:
+            _remove(partial)
+            raise
+
+    async def abort(self, upload_id: str) -> None:
+        """Cancel an upload and delete its parts.
+
+        Raises:
+            MultipartUploadNotFoundError: If the upload doesn't exist or has expired.
+            MultipartUploadError: If the upload is being or has been completed.
+        """
+        sessions = UploadSessionModel.__table__
+        async with self.session_maker() as session:
+            await session.execute(delete(UploadPartModel.__table__).where(
+                UploadPartModel.__table__.c.session_id == upload_id
+            ))
+            deleted = await session.execute(
+                delete(sessions).where(sessions.c.id == upload_id, sessions.c.status == OPEN)
+            )
+            if deleted.rowcount != 1:
+                await session.rollback()
+                upload = await self.get_upload(upload_id)
+                raise MultipartUploadError(f"Upload {upload_id} is {upload.status}")
+            await session.commit()
+        await asyncio.to_thread(shutil.rmtree, os.path.join(self.staging_dir, upload_id), True)
+
+    async def collect_expired(self) -> int:
+        """Delete expired uploads and their staged parts.
+
+        Completed uploads are kept until they expire too, so a retried
+        `complete` still finds its document.
+
+        Returns:
+            Number of uploads deleted.
+        """
+        sessions = UploadSessionModel.__table__
+        parts = UploadPartModel.__table__
+        async with self.session_maker() as session:
+            expired = select(sessions.c.id).where(sessions.c.expires_at <= _utcnow())
+            upload_ids = list(await session.scalars(expired))
+            if upload_ids:
+                await session.execute(delete(parts).where(parts.c.session_id.in_(upload_ids)))
+                await session.execute(delete(sessions).where(sessions.c.id.in_(upload_ids)))
+                await session.commit()
+        for upload_id in upload_ids:
+            await asyncio.to_thread(shutil.rmtree, os.path.join(self.staging_dir, upload_id), True)
+        return len(upload_ids)
+
+    async def run(self, stop: asyncio.Event | None = None, interval: float = 300.0) -> None:
+        """Call `collect_expired` every `interval` seconds until `stop` is set."""
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.collect_expired()
+            except Exception:
+                logger.exception("Collecting expired uploads failed; retrying")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.domain.entities.event import DomainEvent
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    OutboxEventModel,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class EventSink(ABC):
+    """Destination that outbox events are delivered to."""
+
+    @abstractmethod
+    async def publish(self, events: list[DomainEvent]) -> None:
+        """Deliver a batch of events, in order.
+
+        Raising marks the whole batch as undelivered; it is retried on the
+        next dispatch, so sinks must tolerate duplicates.
+        """
+        pass
+
+
+class QueueSink(EventSink):
+    """Delivers events to an in-process `asyncio.Queue`."""
+    def __init__(self, queue: asyncio.Queue | None = None):
+        """Initialize the sink.
+
+        Args:
+            queue: Queue to put events on. Defaults to a new unbounded queue.
+        """
+        self.queue = queue if queue is not None else asyncio.Queue()
+
+    async def publish(self, events: list[DomainEvent]) -> None:
+        for event in events:
+            await self.queue.put(event)
+
+
+class FileSink(EventSink):
+    """Appends events as JSON lines to a local file."""
+    def __init__(self, path: str):
+        """Initialize the sink.
+
+        Args:
+            path: File to append to; created if missing.
+        """
+        self.path = path
+
+    async def publish(self, events: list[DomainEvent]) -> None:
+        lines = "".join(event.model_dump_json() + "\n" for event in events)
+        await asyncio.to_thread(self._append, lines)
+
+    def _append(self, lines: str) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(lines)
+
+
+class UnixSocketSink(EventSink):
+    """Streams events as JSON lines to a listener on a Unix domain socket."""
+    def __init__(self, path: str):
+        """Initialize the sink.
+
+        Args:
+            path: Filesystem path of the listening socket.
+        """
+        self.path = path
+        self._writer: asyncio.StreamWriter | None = None
+
+    async def publish(self, events: list[DomainEvent]) -> None:
+        if self._writer is None or self._writer.is_closing():
+            _, self._writer = await asyncio.open_unix_connection(self.path)
+        try:
+            self._writer.write(b"".join(event.model_dump_json().encode() + b"\n" for event in events))
+            await self._writer.drain()
+        except OSError:
+            self._writer = None
+            raise
+
+    async def close(self) -> None:
+        """Close the connection to the listener, if open."""
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+
+class OutboxDispatcher:
+    """Drains the outbox table in batches and delivers events to sinks.
+
+    Delivery is at-least-once: a batch is marked published only after every
+    sink accepted it. On PostgreSQL, rows are claimed with
+    `FOR UPDATE SKIP LOCKED` so several dispatchers can run side by side.
+    """
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        sinks: list[EventSink],
+        batch_size: int = 100,
+        poll_interval: float = 1.0,
+    ):
+        """Initialize the dispatcher.
+
+        Args:
+            session_maker: Factory for sessions on the primary database.
+            sinks: Destinations every event is delivered to.
+            batch_size: Maximum number of events claimed per transaction.
+            poll_interval: Seconds to wait when the outbox is empty.
+        """
+        self.session_maker = session_maker
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+
+    async def dispatch_once(self) -> int:
+        """Deliver one batch of pending events.
+
+        Returns:
+            Number of events delivered; 0 if the outbox was empty.
+        """
+        table = OutboxEventModel.__table__
+        claim = (
+            select(table)
+            .where(table.c.published_at.is_(None))
+            .order_by(table.c.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_maker() as session:
+            rows = (await session.execute(claim)).all()
+            if not rows:
+                return 0
+            events = [DomainEvent.model_validate(row._mapping) for row in rows]
+            for sink in self.sinks:
+                await sink.publish(events)
+            await session.execute(
+                update(table)
+                .where(table.c.id.in_([row.id for row in rows]))
+                .values(published_at=_utcnow())
+            )
+            await session.commit()
+        return len(rows)
+
+    async def drain(self) -> int:
+        """Deliver pending events until the outbox is empty.
+
+        Returns:
+            Total number of events delivered.
+        """
+        total = 0
+        while delivered := await self.dispatch_once():
+            total += delivered
+        return total
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Keep draining the outbox until `stop` is set.
+
+        Errors are logged and the batch is retried after `poll_interval`.
+        """
+        stop = stop or asyncio.Event()
+        while not stop.is_set():
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Outbox dispatch failed; retrying")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def purge_published(self, older_than: timedelta = timedelta(days=7)) -> int:
+        """Delete events that were published before `older_than` ago.
+
+        Returns:
+            Number of events deleted.
+        """
+        table = OutboxEventModel.__table__
+        async with self.session_maker() as session:
+            result = await session.execute(
+                delete(table).where(table.c.published_at < _utcnow() - older_than)
+            )
+            await session.commit()
+        return result.rowcount
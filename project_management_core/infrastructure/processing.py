@@ -0,0 +1,436 @@
+import asyncio
+import hashlib
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    DocumentJobModel,
+    DocumentModel,
+)
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+# Leading bytes of common formats, checked in order.
+_SIGNATURES: list[tuple[bytes, str]] = [
+    (b"%PDF-", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"PK\x03\x04", "application/zip"),
+    (b"\x1f\x8b", "application/gzip"),
+    (b"BZh", "application/x-bzip2"),
+    (b"\xfd7zXZ\x00", "application/x-xz"),
+    (b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1", "application/x-ole-storage"),
+    (b"{\\rtf", "application/rtf"),
+    (b"ID3", "audio/mpeg"),
+    (b"OggS", "audio/ogg"),
+    (b"\x1aE\xdf\xa3", "video/webm"),
+]
+
+# Declared types that are stored in a sniffed container format.
+_CONTAINERS = {
+    "application/zip": ("application/vnd.openxmlformats-officedocument.", "application/vnd.oasis.opendocument.",
+                        "application/epub+zip", "application/java-archive"),
+    "application/x-ole-storage": ("application/msword", "application/vnd.ms-"),
+}
+
+_TEXT_TYPES = ("text/", "application/json", "application/xml", "application/javascript", "application/x-yaml")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class DocumentProcessor(ABC):
+    """One step of post-upload processing.
+
+    Processors run in the worker's executor, possibly in another process,
+    so they must be picklable and must not touch the database.
+    """
+    name: str = ""
+
+    @abstractmethod
+    def process(self, path: str, document: dict[str, Any]) -> dict[str, Any]:
+        """Inspect a stored file.
+
+        Args:
+            path: Path of the uploaded file.
+            document: Stored document fields, including the
+                `file_metadata` produced by earlier processors.
+
+        Returns:
+            Entries to merge into the document's `file_metadata`.
+        """
+        pass
+
+
+class ChecksumProcessor(DocumentProcessor):
+    """Records a hex digest of the file contents."""
+    name = "checksum"
+
+    def __init__(self, algorithm: str = "sha256", chunk_size: int = 1024 * 1024):
+        """Initialize the processor.
+
+        Args:
+            algorithm: Any `hashlib` algorithm; also the metadata key.
+            chunk_size: Bytes read at a time.
+        """
+        self.algorithm = algorithm
+        self.chunk_size = chunk_size
+
+    def process(self, path: str, document: dict[str, Any]) -> dict[str, Any]:
+        digest = hashlib.new(self.algorithm)
+        with open(path, "rb") as f:
+            while chunk := f.read(self.chunk_size):
+                digest.update(chunk)
+        return {self.algorithm: digest.hexdigest()}
+
+
+class MimeSniffProcessor(DocumentProcessor):
+    """Checks the declared `content_type` against the file's leading bytes.
+
+    Records `sniffed_content_type` (None if the format isn't recognized)
+    and `content_type_verified`, which is False only when the bytes
+    clearly belong to a different format than the one declared.
+    """
+    name = "mime_sniff"
+
+    def process(self, path: str, document: dict[str, Any]) -> dict[str, Any]:
+        with open(path, "rb") as f:
+            head = f.read(512)
+        sniffed = _sniff(head)
+        declared = document["content_type"].split(";", 1)[0].strip().lower()
+        if sniffed is None:
+            verified = True
+        elif sniffed == "text/plain":
+            verified = declared.startswith(_TEXT_TYPES) or declared == "application/octet-stream"
+        else:
+            verified = declared in (sniffed, "application/octet-stream") or declared.startswith(
+                _CONTAINERS.get(sniffed, ())
+            )
+        return {"sniffed_content_type": sniffed, "content_type_verified": verified}
+
+
+def _sniff(head: bytes) -> str | None:
+    for signature, content_type in _SIGNATURES:
+        if head.startswith(signature):
+            return content_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    if not head or b"\0" in head:
+        return None
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is fine.
+        if e.start < len(head) - 3:
+            return None
+    return "text/plain"
+
+
+class TextExtractionProcessor(DocumentProcessor):
+    """Stores the leading text of text-like documents for search.
+
+    Only formats readable without extra dependencies are handled: plain
+    text, CSV, JSON, XML, and so on, decoded as UTF-8. Other documents get
+    no `text` entry.
+    """
+    name = "text_extraction"
+
+    def __init__(self, max_chars: int = 100_000):
+        """Initialize the processor.
+
+        Args:
+            max_chars: Maximum number of characters stored per document.
+        """
+        self.max_chars = max_chars
+
+    def process(self, path: str, document: dict[str, Any]) -> dict[str, Any]:
+        content_type = document["file_metadata"].get("sniffed_content_type") or document["content_type"]
+        if not content_type.startswith(_TEXT_TYPES):
+            return {}
+        with open(path, encoding="utf-8", errors="replace") as f:
+            text = f.read(self.max_chars + 1)
+        return {"text": text[:self.max_chars], "text_truncated": len(text) > self.max_chars}
+
+
+def default_processors() -> list[DocumentProcessor]:
+    """Checksum, content sniffing and text extraction, in that order."""
+    return [ChecksumProcessor(), MimeSniffProcessor(), TextExtractionProcessor()]
+
+
+def _run_processors(processors: list[DocumentProcessor], document: dict[str, Any]) -> dict[str, Any]:
+    """Run `processors` over one file; executed in the worker's executor."""
+    metadata = dict(document["file_metadata"])
+    for processor in processors:
+        metadata.update(processor.process(document["file_path"], {**document, "file_metadata": metadata}))
+    return metadata
+
+
+class DocumentProcessingWorker:
+    """Runs queued post-upload processing jobs with bounded concurrency.
+
+    `DocumentRepositoryImpl.create` queues one job per document in the
+    upload's transaction. The worker claims due jobs in priority order,
+    runs every processor over the file in `executor` (the default thread
+    pool, or e.g. a `ProcessPoolExecutor` for CPU-heavy processors) and
+    merges the results into `documents.file_metadata`. At most
+    `concurrency` jobs run at once.
+
+    A failed job is retried with exponential backoff until it has been
+    attempted `max_attempts` times, then marked "failed". A claimed job
+    that isn't finished within `lease` seconds, e.g. because its worker
+    died, is claimed again; if that was its last attempt, it is marked
+    "failed" instead. On PostgreSQL, jobs are claimed with
+    `FOR UPDATE SKIP LOCKED` so several workers can run side by side.
+
+    Usage:
+        worker = DocumentProcessingWorker(get_session_maker())
+        await worker.run(stop_event)
+    """
+    def __init__(
+        self,
+        session_maker: async_sessionmaker,
+        processors: list[DocumentProcessor] | None = None,
+        concurrency: int = 4,
+        executor: Executor | None = None,
+        max_attempts: int = 5,
+        retry_delay: float = 5.0,
+        lease: float = 300.0,
+        poll_interval: float = 1.0,
+    ):
+        """Initialize the worker.
+
+        Args:
+            session_maker: Factory for sessions on the primary database.
+            processors: Steps run over each file, in order. Defaults to
+                `default_processors()`.
+            concurrency: Maximum number of jobs processed at once.
+            executor: Where processors run. Defaults to the event loop's
+                default thread pool.
+            max_attempts: Attempts before a job is marked "failed".
+            retry_delay: Seconds before the first retry; doubled after
+                each further failure.
+            lease: Seconds a claimed job may run before it is claimed again.
+            poll_interval: Seconds to wait when no job is due.
+        """
+        self.session_maker = session_maker
+        self.processors = processors if processors is not None else default_processors()
+        self.concurrency = concurrency
+        self.executor = executor
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease = lease
+        self.poll_interval = poll_interval
+
+    async def _claim(self, limit: int) -> list[tuple[int, int]]:
+        """Mark up to `limit` due jobs as running; returns (job ID, attempts) pairs.
+
+        Expired leases on a job's last attempt are marked failed rather
+        than claimed, so a file that kills its worker isn't retried forever.
+        """
+        table = DocumentJobModel.__table__
+        now = _utcnow()
+        exhausted = (
+            update(table)
+            .where(
+                table.c.status == RUNNING,
+                table.c.run_after <= now,
+                table.c.attempts >= self.max_attempts,
+            )
+            .values(status=FAILED, last_error="Lease expired on the last attempt", finished_at=now)
+        )
+        due = (
+            select(table.c.id, table.c.attempts)
+            .where(
+                table.c.status.in_((PENDING, RUNNING)),
+                table.c.run_after <= now,
+                table.c.attempts < self.max_attempts,
+            )
+            .order_by(table.c.priority.desc(), table.c.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with self.session_maker() as session:
+            expired = (await session.execute(exhausted)).rowcount
+            if expired:
+                logger.warning("Marked %s job(s) failed whose last attempt's lease expired", expired)
+            jobs = [(row.id, row.attempts + 1) for row in await session.execute(due)]
+            if jobs:
+                await session.execute(
+                    update(table)
+                    .where(table.c.id.in_([job_id for job_id, _ in jobs]))
+                    .values(
+                        status=RUNNING,
+                        attempts=table.c.attempts + 1,
+                        run_after=now + timedelta(seconds=self.lease),
+                    )
+                )
+            await session.commit()
+        return jobs
+
+    async def _process(self, job_id: int, attempts: int) -> None:
+        """Run one claimed job and record its outcome.
+
+        The outcome is only written while the job is still on the attempt
+        this worker claimed. If the lease ran out and another worker took
+        the job over, this worker's result is dropped, so it can't
+        overwrite the newer attempt.
+        """
+        jobs = DocumentJobModel.__table__
+        documents = DocumentModel.__table__
+        claimed = (jobs.c.id == job_id) & (jobs.c.attempts == attempts)
+        async with self.session_maker() as session:
+            row = (await session.execute(
+                select(documents)
+                .join(jobs, jobs.c.document_id == documents.c.id)
+                .where(jobs.c.id == job_id)
+            )).first()
+        if row is None:
+            async with self.session_maker() as session:
+                await session.execute(delete(jobs).where(jobs.c.id == job_id))
+                await session.commit()
+            return
+        document = {**row._mapping, "file_metadata": row.file_metadata or {}}
+
+        try:
+            loop = asyncio.get_running_loop()
+            metadata = await loop.run_in_executor(self.executor, _run_processors, self.processors, document)
+        except Exception as e:
+            failed = attempts >= self.max_attempts
+            if failed:
+                logger.exception("Processing of document %s failed for good", document["id"])
+            else:
+                logger.warning("Processing of document %s failed (attempt %s): %s", document["id"], attempts, e)
+            async with self.session_maker() as session:
+                recorded = await session.execute(
+                    update(jobs)
+                    .where(claimed)
+                    .values(
+                        status=FAILED if failed else PENDING,
+                        run_after=_utcnow() + timedelta(seconds=self.retry_delay * 2 ** (attempts - 1)),
+                        last_error=f"{type(e).__name__}: {e}"[:2000],
+                        finished_at=_utcnow() if failed else None,
+                    )
+                )
+                await session.commit()
+            if recorded.rowcount == 0:
+                logger.info("Job %s was taken over after attempt %s; dropping its failure", job_id, attempts)
+            return
+
+        async with self.session_maker() as session:
+            recorded = await session.execute(
+                update(jobs)
+                .where(claimed)
+                .values(status=DONE, last_error=None, finished_at=_utcnow())
+            )
+            if recorded.rowcount == 0:
+                await session.rollback()
+                logger.info("Job %s was taken over after attempt %s; dropping its result", job_id, attempts)
+                return
+            await session.execute(
+                update(documents).where(documents.c.id == document["id"]).values(file_metadata=metadata)
+            )
+            await session.commit()
+
+    async def process_once(self) -> int:
+        """Claim and run one batch of up to `concurrency` due jobs.
+
+        Returns:
+            Number of jobs run, successfully or not; 0 if none were due.
+        """
+        jobs = await self._claim(self.concurrency)
+        await asyncio.gather(*(self._process(job_id, attempts) for job_id, attempts in jobs))
+        return len(jobs)
+
+    async def drain(self) -> int:
+        """Run jobs until none are due.
+
+        Returns:
+            Total number of jobs run.
+        """
+        total = 0
+        while processed := await self.process_once():
+            total += processed
+        return total
+
+    async def run(self, stop: asyncio.Event | None = None) -> None:
+        """Keep running jobs until `stop` is set.
+
+        A new job is claimed as soon as a slot frees up, so one slow file
+        doesn't hold up the others. Errors are logged and claiming resumes
+        after `poll_interval`; jobs in flight are finished before returning.
+        """
+        stop = stop or asyncio.Event()
+        running: set[asyncio.Task] = set()
+        while not stop.is_set():
+            free = self.concurrency - len(running)
+            if not free:
+                await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                continue
+            try:
+                jobs = await self._claim(free)
+            except Exception:
+                logger.exception("Claiming processing jobs failed; retrying")
+                jobs = []
+            for job_id, attempts in jobs:
+                task = asyncio.create_task(self._run_job(job_id, attempts))
+                running.add(task)
+                task.add_done_callback(running.discard)
+            if not jobs:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        await asyncio.gather(*running)
+
+    async def _run_job(self, job_id: int, attempts: int) -> None:
+        try:
+            await self._process(job_id, attempts)
+        except Exception:
+            logger.exception("Processing job %s crashed; it is retried after its lease", job_id)
+
+    async def purge_finished(self, older_than: timedelta = timedelta(days=7)) -> int:
+        """Delete jobs that finished successfully before `older_than` ago.
+
+        Failed jobs are kept for inspection; see `retry_failed`.
+
+        Returns:
+            Number of jobs deleted.
+        """
+        table = DocumentJobModel.__table__
+        async with self.session_maker() as session:
+            result = await session.execute(
+                delete(table).where(table.c.status == DONE, table.c.finished_at < _utcnow() - older_than)
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def retry_failed(self) -> int:
+        """Queue every failed job again with a fresh set of attempts.
+
+        Returns:
+            Number of jobs queued.
+        """
+        table = DocumentJobModel.__table__
+        async with self.session_maker() as session:
+            result = await session.execute(
+                update(table)
+                .where(table.c.status == FAILED)
+                .values(status=PENDING, attempts=0, run_after=_utcnow(), finished_at=None)
+            )
+            await session.commit()
+        return result.rowcount
@@ -1,16 +1,90 @@
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
-from project_management_core.infrastructure.config import DB_URL
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+
+from project_management_core.infrastructure import config
 from project_management_core.infrastructure.repositories.db.models.db_models import Base
+from project_management_core.infrastructure.repositories.db.routing import (
+    ReplicaSet,
+    RoutingSession,
+)
+from project_management_core.infrastructure.repositories.db.sqlite import (
+    create_sqlite_engines,
+    is_sqlite_url,
+)
+
+# Created on first use so that importing this module never needs DB_URL.
+# `engine`, `replica_set` and `async_session_maker` stay importable as
+# module attributes through `__getattr__` below.
+_engine: AsyncEngine | None = None
+_replica_set: ReplicaSet | None = None
+_session_maker: async_sessionmaker | None = None
+
+
+def get_engine() -> AsyncEngine:
+    """Return the primary engine, creating it on first call.
+
+    A SQLite `DB_URL` selects the embedded profile (see
+    `create_sqlite_engines`): the primary engine is the single writer
+    connection and `DB_SQLITE_READERS` reader connections take the place
+    of read replicas.
+
+    Raises:
+        RuntimeError: If `DB_URL` is not configured.
+    """
+    global _engine, _replica_set
+    if _engine is None:
+        if not config.DB_URL:
+            raise RuntimeError("DB_URL is not set")
+        if is_sqlite_url(config.DB_URL):
+            _engine, _replica_set = create_sqlite_engines(
+                config.DB_URL, readers=config.DB_SQLITE_READERS, echo=True
+            )
+        else:
+            _engine = create_async_engine(config.DB_URL, echo=True)
+    return _engine
+
+
+def get_replica_set() -> ReplicaSet | None:
+    """Return the read-replica set, or None if no replicas are configured."""
+    global _replica_set
+    if config.DB_URL and is_sqlite_url(config.DB_URL):
+        get_engine()
+        return _replica_set
+    if _replica_set is None and config.DB_REPLICA_URLS:
+        _replica_set = ReplicaSet(
+            [create_async_engine(url) for url in config.DB_REPLICA_URLS],
+            strategy=config.DB_REPLICA_STRATEGY,
+        )
+    return _replica_set
+
+
+def get_session_maker() -> async_sessionmaker:
+    """Return the session factory, creating engines on first call."""
+    global _session_maker
+    if _session_maker is None:
+        _session_maker = async_sessionmaker(
+            get_engine(),
+            expire_on_commit=False,
+            sync_session_class=RoutingSession,
+            replicas=get_replica_set(),
+        )
+    return _session_maker
+
 
-engine = create_async_engine(DB_URL, echo=True)
+def __getattr__(name: str):
+    if name == "engine":
+        return get_engine()
+    if name == "replica_set":
+        return get_replica_set()
+    if name == "async_session_maker":
+        return get_session_maker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
 async def init_models():
     """Create tables if they don’t exist."""
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 async def get_async_session():
-    async with async_session_maker() as session:
-        yield session
\ No newline at end of file
+    async with get_session_maker()() as session:
+        yield session
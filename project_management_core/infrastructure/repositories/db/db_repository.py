@@ -1,86 +1,276 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator, Callable, Iterable
+from typing import Any
+
+from sqlalchemy import Row, Table, bindparam, delete, event, exists, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Executable
+
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    ChangeTombstoneModel,
+    OutboxEventModel,
+)
+
+# `Session.info` keys: the invalidation bus sessions publish to (set by
+# `InvalidationBus.install`), and the cache keys written by the current
+# transaction, published once it commits.
+INVALIDATION_BUS_KEY = "invalidation_bus"
+PENDING_INVALIDATIONS_KEY = "pending_invalidations"
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_invalidations(session: Session) -> None:
+    keys = session.info.pop(PENDING_INVALIDATIONS_KEY, None)
+    bus = session.info.get(INVALIDATION_BUS_KEY)
+    if keys and bus is not None:
+        bus.publish(keys)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_invalidations(session: Session) -> None:
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
 
 
 class AsyncRepository:
-    """Generic async repository helper for basic CRUD operations using SQLAlchemy."""
-    def __init__(self, model, session: AsyncSession):
-        """Initialize the helper with a model and session.
+    """Generic async repository base for SQLAlchemy models.
+
+    Every operation is a single Core statement returning plain rows, so no
+    ORM objects are loaded or tracked. Statements that only differ by their
+    parameters are built once per model and cached. Nothing here commits;
+    transaction boundaries belong to the concrete repository.
+
+    Subclasses set `model` to their declarative model class.
+    """
+    model = None
+    _statements: dict[tuple[type, str], Executable] = {}
+
+    def __init__(self, session: AsyncSession, model=None):
+        """Initialize the helper with a session and, optionally, a model.
 
         Args:
-            model: SQLAlchemy declarative model class.
-            session: Async SQLAlchemy session instance.
+            session: Async SQLAlchemy session.
+            model: SQLAlchemy declarative model class. Defaults to the
+                class-level `model`.
+
+        Raises:
+            ValueError: If no model is given either way.
         """
-        self.model = model
         self.session = session
-    
-    async def create(self,session,  obj_in: dict):
-        """Create a new record for the model.
+        if model is not None:
+            self.model = model
+        if self.model is None:
+            raise ValueError(f"{type(self).__name__} needs a model")
+
+    @property
+    def table(self) -> Table:
+        """The model's underlying `Table`."""
+        return self.model.__table__
+
+    @property
+    def dialect_name(self) -> str:
+        """Name of the database dialect the session is bound to."""
+        return self.session.bind.dialect.name
+
+    def _statement(self, key: str, build: Callable[[Table], Executable]) -> Executable:
+        """Return the cached statement `key` for this model, building it on first use."""
+        cache_key = (self.model, key)
+        stmt = self._statements.get(cache_key)
+        if stmt is None:
+            stmt = self._statements[cache_key] = build(self.table)
+        return stmt
+
+    def _record_event(self, event_type: str, aggregate_id: int, payload: dict[str, Any]) -> None:
+        """Queue a domain event for the outbox in the current transaction.
+
+        The row is flushed with the caller's next commit, so the event is
+        stored if and only if the change it describes is.
+
+        Args:
+            event_type: Dotted event name, e.g. "project.created"; the part
+                before the first dot is the aggregate type.
+            aggregate_id: Identifier of the changed user, project or document.
+            payload: JSON-serializable event details.
+        """
+        self.session.add(OutboxEventModel(
+            event_type=event_type,
+            aggregate_type=event_type.split(".", 1)[0],
+            aggregate_id=aggregate_id,
+            payload=payload,
+        ))
+
+    @property
+    def _invalidating(self) -> bool:
+        """Whether the session publishes to an invalidation bus.
+
+        Lets callers skip queries that only serve to find the keys to
+        invalidate.
+        """
+        return INVALIDATION_BUS_KEY in self.session.info
+
+    def _invalidate(self, *keys: str) -> None:
+        """Mark cache keys as stale once the current transaction commits.
+
+        Keys are published to the session's invalidation bus after commit
+        and dropped on rollback; without a bus this does nothing.
+        """
+        if self._invalidating:
+            self.session.info.setdefault(PENDING_INVALIDATIONS_KEY, set()).update(keys)
+
+    def _record_tombstone(
+        self, entity_type: str, entity_id: int, project_id: int, user_id: int | None = None
+    ) -> None:
+        """Queue a deletion record for the change feed in the current transaction.
+
+        Args:
+            entity_type: "project", "project_member" or "document".
+            entity_id: Identifier of the deleted row.
+            project_id: Project the row belonged to.
+            user_id: User who must see the deletion even without access to
+                the project any more, if any.
+        """
+        self.session.add(ChangeTombstoneModel(
+            entity_type=entity_type, entity_id=entity_id, project_id=project_id, user_id=user_id,
+        ))
+
+    def _insert(self, target=None):
+        """Return a dialect-specific INSERT supporting `ON CONFLICT` for `target` (default: the model)."""
+        insert = pg_insert if self.dialect_name == "postgresql" else sqlite_insert
+        return insert(target if target is not None else self.model)
+
+    async def get_row(self, obj_id: int) -> Row | None:
+        """Fetch a single row by ID.
 
         Args:
-            session: Async session to use.
-            obj_in: Mapping of fields for the new object.
+            obj_id: Identifier of the row.
 
         Returns:
-            The created ORM model instance.
+            The row if found, otherwise None.
         """
-        obj = self.model(**obj_in)
-        session.add(obj)
-        await session.commit()
-        await session.refresh(obj)
-        return obj
-        
-    async def get(self, session: AsyncSession , obj_id: int):
-        """Retrieve an object by ID.
+        stmt = self._statement("get_row", lambda t: select(t).where(t.c.id == bindparam("obj_id")))
+        return (await self.session.execute(stmt, {"obj_id": obj_id})).one_or_none()
+
+    async def get_many(self, ids: Iterable[int]) -> list[Row]:
+        """Fetch the rows matching any of the given IDs in one query.
 
         Args:
-            session: Async session to use.
-            obj_id: Identifier of the object.
+            ids: Identifiers to fetch. Missing IDs are skipped.
 
         Returns:
-            ORM instance if found, otherwise None.
+            The rows found, in no particular order.
         """
-        result = await session.execute(select(self.model).where(self.model.id == obj_id))
-        obj = result.scalar_one_or_none()
-        return obj
+        ids = list(ids)
+        if not ids:
+            return []
+        stmt = self._statement(
+            "get_many", lambda t: select(t).where(t.c.id.in_(bindparam("ids", expanding=True)))
+        )
+        return list((await self.session.execute(stmt, {"ids": ids})).all())
+
+    async def exists(self, *criteria) -> bool:
+        """Return whether any row matches all `criteria`."""
+        return bool(await self.session.scalar(select(exists().where(*criteria))))
 
-    async def update(self, session: AsyncSession, obj_in:dict, obj_id:int ):
-        """Update fields on an existing object.
+    async def count(self, *criteria) -> int:
+        """Return the number of rows matching all `criteria`."""
+        stmt = select(func.count()).select_from(self.table).where(*criteria)
+        return await self.session.scalar(stmt)
+
+    async def insert_row(self, values: dict[str, Any]) -> Row:
+        """Insert a row and return it as stored.
 
         Args:
-            session: Async session to use.
-            obj_in: Mapping of fields to update.
-            obj_id: Identifier of the object to update.
+            values: Mapping of column names to values.
 
         Returns:
-            The updated ORM model instance, or None if not found.
+            The inserted row, including generated columns.
         """
-        result = await session.execute(
-            select(self.model).where(self.model.id == obj_id)
-            )
-        obj = result.scalar_one_or_none()
+        stmt = self.table.insert().values(**values).returning(*self.table.c)
+        return (await self.session.execute(stmt)).one()
 
-        if not obj:
-            return None
-        
-        for key, value in obj_in.items():
-            setattr(obj, key, value)
-        
-        await session.commit()
-        await session.refresh(obj)
+    async def update_row(self, obj_id: int, values: dict[str, Any]) -> Row | None:
+        """Update a row by ID and return it as stored.
 
-        return obj
+        Args:
+            obj_id: Identifier of the row to update.
+            values: Mapping of column names to new values.
 
-    async def delete(self, session: AsyncSession, obj_id:int):
-        """Delete an object by ID.
+        Returns:
+            The updated row, or None if no row has that ID.
+        """
+        stmt = update(self.table).where(self.table.c.id == obj_id).values(**values).returning(*self.table.c)
+        return (await self.session.execute(stmt)).one_or_none()
+
+    async def delete_by_id(self, obj_id: int) -> bool:
+        """Delete a row by ID.
 
         Args:
-            session: Async session to use.
-            obj_id: Identifier of the object to delete.
+            obj_id: Identifier of the row to delete.
+
+        Returns:
+            True if a row was deleted, False if none had that ID.
         """
-        result = await session.execute(
-            select(self.model).where(self.model.id == obj_id)
+        stmt = self._statement("delete_by_id", lambda t: delete(t).where(t.c.id == bindparam("obj_id")))
+        result = await self.session.execute(stmt, {"obj_id": obj_id})
+        return result.rowcount > 0
+
+    async def delete_where(self, *criteria) -> int:
+        """Delete every row matching all `criteria`.
+
+        Returns:
+            Number of rows deleted.
+        """
+        result = await self.session.execute(delete(self.table).where(*criteria))
+        return result.rowcount
+
+    async def bulk_upsert(self, rows: list[dict[str, Any]], index_elements: Iterable[str] = ("id",)) -> int:
+        """Insert rows, updating the existing ones that conflict on `index_elements`.
+
+        All rows must have the same keys. Columns outside `index_elements`
+        are overwritten with the new values; if there are none, conflicting
+        rows are left untouched.
+
+        Args:
+            rows: Column-name mappings to write.
+            index_elements: Columns of the unique constraint to resolve conflicts on.
+
+        Returns:
+            Number of rows sent.
+        """
+        if not rows:
+            return 0
+        index_elements = list(index_elements)
+        stmt = self._insert(self.table)
+        updated = [key for key in rows[0] if key not in index_elements]
+        if updated:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=index_elements, set_={key: stmt.excluded[key] for key in updated}
             )
-        obj = result.scalar_one_or_none()
-        await session.delete(obj)
-        await session.commit()
\ No newline at end of file
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=index_elements)
+        await self.session.execute(stmt, rows)
+        return len(rows)
+
+    async def stream(self, *criteria, batch_size: int = 1000) -> AsyncIterator[Row]:
+        """Iterate over matching rows in ID order using a server-side cursor.
+
+        At most `batch_size` rows are buffered at a time, so memory use does
+        not grow with the size of the table.
+
+        Args:
+            criteria: Optional filter expressions.
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            Matching rows.
+        """
+        stmt = (
+            select(self.table)
+            .where(*criteria)
+            .order_by(self.table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await self.session.stream(stmt)
+        async for row in result:
+            yield row
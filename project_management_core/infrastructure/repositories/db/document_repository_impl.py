@@ -1,18 +1,54 @@
-from sqlalchemy import select
+import operator
+from collections.abc import AsyncIterator
+
+from sqlalchemy import bindparam, case, column, delete, func, select, table, tuple_, union, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.document import (
+    DOCUMENT_SORT_KEYS,
+    Document,
+    DocumentFeedCursor,
+    DocumentFeedPage,
+    DocumentFilter,
+    DocumentPage,
+    DocumentStats,
+)
 from project_management_core.domain.repositories.document_repository import (
     DocumentRepository,
+    ProjectQuotaExceededError,
+)
+from project_management_core.domain.repositories.errors import RepositoryError
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    AsyncRepository,
 )
 from project_management_core.infrastructure.repositories.db.models.db_models import (
+    DocumentJobModel,
     DocumentModel,
+    ProjectDocumentStatsModel,
+    ProjectDocumentTypeStatsModel,
+    ProjectMember,
+    ProjectModel,
 )
+from project_management_core.infrastructure.repositories.db.routing import read_only
+
 
+# FTS5 shadow table created alongside `documents` on SQLite (see db_models).
+documents_fts = table("documents_fts", column("rowid"), column("documents_fts"), column("rank"))
+
+# Trigram indexes can't match terms shorter than a single trigram.
+MIN_TRIGRAM_QUERY_LENGTH = 3
+
+# `DocumentFilter` field -> (column, comparison) applied by `list_documents`.
+_DOCUMENT_FILTERS = {
+    "content_type": ("content_type", operator.eq),
+    "min_size": ("file_size", operator.ge),
+    "max_size": ("file_size", operator.le),
+    "uploaded_by": ("uploaded_by", operator.eq),
+    "uploaded_after": ("uploaded_at", operator.ge),
+    "uploaded_before": ("uploaded_at", operator.lt),
+}
 
-class RepositoryError(Exception):
-    pass
 
 class DocumentRecordNotFoundError(RepositoryError):
     """Document not found in database."""
@@ -24,26 +60,59 @@ class DocumentDataIntegrityError(RepositoryError):
     """Constraints validation"""
 
 
-class DocumentRepositoryImpl(DocumentRepository):
+def to_document(row) -> Document:
+    """Build a `Document` entity from a stored `documents` row; shared by the repositories that return documents."""
+    return Document(
+        id = row.id,
+        original_filename = row.original_filename,
+        generated_filename = row.generated_filename,
+        file_path = row.file_path,
+        file_size = row.file_size,
+        content_type = row.content_type,
+        project_id = row.project_id,
+        uploaded_by = row.uploaded_by,
+        uploaded_at = row.uploaded_at,
+        file_metadata = row.file_metadata or {}
+    )
+
+
+class DocumentRepositoryImpl(AsyncRepository, DocumentRepository):
     """SQLAlchemy-based implementation of the `DocumentRepository` interface."""
+    model = DocumentModel
+
     def __init__(self, session: AsyncSession):
         """Initialize the repository with an async database session.
 
         Args:
             session: Async SQLAlchemy session.
         """
-        self.session = session
+        super().__init__(session)
     
-    async def create(self, document: Document) -> Document:
+    async def create(
+        self,
+        document: Document,
+        processing_priority: int | None = 0,
+        quota_bytes: int | None = None,
+    ) -> Document:
         """Persist a new document and return the stored entity.
 
+        A post-upload processing job for the document is queued in the
+        same transaction (see `infrastructure.processing`). With a quota,
+        the project's byte counter is only raised if it stays within the
+        quota, in the same upsert, so concurrent uploads can't both pass.
+
         Args:
             document: Domain document to persist.
+            processing_priority: Priority of the processing job; higher
+                runs first. None skips processing.
+            quota_bytes: Most bytes the project may hold including this
+                document. None means no quota.
 
         Returns:
             The created `Document` entity with generated fields populated.
 
         Raises:
+            ProjectQuotaExceededError: If the document would exceed `quota_bytes`.
             DocumentDataIntegrityError: On integrity constraint violations.
             DocumentRepositoryError: On general database errors.
         """
@@ -56,29 +125,70 @@ class DocumentRepositoryImpl(DocumentRepository):
             content_type = document.content_type,
             project_id = document.project_id,
             uploaded_by = document.uploaded_by,
-            uploaded_at = document.uploaded_at
+            uploaded_at = document.uploaded_at,
+            file_metadata = document.file_metadata or None
         )
         try:
             self.session.add(orm_document)
+            await self.session.flush()
+            await self._apply_stats_delta(orm_document, count=1, quota_bytes=quota_bytes)
+            if processing_priority is not None:
+                self.session.add(DocumentJobModel(document_id=orm_document.id, priority=processing_priority))
+            self._record_event(
+                "document.uploaded", orm_document.id, to_document(orm_document).model_dump(mode="json")
+            )
             await self.session.commit()
             await self.session.refresh(orm_document)
+        except ProjectQuotaExceededError:
+            await self.session.rollback()
+            raise
         except IntegrityError as e:
+            await self.session.rollback()
             raise DocumentDataIntegrityError(f"Integrity error: {e}")
         except SQLAlchemyError as e:
+            await self.session.rollback()
             raise DocumentRepositoryError(f"Database error: {e}")
 
-        return Document(
-            id = orm_document.id,
-            original_filename = orm_document.original_filename,
-            generated_filename = orm_document.generated_filename,
-            file_path = orm_document.file_path,
-            file_size = orm_document.file_size,
-            content_type = orm_document.content_type,
-            project_id = orm_document.project_id,
-            uploaded_by = orm_document.uploaded_by,
-            uploaded_at = orm_document.uploaded_at
-        )
-    
+        return to_document(orm_document)
+
+    async def insert_many(self, rows: list[dict]) -> list[Document]:
+        """Persist documents whose files are already stored, in one statement.
+
+        For bulk loads such as archive imports. A `document.uploaded` event
+        is recorded for each document, but no processing job is queued and
+        the project counters are left alone: call `rebuild_project_stats`
+        once the load is done.
+
+        Args:
+            rows: Column values of each document.
+
+        Returns:
+            The created `Document` entities, in the order of `rows`.
+
+        Raises:
+            DocumentDataIntegrityError: On integrity constraint violations.
+            DocumentRepositoryError: On general database errors.
+        """
+        if not rows:
+            return []
+        table = self.model.__table__
+        try:
+            inserted = (await self.session.execute(
+                table.insert().returning(*table.c, sort_by_parameter_order=True), rows
+            )).all()
+            documents = [to_document(row) for row in inserted]
+            for document in documents:
+                self._record_event("document.uploaded", document.id, document.model_dump(mode="json"))
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise DocumentDataIntegrityError(f"Integrity error: {e}")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DocumentRepositoryError(f"Database error: {e}")
+        return documents
+
+    @read_only
     async def get_by_id(self, document_id: int) -> Document | None:
         """Fetch a document by ID.
 
@@ -91,21 +201,12 @@ class DocumentRepositoryImpl(DocumentRepository):
         Raises:
             DocumentRecordNotFoundError: If the document does not exist.
         """
-        result = await self.session.get(DocumentModel, document_id)
+        result = await self.get_row(document_id)
         if result is None:
             raise DocumentRecordNotFoundError(f"No document found with ID: {document_id}")
-        return Document(
-            id = result.id,
-            original_filename = result.original_filename,
-            generated_filename = result.generated_filename,
-            file_path = result.file_path,
-            file_size = result.file_size,
-            content_type = result.content_type,
-            project_id = result.project_id,
-            uploaded_by = result.uploaded_by,
-            uploaded_at = result.uploaded_at
-        )
+        return to_document(result)
 
+    @read_only
     async def get_by_project(self, project_id: int) -> list[Document]:
         """Fetch all documents for the given project ID.
 
@@ -118,36 +219,430 @@ class DocumentRepositoryImpl(DocumentRepository):
         Raises:
             DocumentRecordNotFoundError: If no documents are found for the project.
         """
-        query = select(DocumentModel).where(DocumentModel.project_id == project_id)
-        result = await self.session.execute(query)
-        orm_documents = result.scalars().all()
+        stmt = self._statement(
+            "get_by_project", lambda t: select(t).where(t.c.project_id == bindparam("project_id"))
+        )
+        orm_documents = (await self.session.execute(stmt, {"project_id": project_id})).all()
         if not orm_documents:
             raise DocumentRecordNotFoundError(f"No documents founds for project {project_id}")
-        return  [Document(
-            id = doc.id,
-            original_filename = doc.original_filename,
-            generated_filename = doc.generated_filename,
-            file_path = doc.file_path,
-            file_size = doc.file_size,
-            content_type = doc.content_type,
-            project_id = doc.project_id,
-            uploaded_by = doc.uploaded_by,
-            uploaded_at = doc.uploaded_at
-        )
-        for doc in orm_documents
-        ]
+        return [to_document(doc) for doc in orm_documents]
     
+    async def stream_by_project(self, project_id: int, batch_size: int = 1000) -> AsyncIterator[Document]:
+        """Iterate over a project's documents in ID order using a server-side cursor.
+
+        Unlike `get_by_project`, at most `batch_size` rows are held in
+        memory at a time, and a project without documents yields nothing.
+
+        Args:
+            project_id: Project identifier.
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            `Document` entities.
+        """
+        async for row in self.stream(DocumentModel.project_id == project_id, batch_size=batch_size):
+            yield to_document(row)
+
+    @read_only
+    async def list_documents(
+        self,
+        project_id: int,
+        filters: DocumentFilter | None = None,
+        sort: str = "uploaded_at",
+        descending: bool = True,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> DocumentPage:
+        """Fetch one page of a project's documents, filtered and sorted in SQL.
+
+        The total number of matches comes from a `COUNT(*) OVER ()` column
+        of the same query. Date ordering and ranges use
+        `(project_id, uploaded_at)`, or `(project_id, content_type,
+        uploaded_at)` when filtering by type; size ordering and ranges use
+        `(project_id, file_size)`. Ties are broken by ID, so pages are
+        stable. The statement is cached per combination of filters set.
+
+        Args:
+            project_id: Project identifier.
+            filters: Criteria the documents must match; None matches all.
+            sort: "uploaded_at" or "file_size".
+            descending: Newest or largest first. Defaults to True.
+            limit: Maximum number of documents to return.
+            offset: Number of sorted results to skip.
+
+        Returns:
+            A `DocumentPage` with the documents and the total matching.
+
+        Raises:
+            ValueError: If `sort` is not a sortable column.
+            DocumentRepositoryError: On general database errors.
+        """
+        if sort not in DOCUMENT_SORT_KEYS:
+            raise ValueError(f"Cannot sort documents by {sort!r}")
+        params = {
+            name: value
+            for name, value in (filters or DocumentFilter()).model_dump().items()
+            if value is not None
+        }
+        filtered = sorted(params)
+
+        def criteria(t):
+            conditions = [t.c.project_id == bindparam("project_id")]
+            for name in filtered:
+                column, compare = _DOCUMENT_FILTERS[name]
+                conditions.append(compare(t.c[column], bindparam(name, type_=t.c[column].type)))
+            return conditions
+
+        def build(t):
+            order = t.c[sort].desc() if descending else t.c[sort].asc()
+            tiebreak = t.c.id.desc() if descending else t.c.id.asc()
+            return (
+                select(t, func.count().over().label("total"))
+                .where(*criteria(t))
+                .order_by(order, tiebreak)
+                .limit(bindparam("limit"))
+                .offset(bindparam("offset"))
+            )
+
+        key = f"list:{','.join(filtered)}:{sort}:{descending}"
+        params.update(project_id=project_id, limit=limit, offset=offset)
+        try:
+            rows = (await self.session.execute(self._statement(key, build), params)).all()
+            if rows:
+                total = rows[0].total
+            elif offset:
+                # Past the last page there is no row to carry the count.
+                count = self._statement(
+                    f"count:{key}", lambda t: select(func.count()).select_from(t).where(*criteria(t))
+                )
+                total = (await self.session.execute(count, params)).scalar_one()
+            else:
+                total = 0
+        except SQLAlchemyError as e:
+            raise DocumentRepositoryError(f"Database error: {e}")
+        return DocumentPage(documents=[to_document(row) for row in rows], total=total)
+
+    @read_only
+    async def search_by_filename(
+        self,
+        project_id: int,
+        query: str,
+        content_type: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> list[Document]:
+        """Search a project's documents by filename prefix or substring.
+
+        Uses the trigram GIN index on PostgreSQL and the FTS5 trigram table
+        on SQLite. Prefix matches rank ahead of other substring matches;
+        terms shorter than a trigram fall back to a `LIKE` scan restricted
+        to the project's rows of the `(project_id, original_filename)` index.
+
+        Args:
+            project_id: Project identifier.
+            query: Text to look for in `original_filename` (case-insensitive).
+            content_type: Optional MIME type the results must match.
+            limit: Maximum number of documents to return.
+            offset: Number of ranked results to skip.
+
+        Returns:
+            List of matching `Document` entities, most relevant first.
+            Empty if nothing matches.
+
+        Raises:
+            DocumentRepositoryError: On general database errors.
+        """
+        term = query.strip()
+        if not term:
+            return []
+
+        filename = DocumentModel.original_filename
+        prefix_rank = case((filename.istartswith(term, autoescape=True), 0), else_=1)
+        stmt = select(DocumentModel).where(DocumentModel.project_id == project_id)
+        if content_type:
+            stmt = stmt.where(DocumentModel.content_type == content_type)
+
+        dialect = self.dialect_name
+        if dialect == "sqlite" and len(term) >= MIN_TRIGRAM_QUERY_LENGTH:
+            phrase = '"' + term.replace('"', '""') + '"'
+            stmt = (
+                stmt.join(documents_fts, documents_fts.c.rowid == DocumentModel.id)
+                .where(documents_fts.c.documents_fts.op("MATCH")(phrase))
+                .order_by(prefix_rank, documents_fts.c.rank, DocumentModel.id)
+            )
+        elif dialect == "postgresql":
+            stmt = stmt.where(filename.icontains(term, autoescape=True)).order_by(
+                prefix_rank, func.similarity(filename, term).desc(), DocumentModel.id
+            )
+        else:
+            stmt = stmt.where(filename.icontains(term, autoescape=True)).order_by(
+                prefix_rank, filename, DocumentModel.id
+            )
+
+        try:
+            result = await self.session.execute(stmt.limit(limit).offset(offset))
+        except SQLAlchemyError as e:
+            raise DocumentRepositoryError(f"Database error: {e}")
+        return [to_document(doc) for doc in result.scalars().all()]
+
+    @read_only
+    async def get_feed_for_user(
+        self,
+        user_id: int,
+        limit: int = 50,
+        before: DocumentFeedCursor | None = None,
+        uploaded_by_user: bool = False,
+    ) -> DocumentFeedPage:
+        """Fetch the newest documents across every project the user can access.
+
+        A single query joins the documents to the union of owned and joined
+        project IDs and pages with a `(uploaded_at, id)` keyset, so deep
+        pages cost the same as the first. Each project's documents are read
+        newest first from `(project_id, uploaded_at)`; with
+        `uploaded_by_user`, the user's own uploads are read from
+        `(uploaded_by, uploaded_at)` instead.
+
+        Args:
+            user_id: Owner or member user identifier.
+            limit: Maximum number of documents to return.
+            before: `next_cursor` of the previous page; None for the first page.
+            uploaded_by_user: Only include documents uploaded by the user.
+
+        Returns:
+            A `DocumentFeedPage`, newest first. Empty if nothing matches.
+
+        Raises:
+            DocumentRepositoryError: On general database errors.
+        """
+        def build(t):
+            accessible = union(
+                select(ProjectModel.id.label("project_id")).where(ProjectModel.owner_id == bindparam("user_id")),
+                select(ProjectMember.project_id).where(ProjectMember.user_id == bindparam("user_id")),
+            ).subquery()
+            stmt = (
+                select(t)
+                .join(accessible, accessible.c.project_id == t.c.project_id)
+                .order_by(t.c.uploaded_at.desc(), t.c.id.desc())
+                .limit(bindparam("limit"))
+            )
+            if uploaded_by_user:
+                stmt = stmt.where(t.c.uploaded_by == bindparam("user_id"))
+            if before is not None:
+                cursor = tuple_(bindparam("at", type_=t.c.uploaded_at.type), bindparam("id", type_=t.c.id.type))
+                stmt = stmt.where(tuple_(t.c.uploaded_at, t.c.id) < cursor)
+            return stmt
+
+        stmt = self._statement(f"feed:{uploaded_by_user}:{before is not None}", build)
+        params = {"user_id": user_id, "limit": limit + 1}
+        if before is not None:
+            params.update(at=before.uploaded_at, id=before.id)
+        try:
+            rows = (await self.session.execute(stmt, params)).all()
+        except SQLAlchemyError as e:
+            raise DocumentRepositoryError(f"Database error: {e}")
+        documents = [to_document(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit and documents:
+            last = documents[-1]
+            next_cursor = DocumentFeedCursor(uploaded_at=last.uploaded_at, id=last.id)
+        return DocumentFeedPage(documents=documents, next_cursor=next_cursor)
+
     async def delete(self, document_id: int) -> None:
         """Delete a document by ID.
 
+        The row is not read first: `DELETE ... RETURNING` hands back the
+        columns the project counters need.
+
         Args:
             document_id: Identifier of the document to delete.
 
         Raises:
             DocumentRecordNotFoundError: If the document does not exist.
         """
-        result = await self.session.get(DocumentModel, document_id)
-        if result is None:
-            raise DocumentRecordNotFoundError(f'Document {document_id} could not be found.') 
-        await self.session.delete(result)
-        await self.session.commit()
+        stmt = self._statement("delete_returning_stats", lambda t: (
+            delete(t)
+            .where(t.c.id == bindparam("document_id"))
+            .returning(t.c.project_id, t.c.file_size, t.c.content_type)
+        ))
+        try:
+            await self.session.execute(delete(DocumentJobModel).where(DocumentJobModel.document_id == document_id))
+            result = (await self.session.execute(stmt, {"document_id": document_id})).first()
+            if result is None:
+                await self.session.rollback()
+                raise DocumentRecordNotFoundError(f'Document {document_id} could not be found.')
+            await self._apply_stats_delta(result, count=-1)
+            self._record_event(
+                "document.deleted", document_id, {"id": document_id, "project_id": result.project_id}
+            )
+            self._record_tombstone("document", document_id, result.project_id)
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DocumentRepositoryError(f"Database error: {e}")
+
+    @read_only
+    async def get_project_stats(self, project_id: int) -> DocumentStats:
+        """Read the maintained document counters for a project.
+
+        Two primary-key lookups, independent of how many documents the
+        project holds.
+
+        Args:
+            project_id: Project identifier.
+
+        Returns:
+            The project's `DocumentStats`; zeroed if it has no documents.
+        """
+        totals = await self.session.get(ProjectDocumentStatsModel, project_id)
+        if totals is None:
+            return DocumentStats(project_id=project_id)
+        by_type = await self.session.execute(
+            select(
+                ProjectDocumentTypeStatsModel.content_type,
+                ProjectDocumentTypeStatsModel.total_bytes,
+            ).where(
+                ProjectDocumentTypeStatsModel.project_id == project_id,
+                ProjectDocumentTypeStatsModel.document_count > 0,
+            )
+        )
+        return DocumentStats(
+            project_id=project_id,
+            document_count=totals.document_count,
+            total_bytes=totals.total_bytes,
+            bytes_by_content_type=dict(by_type.tuples().all()),
+            last_uploaded_at=totals.last_uploaded_at,
+        )
+
+    async def rebuild_project_stats(self, project_id: int | None = None) -> None:
+        """Recompute document counters from the `documents` table.
+
+        Meant for a periodic reconciliation job in case the counters drift
+        (e.g. rows changed outside this repository). Runs as one transaction.
+
+        Args:
+            project_id: Project to rebuild, or None to rebuild every project.
+
+        Raises:
+            DocumentRepositoryError: On general database errors.
+        """
+        documents = select(DocumentModel)
+        clear_totals = delete(ProjectDocumentStatsModel)
+        clear_types = delete(ProjectDocumentTypeStatsModel)
+        if project_id is not None:
+            documents = documents.where(DocumentModel.project_id == project_id)
+            clear_totals = clear_totals.where(ProjectDocumentStatsModel.project_id == project_id)
+            clear_types = clear_types.where(ProjectDocumentTypeStatsModel.project_id == project_id)
+        documents = documents.subquery()
+
+        totals = select(
+            documents.c.project_id,
+            func.count(),
+            func.coalesce(func.sum(documents.c.file_size), 0),
+            func.max(documents.c.uploaded_at),
+        ).group_by(documents.c.project_id)
+        by_type = select(
+            documents.c.project_id,
+            documents.c.content_type,
+            func.count(),
+            func.coalesce(func.sum(documents.c.file_size), 0),
+        ).group_by(documents.c.project_id, documents.c.content_type)
+
+        try:
+            await self.session.execute(clear_totals)
+            await self.session.execute(clear_types)
+            await self.session.execute(
+                ProjectDocumentStatsModel.__table__.insert().from_select(
+                    ["project_id", "document_count", "total_bytes", "last_uploaded_at"], totals
+                )
+            )
+            await self.session.execute(
+                ProjectDocumentTypeStatsModel.__table__.insert().from_select(
+                    ["project_id", "content_type", "document_count", "total_bytes"], by_type
+                )
+            )
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise DocumentRepositoryError(f"Could not rebuild document stats: {e}")
+
+    async def _apply_stats_delta(
+        self, document: DocumentModel, count: int, quota_bytes: int | None = None
+    ) -> None:
+        """Add (`count=1`) or remove (`count=-1`) a document from its project's counters.
+
+        `document` may be a model or a row with its `project_id`,
+        `file_size` and `content_type` (and `uploaded_at` when adding).
+
+        Issued inside the caller's transaction so the counters commit or roll
+        back together with the document row. When adding with `quota_bytes`,
+        the counter update is conditional on staying within the quota; the
+        row lock taken by the upsert makes the check atomic.
+
+        Raises:
+            ProjectQuotaExceededError: If adding would exceed `quota_bytes`.
+        """
+        size = document.file_size * count
+        if count > 0:
+            if quota_bytes is not None and size > quota_bytes:
+                raise ProjectQuotaExceededError(f"Project {document.project_id} storage quota exceeded")
+            totals = self._insert(ProjectDocumentStatsModel).values(
+                project_id=document.project_id,
+                document_count=1,
+                total_bytes=size,
+                last_uploaded_at=document.uploaded_at,
+            )
+            within_quota = None
+            if quota_bytes is not None:
+                within_quota = ProjectDocumentStatsModel.total_bytes + size <= quota_bytes
+            applied = await self.session.execute(
+                totals.on_conflict_do_update(
+                    index_elements=[ProjectDocumentStatsModel.project_id],
+                    set_={
+                        "document_count": ProjectDocumentStatsModel.document_count + 1,
+                        "total_bytes": ProjectDocumentStatsModel.total_bytes + size,
+                        "last_uploaded_at": totals.excluded.last_uploaded_at,
+                    },
+                    where=within_quota,
+                ).returning(ProjectDocumentStatsModel.project_id)
+            )
+            if applied.first() is None:
+                raise ProjectQuotaExceededError(f"Project {document.project_id} storage quota exceeded")
+            by_type = self._insert(ProjectDocumentTypeStatsModel).values(
+                project_id=document.project_id,
+                content_type=document.content_type,
+                document_count=1,
+                total_bytes=size,
+            )
+            await self.session.execute(
+                by_type.on_conflict_do_update(
+                    index_elements=[
+                        ProjectDocumentTypeStatsModel.project_id,
+                        ProjectDocumentTypeStatsModel.content_type,
+                    ],
+                    set_={
+                        "document_count": ProjectDocumentTypeStatsModel.document_count + 1,
+                        "total_bytes": ProjectDocumentTypeStatsModel.total_bytes + size,
+                    },
+                )
+            )
+            return
+
+        await self.session.execute(
+            update(ProjectDocumentStatsModel)
+            .where(ProjectDocumentStatsModel.project_id == document.project_id)
+            .values(
+                document_count=ProjectDocumentStatsModel.document_count + count,
+                total_bytes=ProjectDocumentStatsModel.total_bytes + size,
+            )
+        )
+        await self.session.execute(
+            update(ProjectDocumentTypeStatsModel)
+            .where(
+                ProjectDocumentTypeStatsModel.project_id == document.project_id,
+                ProjectDocumentTypeStatsModel.content_type == document.content_type,
+            )
+            .values(
+                document_count=ProjectDocumentTypeStatsModel.document_count + count,
+                total_bytes=ProjectDocumentTypeStatsModel.total_bytes + size,
+            )
+        )
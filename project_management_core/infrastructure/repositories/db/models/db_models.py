@@ -1,13 +1,20 @@
 from datetime import datetime, timezone
 
 from sqlalchemy import (
+    DDL,
+    BigInteger,
     Column,
     DateTime,
     ForeignKey,
+    Index,
+    JSON,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
+    func,
+    text,
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -18,9 +25,15 @@ Base = declarative_base()
 class UserModel(Base):
     __tablename__ = 'users'
     id = Column(Integer, primary_key=True, autoincrement=True)
-    email = Column(String(255), unique=True, nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     password_hash = Column(String(255), nullable=False)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.now().replace(tzinfo=None))
+    # Emails are stored normalized (lowercased). The unique index and the
+    # lookups still use lower(email), so rows written before normalization
+    # on write, possibly in mixed case, stay unique and findable without a
+    # data migration.
+    __table_args__ = (Index("uq_users_email_lower", func.lower(email), unique=True),)
     owned_projects = relationship("ProjectModel", back_populates="owner")
 
 class ProjectModel(Base):
@@ -28,8 +41,10 @@ class ProjectModel(Base):
     id = Column(Integer, primary_key=True,autoincrement=True)
     name = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     created_at = Column(DateTime, default=datetime.now().replace(tzinfo=None))
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
     owner = relationship("UserModel", back_populates="owned_projects")
     members = relationship("ProjectMember", back_populates="project")
 
@@ -40,7 +55,11 @@ class ProjectMember(Base):
     project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
     role = Column(String(50), nullable=False, default="participant")
     joined_at = Column(DateTime, default=datetime.now().replace(tzinfo=None))
-    __table_args__ = (UniqueConstraint('user_id', 'project_id'),)
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    __table_args__ = (
+        UniqueConstraint('user_id', 'project_id'),
+        Index("ix_project_members_project_id_updated_at", "project_id", "updated_at"),
+    )
     user = relationship("UserModel")
     project = relationship("ProjectModel", back_populates='members', lazy='selectin')
 
@@ -50,11 +69,195 @@ class DocumentModel(Base):
     original_filename = Column(String(255), nullable = False)
     generated_filename = Column(String(255), nullable = False)
     file_path = Column(String(500), nullable = False)
-    file_size = Column(Integer, nullable= False)
+    file_size = Column(BigInteger, nullable= False)
     content_type = Column(String(255), nullable = False)
     project_id = Column(Integer, ForeignKey('projects.id'), nullable= False)
     uploaded_by = Column(Integer, ForeignKey('users.id'), nullable=False)
-    uploaded_at = Column(DateTime, default=datetime.now().replace(tzinfo=None))
+    uploaded_at = Column(DateTime, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    updated_at = Column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+    # Results of post-upload processing (checksum, sniffed type, text, ...).
+    file_metadata = Column(JSON, nullable=True)
+    __table_args__ = (
+        Index("ix_documents_project_id_original_filename", "project_id", "original_filename"),
+        Index("ix_documents_project_id_uploaded_at", "project_id", "uploaded_at"),
+        Index("ix_documents_project_id_content_type_uploaded_at", "project_id", "content_type", "uploaded_at"),
+        Index("ix_documents_project_id_file_size", "project_id", "file_size"),
+        Index("ix_documents_uploaded_by_uploaded_at", "uploaded_by", "uploaded_at"),
+        Index("ix_documents_project_id_updated_at", "project_id", "updated_at"),
+        Index(
+            "ix_documents_original_filename_trgm",
+            "original_filename",
+            postgresql_using="gin",
+            postgresql_ops={"original_filename": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     project = relationship("ProjectModel")
     user = relationship("UserModel")
+
+class OutboxEventModel(Base):
+    __tablename__ = 'outbox_events'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_type = Column(String(100), nullable=False)
+    aggregate_type = Column(String(50), nullable=False)
+    aggregate_id = Column(Integer, nullable=False)
+    payload = Column(JSON, nullable=False)
+    occurred_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    published_at = Column(DateTime, nullable=True)
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_unpublished",
+            "id",
+            postgresql_where=published_at.is_(None),
+            sqlite_where=published_at.is_(None),
+        ),
+    )
+
+class DocumentJobModel(Base):
+    """Pending or finished post-upload processing of one document.
+
+    A job is claimed by setting `status` to "running" and pushing
+    `run_after` out by the worker's lease, so a job whose worker died is
+    picked up again once the lease expires.
+    """
+    __tablename__ = 'document_jobs'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    document_id = Column(Integer, ForeignKey('documents.id'), nullable=False, unique=True)
+    priority = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    run_after = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    finished_at = Column(DateTime, nullable=True)
+    __table_args__ = (
+        Index("ix_document_jobs_status_run_after", "status", "run_after"),
+    )
+
+class UploadSessionModel(Base):
+    """Multipart upload in progress, or completed and awaiting expiry.
+
+    `id` is a random token; knowing it is what authorizes part uploads.
+    """
+    __tablename__ = 'upload_sessions'
+    id = Column(String(32), primary_key=True)
+    project_id = Column(Integer, ForeignKey('projects.id'), nullable=False)
+    uploaded_by = Column(Integer, ForeignKey('users.id'), nullable=False)
+    original_filename = Column(String(255), nullable=False)
+    content_type = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="open")
+    document_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+class UploadPartModel(Base):
+    __tablename__ = 'upload_parts'
+    session_id = Column(String(32), ForeignKey('upload_sessions.id'), primary_key=True)
+    part_number = Column(Integer, primary_key=True)
+    size = Column(BigInteger, nullable=False)
+    checksum = Column(String(64), nullable=False)
+    uploaded_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc).replace(tzinfo=None))
+
+class ChangeTombstoneModel(Base):
+    """Deleted project, membership or document, kept for the change feed.
+
+    `user_id` is set when the deletion concerns a user who may no longer
+    have access to the project: the removed member, or each member of a
+    deleted project.
+    """
+    __tablename__ = 'change_tombstones'
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    entity_type = Column(String(50), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    project_id = Column(Integer, nullable=False)
+    user_id = Column(Integer, nullable=True)
+    deleted_at = Column(DateTime, nullable=False, default=func.now())
+    __table_args__ = (
+        Index("ix_change_tombstones_project_id_deleted_at", "project_id", "deleted_at"),
+        Index("ix_change_tombstones_user_id_deleted_at", "user_id", "deleted_at"),
+    )
+
+class ProjectDocumentStatsModel(Base):
+    __tablename__ = 'project_document_stats'
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
+    document_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+    last_uploaded_at = Column(DateTime, nullable=True)
+
+class ProjectDocumentTypeStatsModel(Base):
+    __tablename__ = 'project_document_type_stats'
+    project_id = Column(Integer, ForeignKey('projects.id', ondelete="CASCADE"), primary_key=True)
+    content_type = Column(String(255), primary_key=True)
+    document_count = Column(Integer, nullable=False, default=0)
+    total_bytes = Column(BigInteger, nullable=False, default=0)
+
+
+# Filename search indexes that can't be expressed as plain `Index` objects:
+# the pg_trgm extension on PostgreSQL, and an external-content FTS5 table
+# kept in sync with `documents` by triggers on SQLite.
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5("
+    "original_filename, content='documents', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_ai AFTER INSERT ON documents BEGIN "
+    "INSERT INTO documents_fts(rowid, original_filename) VALUES (new.id, new.original_filename); END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_ad AFTER DELETE ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, original_filename) "
+    "VALUES ('delete', old.id, old.original_filename); END",
+    "CREATE TRIGGER IF NOT EXISTS documents_fts_au AFTER UPDATE OF original_filename ON documents BEGIN "
+    "INSERT INTO documents_fts(documents_fts, rowid, original_filename) "
+    "VALUES ('delete', old.id, old.original_filename); "
+    "INSERT INTO documents_fts(rowid, original_filename) VALUES (new.id, new.original_filename); END",
+):
+    event.listen(DocumentModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    DocumentModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS documents_fts").execute_if(dialect="sqlite"),
+)
+
+
+# Full-text search over project names and descriptions. On PostgreSQL the
+# weighted tsvector below is indexed with GIN and queries must use this exact
+# expression to hit the index; on SQLite an FTS5 table mirrors the columns.
+project_search_vector = func.setweight(
+    func.to_tsvector(text("'simple'"), ProjectModel.name), text("'A'")
+).op("||")(
+    func.setweight(
+        func.to_tsvector(
+            text("'simple'"), func.coalesce(ProjectModel.description, text("''"))
+        ),
+        text("'B'"),
+    )
+)
+
+Index("ix_projects_search_vector", project_search_vector, postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+
+for statement in (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS projects_fts USING fts5("
+    "name, description, content='projects', content_rowid='id')",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_ai AFTER INSERT ON projects BEGIN "
+    "INSERT INTO projects_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_ad AFTER DELETE ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); END",
+    "CREATE TRIGGER IF NOT EXISTS projects_fts_au AFTER UPDATE OF name, description ON projects BEGIN "
+    "INSERT INTO projects_fts(projects_fts, rowid, name, description) "
+    "VALUES ('delete', old.id, old.name, old.description); "
+    "INSERT INTO projects_fts(rowid, name, description) VALUES (new.id, new.name, new.description); END",
+):
+    event.listen(ProjectModel.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+
+event.listen(
+    ProjectModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS projects_fts").execute_if(dialect="sqlite"),
+)
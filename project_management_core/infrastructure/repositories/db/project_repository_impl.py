@@ -1,25 +1,57 @@
+import re
+from datetime import datetime, timedelta
 from operator import or_
 from typing import Optional
 
-from sqlalchemy import select, or_
+from sqlalchemy import Integer, bindparam, column, delete, exists, func, literal, literal_column, select, or_, table, text, union, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import aliased, selectinload
 
-from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.change import (
+    ChangeSet,
+    MembershipChange,
+    Tombstone,
+)
+from project_management_core.domain.entities.document import DocumentStats
+from project_management_core.domain.entities.project import (
+    Project,
+    ProjectMemberInfo,
+    ProjectMembership,
+    ProjectOverview,
+)
+from project_management_core.domain.repositories.errors import RepositoryError
 from project_management_core.domain.repositories.project_repository import (
     ProjectRepository,
+    ProjectVersionConflictError as ProjectVersionConflictError,
+)
+from project_management_core.infrastructure.invalidation import project_key, user_projects_key
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    AsyncRepository,
+)
+from project_management_core.infrastructure.repositories.db.document_repository_impl import (
+    to_document,
 )
 from project_management_core.infrastructure.repositories.db.models.db_models import (
+    ChangeTombstoneModel,
+    DocumentModel,
+    ProjectDocumentStatsModel,
+    ProjectDocumentTypeStatsModel,
     ProjectMember,
     ProjectModel,
     UserModel,
+    project_search_vector,
 )
+from project_management_core.infrastructure.repositories.db.routing import read_only
+
+# FTS5 shadow table created alongside `projects` on SQLite (see db_models).
+projects_fts = table("projects_fts", column("rowid"), column("projects_fts"))
 
+# How far change-feed cursors trail the database clock, so rows written by
+# transactions that commit after the feed was read are still picked up.
+CHANGE_FEED_GRACE = timedelta(seconds=5)
 
-class RepositoryError(Exception):
-    pass
 
 class ProjectNotFoundError(RepositoryError):
       """Project not found in database."""
@@ -31,15 +63,31 @@ class ProjectDataIntegrityError(RepositoryError):
     """Constraints validation"""
 
 
-class ProjectRepositoryImpl(ProjectRepository):
+def _to_project(row, participants: list[int] | None = None) -> Project:
+    """Build a `Project` entity from a stored row, marked as persisted."""
+    project = Project(
+        id=row.id,
+        name=row.name,
+        description=row.description,
+        owner_id=row.owner_id,
+        participants=participants or [],
+        version=row.version,
+    )
+    project.mark_persisted()
+    return project
+
+
+class ProjectRepositoryImpl(AsyncRepository, ProjectRepository):
     """SQLAlchemy-based implementation of the `ProjectRepository` interface."""
+    model = ProjectModel
+
     def __init__(self, session: AsyncSession) -> None: 
         """Initialize the repository with an async database session.
 
         Args:
             session: Async SQLAlchemy session.
         """
-        self.session = session
+        super().__init__(session)
 
     
     async def create(self, project: Project) -> Project:
@@ -63,22 +111,22 @@ class ProjectRepositoryImpl(ProjectRepository):
         )
         try:
             self.session.add(orm_project)
+            await self.session.flush()
+            created = _to_project(orm_project)
+            self._record_event("project.created", created.id, created.model_dump(mode="json"))
+            self._invalidate(user_projects_key(created.owner_id))
             await self.session.commit()
-            await self.session.refresh(orm_project)
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ProjectDataIntegrityError(f"Integrity error: {e}")
         except SQLAlchemyError:
             await self.session.rollback()
             raise RepositoryError("Unable to create project.")
-        except IntegrityError as e:
-            raise ProjectDataIntegrityError(f"Integrity error: {e}")
 
-        return Project(
-            id = orm_project.id,
-            name = orm_project.name,
-            description = orm_project.description,
-            owner_id = orm_project.owner_id 
-        )
+        return created
 
     
+    @read_only
     async def get_by_id(self, project_id: int) -> Optional[Project]:
         """Fetch a project by ID.
 
@@ -91,23 +139,22 @@ class ProjectRepositoryImpl(ProjectRepository):
         Raises:
             ProjectNotFoundError: If the project does not exist.
         """
-        result = await self.session.get(ProjectModel, project_id)
+        result = await self.get_row(project_id)
         if result is None:
             raise ProjectNotFoundError("Project not found")
 
-        return Project(
-            id = result.id,
-            name = result.name,
-            description = result.description,
-            owner_id = result.owner_id 
-        )
+        return _to_project(result)
 
     
+    @read_only
     async def get_for_user(self, user_id: int) -> list[Project]:
-        """Fetch all projects for a given owner user ID.
+        """Fetch all projects the user owns or is a member of.
+
+        Owned and joined project IDs are collected with a `UNION` of two
+        index lookups rather than an `OR`, which would force a full scan.
 
         Args:
-            user_id: Owner user identifier.
+            user_id: Owner or member user identifier.
 
         Returns:
             List of `Project` entities.
@@ -115,112 +162,305 @@ class ProjectRepositoryImpl(ProjectRepository):
         Raises:
             ProjectNotFoundError: If no projects are found for the user.
         """
-        project_query = select(ProjectModel).where(
-            or_(ProjectModel.owner_id == user_id,
-            ProjectModel.members.any(UserModel.id == user_id)))
-        result = await self.session.execute(project_query)
-        rows = result.scalars().all()
+        stmt = self._statement("get_for_user", lambda t: select(t).where(t.c.id.in_(union(
+            select(t.c.id).where(t.c.owner_id == bindparam("user_id")),
+            select(ProjectMember.project_id).where(ProjectMember.user_id == bindparam("user_id")),
+        ))))
+        rows = (await self.session.execute(stmt, {"user_id": user_id})).all()
         if not rows:
             raise ProjectNotFoundError(f"No projects found for user: {user_id}")
-        projects = []
-        for row in rows:
-            projects.append(
-                Project(
-            id=row.id,
-            name=row.name,
-            description=row.description,
-            owner_id=row.owner_id
-        ))
-        return projects
+        return [_to_project(row) for row in rows]
     
+    @read_only
+    async def search_projects(
+        self, user_id: int, query: str, limit: int = 20, offset: int = 0
+    ) -> list[Project]:
+        """Full-text search over projects the user owns or is a member of.
+
+        Every search term must match; the last one is treated as a prefix so
+        partially typed words still find results. Matches in the name rank
+        above matches in the description. Served by the GIN tsvector index
+        on PostgreSQL and the FTS5 table on SQLite.
+
+        Args:
+            user_id: Identifier of the user whose accessible projects are searched.
+            query: Free-text search terms.
+            limit: Maximum number of projects to return.
+            offset: Number of ranked results to skip.
+
+        Returns:
+            List of matching `Project` entities, most relevant first.
+            Empty if nothing matches.
+
+        Raises:
+            ProjectRepositoryError: On general database errors.
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+
+        accessible = or_(
+            ProjectModel.owner_id == user_id,
+            exists().where(
+                ProjectMember.project_id == ProjectModel.id,
+                ProjectMember.user_id == user_id,
+            ),
+        )
+        stmt = select(ProjectModel).where(accessible)
+
+        if self.dialect_name == "postgresql":
+            ts_query = func.to_tsquery(
+                text("'simple'"), " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+            )
+            stmt = stmt.where(project_search_vector.op("@@")(ts_query)).order_by(
+                func.ts_rank(project_search_vector, ts_query).desc(), ProjectModel.id
+            )
+        else:
+            match = " ".join(f'"{term}"' for term in terms) + "*"
+            stmt = (
+                stmt.join(projects_fts, projects_fts.c.rowid == ProjectModel.id)
+                .where(projects_fts.c.projects_fts.op("MATCH")(match))
+                .order_by(func.bm25(literal_column("projects_fts"), 10.0, 1.0), ProjectModel.id)
+            )
+
+        try:
+            result = await self.session.execute(stmt.limit(limit).offset(offset))
+        except SQLAlchemyError as e:
+            raise ProjectRepositoryError(f"Could not search projects: {e}")
+        return [_to_project(row) for row in result.scalars().all()]
+
     async def update(self, project: Project) -> Project:
-        """Update an existing project.
+        """Update an existing project with a single versioned `UPDATE ... RETURNING`.
+
+        Only fields changed since the project was loaded are written, and
+        nothing is sent at all if none changed. When `project.version` is
+        set, the row is only updated if its version still matches.
 
         Args:
             project: Project with updated fields to persist.
 
         Returns:
-            The updated `Project` entity.
+            The updated `Project` entity with its new version.
 
         Raises:
             ProjectNotFoundError: If the project does not exist.
+            ProjectVersionConflictError: If the project changed since it was loaded.
             ProjectRepositoryError: On general database errors.
         """
-        result = await self.session.get(ProjectModel, project.id) 
-        if result is None:
-            raise ProjectNotFoundError("Project not found")
+        changes = project.changed_fields()
+        if not changes:
+            return project
+
+        stmt = update(ProjectModel).where(ProjectModel.id == project.id)
+        if project.version is not None:
+            stmt = stmt.where(ProjectModel.version == project.version)
+        stmt = stmt.values(**changes, version=ProjectModel.version + 1).returning(
+            ProjectModel.id,
+            ProjectModel.name,
+            ProjectModel.description,
+            ProjectModel.owner_id,
+            ProjectModel.version,
+        )
         try:
-            result.name = project.name
-            result.description = project.description
+            row = (await self.session.execute(stmt)).one_or_none()
+            if row is not None:
+                self._record_event(
+                    "project.updated", row.id, {**_to_project(row).model_dump(mode="json"), "changed": sorted(changes)}
+                )
+                if self._invalidating:
+                    audience = await self._audience(row.id)
+                    self._invalidate(project_key(row.id), *(user_projects_key(user_id) for user_id in audience))
             await self.session.commit()
-            await self.session.refresh(result)
         except SQLAlchemyError as e:
+            await self.session.rollback()
             raise ProjectRepositoryError(f"Could not update project {project.id}: {e}")
 
-        return Project(
-            id = result.id,
-            name = result.name,
-            description = result.description,
-            owner_id= result.owner_id
-        )
+        if row is None:
+            if project.version is not None and await self.exists(ProjectModel.id == project.id):
+                raise ProjectVersionConflictError(
+                    f"Project {project.id} was modified concurrently (expected version {project.version})"
+                )
+            raise ProjectNotFoundError("Project not found")
+        return _to_project(row, project.participants)
 
     async def delete(self, project_id: int) -> None:
         """Delete a project by ID.
 
+        The project's document counters are deleted with it; the foreign
+        keys cascade too, but SQLite only enforces them when asked to.
+
         Args:
             project_id: Identifier of the project to delete.
 
         Raises:
+            ProjectNotFoundError: If the project does not exist.
             RepositoryError: If the delete operation fails.
         """
         try:
-            result = await self.session.get(ProjectModel, project_id)
-            await self.session.delete(result)
+            audience = await self._audience(project_id)
+            if audience:
+                await self.session.execute(ChangeTombstoneModel.__table__.insert(), [
+                    {"entity_type": "project", "entity_id": project_id, "project_id": project_id, "user_id": user_id}
+                    for user_id in audience
+                ])
+            for stats in (ProjectDocumentStatsModel, ProjectDocumentTypeStatsModel):
+                await self.session.execute(delete(stats).where(stats.project_id == project_id))
+            deleted = await self.delete_by_id(project_id)
+            if deleted:
+                self._record_event("project.deleted", project_id, {"id": project_id})
+                self._invalidate(project_key(project_id), *(user_projects_key(user_id) for user_id in audience))
             await self.session.commit()
         except SQLAlchemyError:
+            await self.session.rollback()
             raise RepositoryError("Unable to delete project.")
-
-
-    async def add_user_to_project(self, project_id: int, user_id: int) -> Project:
-        project_model = await self.session.get(ProjectModel, project_id)
-        if not project_model:
+        if not deleted:
             raise ProjectNotFoundError("Project not found")
 
-        if user_id == project_model.owner_id:
-            raise ProjectDataIntegrityError("Cannot add the owner as participant")
 
-        existing = await self.session.execute(
-            select(ProjectMember)
-            .where(ProjectMember.project_id == project_id,
-                ProjectMember.user_id == user_id)
+    async def _audience(self, project_id: int) -> list[int]:
+        """IDs of the owner and members of a project, whose project lists include it."""
+        audience = union(
+            select(ProjectModel.owner_id).where(ProjectModel.id == project_id),
+            select(ProjectMember.user_id).where(ProjectMember.project_id == project_id),
         )
-        if existing.scalar_one_or_none():
-            raise ProjectDataIntegrityError("User already a participant")
+        return list((await self.session.scalars(audience)).all())
+
+    async def remove_user_from_project(self, project_id: int, user_id: int) -> bool:
+        """Remove a participant from a project.
+
+        Args:
+            project_id: Identifier of the project.
+            user_id: Identifier of the participant to remove.
+
+        Returns:
+            True if the user was a participant, False otherwise.
 
-        self.session.add(
-            ProjectMember(user_id=user_id, project_id=project_id, role="participant")
+        Raises:
+            ProjectRepositoryError: On general database errors.
+        """
+        stmt = (
+            ProjectMember.__table__.delete()
+            .where(ProjectMember.project_id == project_id, ProjectMember.user_id == user_id)
+            .returning(ProjectMember.id)
         )
-        await self.session.commit()
-        await self.session.refresh(project_model, ['members'])  
-        participants = []
         try:
-                participants = [m.user_id for m in project_model.members]
-        except Exception as e:
-                print(f"Error accessing members: {e}")
-                members_result = await self.session.execute(
-                    select(ProjectMember).where(ProjectMember.project_id == project_id)
+            member_id = (await self.session.execute(stmt)).scalar_one_or_none()
+            if member_id is not None:
+                self._record_tombstone("project_member", member_id, project_id, user_id)
+                self._record_event(
+                    "project.member_removed", project_id, {"project_id": project_id, "user_id": user_id}
                 )
-                participants = [m.user_id for m in members_result.scalars().all()]
-
-        return Project(
-                id=project_model.id,
-                name=project_model.name,
-                description=project_model.description,
-                owner_id=project_model.owner_id,
-                participants=participants
+                self._invalidate(project_key(project_id), user_projects_key(user_id))
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ProjectRepositoryError(f"Could not remove user {user_id} from project {project_id}: {e}")
+        return member_id is not None
+
+    async def add_user_to_project(self, project_id: int, user_id: int) -> ProjectMembership:
+        """Add a user to a project as a participant, idempotently.
+
+        The owner check and the insert-if-absent run as a single
+        `INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING` statement,
+        followed by one query for the project and its participants.
+
+        Args:
+            project_id: Identifier of the project.
+            user_id: Identifier of the user to add.
+
+        Returns:
+            The project with its participants, and whether the user was
+            newly added (False if already a participant).
+
+        Raises:
+            ProjectNotFoundError: If the project does not exist.
+            ProjectDataIntegrityError: If the user is the owner or does not exist.
+            ProjectRepositoryError: On general database errors.
+        """
+        members_table = ProjectMember.__table__
+        stmt = self._statement(f"add_member:{self.dialect_name}", lambda t: (
+            self._insert(members_table)
+            .from_select(
+                ["user_id", "project_id", "role"],
+                select(bindparam("user_id", type_=Integer), t.c.id, literal("participant"))
+                .where(t.c.id == bindparam("project_id"), t.c.owner_id != bindparam("user_id", type_=Integer)),
             )
-    
+            .on_conflict_do_nothing(index_elements=["user_id", "project_id"])
+            .returning(members_table.c.id)
+        ))
+        members = self._statement("with_participants", lambda t: (
+            select(t.c.id, t.c.name, t.c.description, t.c.owner_id, t.c.version, ProjectMember.user_id)
+            .outerjoin(ProjectMember, ProjectMember.project_id == t.c.id)
+            .where(t.c.id == bindparam("project_id"))
+            .order_by(ProjectMember.id)
+        ))
+        params = {"project_id": project_id, "user_id": user_id}
+        try:
+            added = (await self.session.execute(stmt, params)).first() is not None
+            if added:
+                self._record_event(
+                    "project.member_added", project_id, {"project_id": project_id, "user_id": user_id}
+                )
+                self._invalidate(project_key(project_id), user_projects_key(user_id))
+            rows = (await self.session.execute(members, params)).all()
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ProjectDataIntegrityError(f"Integrity error: {e}")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ProjectRepositoryError(f"Could not add user {user_id} to project {project_id}: {e}")
+
+        if not rows:
+            raise ProjectNotFoundError("Project not found")
+        if not added and rows[0].owner_id == user_id:
+            raise ProjectDataIntegrityError("Cannot add the owner as participant")
+        participants = [row.user_id for row in rows if row.user_id is not None]
+        return ProjectMembership(project=_to_project(rows[0], participants), added=added)
+
+    async def add_members(self, project_id: int, roles: dict[int, str]) -> list[int]:
+        """Add several users to a project in one statement, skipping existing members.
+
+        For bulk loads such as archive imports: no owner check is made. A
+        `project.member_added` event is recorded for each user added.
+
+        Args:
+            project_id: Identifier of the project.
+            roles: Role of each user to add, by user ID.
+
+        Returns:
+            IDs of the users that were added.
 
+        Raises:
+            ProjectDataIntegrityError: If the project or a user does not exist.
+            ProjectRepositoryError: On general database errors.
+        """
+        if not roles:
+            return []
+        members_table = ProjectMember.__table__
+        stmt = (
+            self._insert(members_table)
+            .values([{"user_id": user_id, "project_id": project_id, "role": role} for user_id, role in roles.items()])
+            .on_conflict_do_nothing(index_elements=["user_id", "project_id"])
+            .returning(members_table.c.user_id)
+        )
+        try:
+            added = list((await self.session.execute(stmt)).scalars())
+            for user_id in added:
+                self._record_event(
+                    "project.member_added", project_id, {"project_id": project_id, "user_id": user_id}
+                )
+            self._invalidate(project_key(project_id), *(user_projects_key(user_id) for user_id in added))
+            await self.session.commit()
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise ProjectDataIntegrityError(f"Integrity error: {e}")
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise ProjectRepositoryError(f"Could not add members to project {project_id}: {e}")
+        return added
+
+    @read_only
     async def get_project_with_members(self, project_id: int) -> ProjectModel:
         """Fetch a project with its participants eagerly loaded."""
         result = await self.session.execute(
@@ -231,4 +471,164 @@ class ProjectRepositoryImpl(ProjectRepository):
         project_model = result.scalar_one_or_none()
         if not project_model:
             raise ProjectNotFoundError("Project not found")
-        return project_model
\ No newline at end of file
+        return project_model
+
+    @read_only
+    async def get_overview(self, project_id: int, document_limit: int = 20) -> ProjectOverview:
+        """Fetch a project with member emails, recent documents and document counters.
+
+        Three indexed queries on one session: the project joined with its
+        owner, members and totals; the per-type byte totals; and the most
+        recent documents.
+
+        Args:
+            project_id: Identifier of the project.
+            document_limit: Maximum number of recent documents to include.
+
+        Returns:
+            The project's `ProjectOverview`.
+
+        Raises:
+            ProjectNotFoundError: If the project does not exist.
+        """
+        owner = aliased(UserModel)
+        member_user = aliased(UserModel)
+        rows = (await self.session.execute(
+            select(
+                ProjectModel,
+                owner.email.label("owner_email"),
+                ProjectDocumentStatsModel.document_count,
+                ProjectDocumentStatsModel.total_bytes,
+                ProjectDocumentStatsModel.last_uploaded_at,
+                ProjectMember.user_id.label("member_id"),
+                ProjectMember.role,
+                member_user.email.label("member_email"),
+            )
+            .join(owner, owner.id == ProjectModel.owner_id)
+            .outerjoin(ProjectDocumentStatsModel, ProjectDocumentStatsModel.project_id == ProjectModel.id)
+            .outerjoin(ProjectMember, ProjectMember.project_id == ProjectModel.id)
+            .outerjoin(member_user, member_user.id == ProjectMember.user_id)
+            .where(ProjectModel.id == project_id)
+            .order_by(ProjectMember.id)
+        )).all()
+        if not rows:
+            raise ProjectNotFoundError("Project not found")
+        first = rows[0]
+        members = [
+            ProjectMemberInfo(user_id=row.member_id, email=row.member_email, role=row.role)
+            for row in rows if row.member_id is not None
+        ]
+
+        by_type = await self.session.execute(
+            select(ProjectDocumentTypeStatsModel.content_type, ProjectDocumentTypeStatsModel.total_bytes)
+            .where(
+                ProjectDocumentTypeStatsModel.project_id == project_id,
+                ProjectDocumentTypeStatsModel.document_count > 0,
+            )
+        )
+        documents = await self.session.execute(
+            select(DocumentModel)
+            .where(DocumentModel.project_id == project_id)
+            .order_by(DocumentModel.uploaded_at.desc(), DocumentModel.id.desc())
+            .limit(document_limit)
+        )
+        return ProjectOverview(
+            project=_to_project(first.ProjectModel, [member.user_id for member in members]),
+            owner_email=first.owner_email,
+            members=members,
+            recent_documents=[to_document(doc) for doc in documents.scalars()],
+            document_stats=DocumentStats(
+                project_id=project_id,
+                document_count=first.document_count or 0,
+                total_bytes=first.total_bytes or 0,
+                bytes_by_content_type=dict(by_type.tuples().all()),
+                last_uploaded_at=first.last_uploaded_at,
+            ),
+        )
+
+    async def changes_since(self, user_id: int, cursor: datetime | None = None) -> ChangeSet:
+        """Fetch what changed for a user since a previous sync.
+
+        One query per table, each an index range on `(project_id,
+        updated_at)` (or `deleted_at` for tombstones) within the user's
+        projects, so the cost follows the number of changes. Projects the
+        user joined after `cursor` are returned in full, since their older
+        rows are new to the user.
+
+        Always served by the primary, not a replica: the returned cursor
+        comes from the database clock, and a lagging replica would hand
+        out a cursor past changes it hasn't received yet, which the next
+        sync would then skip.
+
+        Args:
+            user_id: Identifier of the syncing user.
+            cursor: `ChangeSet.cursor` of the previous call, or None for a
+                full sync.
+
+        Returns:
+            The changed projects, memberships and documents, the deletions,
+            and the cursor for the next call.
+        """
+        now = await self.session.scalar(select(func.now()))
+        accessible = union(
+            select(ProjectModel.id).where(ProjectModel.owner_id == user_id),
+            select(ProjectMember.project_id).where(ProjectMember.user_id == user_id),
+        )
+
+        def changed(model, project_column):
+            """IDs of `model` rows in accessible projects changed after the cursor."""
+            if cursor is None:
+                return select(model.id).where(project_column.in_(accessible))
+            joined = select(ProjectMember.project_id).where(
+                ProjectMember.user_id == user_id, ProjectMember.updated_at > cursor
+            )
+            return union(
+                select(model.id).where(project_column.in_(accessible), model.updated_at > cursor),
+                select(model.id).where(project_column.in_(joined)),
+            )
+
+        projects = await self.session.scalars(
+            select(ProjectModel).where(ProjectModel.id.in_(changed(ProjectModel, ProjectModel.id)))
+        )
+        memberships = await self.session.execute(
+            select(ProjectMember.project_id, ProjectMember.user_id, ProjectMember.role)
+            .where(ProjectMember.id.in_(changed(ProjectMember, ProjectMember.project_id)))
+        )
+        documents = await self.session.scalars(
+            select(DocumentModel).where(DocumentModel.id.in_(changed(DocumentModel, DocumentModel.project_id)))
+        )
+        deletions = []
+        if cursor is not None:
+            tombstone_ids = union(
+                select(ChangeTombstoneModel.id).where(
+                    ChangeTombstoneModel.user_id == user_id, ChangeTombstoneModel.deleted_at > cursor
+                ),
+                select(ChangeTombstoneModel.id).where(
+                    ChangeTombstoneModel.project_id.in_(accessible), ChangeTombstoneModel.deleted_at > cursor
+                ),
+            )
+            deletions = await self.session.scalars(
+                select(ChangeTombstoneModel)
+                .where(ChangeTombstoneModel.id.in_(tombstone_ids))
+                .order_by(ChangeTombstoneModel.id)
+            )
+
+        next_cursor = now - CHANGE_FEED_GRACE
+        if cursor is not None and cursor > next_cursor:
+            next_cursor = cursor
+        return ChangeSet(
+            projects=[_to_project(row) for row in projects],
+            memberships=[MembershipChange(project_id=p, user_id=u, role=r) for p, u, r in memberships],
+            documents=[to_document(row) for row in documents],
+            deletions=[
+                Tombstone(
+                    entity_type=row.entity_type,
+                    entity_id=row.entity_id,
+                    project_id=row.project_id,
+                    user_id=row.user_id,
+                    deleted_at=row.deleted_at,
+                )
+                for row in deletions
+            ],
+            cursor=next_cursor,
+        )
@@ -0,0 +1,220 @@
+import contextvars
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# Budgets open in the current task, innermost last. A context variable
+# keeps statements of concurrent requests apart.
+_active: contextvars.ContextVar[tuple["QueryBudget", ...]] = contextvars.ContextVar("query_budgets", default=())
+_START_KEY = "query_budget_started"
+_listening = False
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+|\?")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+# A column alias, e.g. the ORM's `documents.id AS documents_id`; the
+# lookahead leaves `CAST(x AS INTEGER)` alone.
+_ALIAS = re.compile(r'\s+AS\s+(?:\w+|"[^"]*")(?=\s*,|\s+FROM\b)', re.IGNORECASE)
+_VALUES_LIST = re.compile(r"(\(\s*\?(?:\s*,\s*\?)*\s*\))(?:\s*,\s*\(\s*\?(?:\s*,\s*\?)*\s*\))+")
+
+
+def statement_shape(statement: str) -> str:
+    """Reduce SQL to its shape: literals, placeholders and IN/VALUES lists
+    become `?` and column aliases are dropped, so statements differing only
+    in their values, or in ORM versus Core labels, compare equal.
+    """
+    shape = _STRING.sub("?", statement)
+    shape = _ALIAS.sub("", shape)
+    shape = _PLACEHOLDER.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _IN_LIST.sub("IN (?)", shape)
+    shape = _VALUES_LIST.sub(r"\1", shape)
+    return " ".join(shape.split())
+
+
+@dataclass
+class RecordedStatement:
+    """One statement sent to the database."""
+    statement: str
+    parameters: Any
+    shape: str
+    executemany: bool = False
+    duration: float = 0.0
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised when a call issues more SQL than its declared budget allows."""
+    def __init__(self, message: str, budget: "QueryBudget"):
+        super().__init__(message)
+        self.budget = budget
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    budgets = _active.get()
+    if not budgets:
+        return
+    recorded = RecordedStatement(statement, parameters, statement_shape(statement), executemany)
+    for budget in budgets:
+        budget.statements.append(recorded)
+    conn.info.setdefault(_START_KEY, []).append((recorded, time.perf_counter()))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get(_START_KEY)
+    if started:
+        recorded, at = started.pop()
+        recorded.duration = time.perf_counter() - at
+
+
+def _handle_error(context):
+    started = context.connection.info.get(_START_KEY) if context.connection is not None else None
+    if started:
+        started.pop()
+
+
+def _listen() -> None:
+    # Installed on first use and left in place: with no budget open, the
+    # listeners cost one context variable lookup per statement.
+    global _listening
+    if not _listening:
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+        _listening = True
+
+
+class QueryBudget:
+    """Records the SQL issued by a block of code and enforces a budget on it.
+
+    Every statement sent through any engine by the current task (including
+    tasks it starts inside the block) is recorded, along with its shape
+    (see `statement_shape`). A shape that repeats within one call is the
+    mark of an N+1 query: one statement per row of an earlier result
+    instead of one statement for all of them.
+
+    On leaving the block, the budget is checked: more than `max_queries`
+    statements, or any shape issued more than `max_repeats` times, raises
+    `QueryBudgetExceededError` (or only logs a warning when `strict` is
+    False). Nothing is checked if the block raised. Budgets can be nested;
+    each records everything issued inside it.
+
+    Usage:
+        async with QueryBudget(max_queries=3) as budget:
+            await service.add_user_to_project(project_id, user_id, owner)
+        print(budget.count, budget.repeated)
+
+        @QueryBudget(max_queries=2)
+        async def delete_document(...):
+            ...
+    """
+    def __init__(
+        self,
+        max_queries: int | None = None,
+        max_repeats: int | None = 1,
+        strict: bool = True,
+        label: str | None = None,
+    ):
+        """Initialize the budget.
+
+        Args:
+            max_queries: Most statements allowed, or None for no limit.
+            max_repeats: Most times one statement shape may be issued, or
+                None for no limit. Defaults to 1, so any repeat is an N+1.
+            strict: Raise when the budget is exceeded; if False, log a
+                warning instead. Defaults to True.
+            label: Name of the call in messages. Defaults to the decorated
+                function's qualified name.
+        """
+        self.max_queries = max_queries
+        self.max_repeats = max_repeats
+        self.strict = strict
+        self.label = label
+        self.statements: list[RecordedStatement] = []
+        self._tokens: list[contextvars.Token] = []
+
+    @property
+    def count(self) -> int:
+        """Number of statements recorded."""
+        return len(self.statements)
+
+    @property
+    def duration(self) -> float:
+        """Seconds spent executing the recorded statements."""
+        return sum(s.duration for s in self.statements)
+
+    @property
+    def repeated(self) -> dict[str, int]:
+        """Shapes issued more than once, with how many times, most frequent first."""
+        counts = Counter(s.shape for s in self.statements)
+        return {shape: n for shape, n in counts.most_common() if n > 1}
+
+    def violations(self) -> list[str]:
+        """Describe how the recorded statements exceed the budget, if they do."""
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(f"{self.count} statements, budget {self.max_queries}")
+        if self.max_repeats is not None:
+            for shape, n in self.repeated.items():
+                if n > self.max_repeats:
+                    problems.append(f"N+1: {n}x {shape}")
+        return problems
+
+    def check(self) -> None:
+        """Raise or warn if the recorded statements exceed the budget.
+
+        Raises:
+            QueryBudgetExceededError: If the budget is exceeded and `strict`.
+        """
+        problems = self.violations()
+        if not problems:
+            return
+        message = f"{self.label or 'Query budget'} exceeded: " + "; ".join(problems)
+        if self.strict:
+            raise QueryBudgetExceededError(message, self)
+        logger.warning(message)
+
+    def __enter__(self) -> "QueryBudget":
+        _listen()
+        self.statements = []
+        self._tokens.append(_active.set(_active.get() + (self,)))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active.reset(self._tokens.pop())
+        if exc_type is None:
+            self.check()
+
+    async def __aenter__(self) -> "QueryBudget":
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.__exit__(exc_type, exc, tb)
+
+    def _copy(self, label: str) -> "QueryBudget":
+        return QueryBudget(self.max_queries, self.max_repeats, self.strict, self.label or label)
+
+    def __call__(self, func):
+        """Apply the budget to every call of `func`, each recorded separately."""
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                async with self._copy(func.__qualname__):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self._copy(func.__qualname__):
+                return func(*args, **kwargs)
+        return wrapper
@@ -0,0 +1,134 @@
+import functools
+import itertools
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+READ_ONLY_KEY = "read_only"
+WROTE_KEY = "wrote"
+
+ROUND_ROBIN = "round_robin"
+LEAST_BUSY = "least_busy"
+
+
+class ReplicaSet:
+    """Pool of read-replica engines with round-robin or least-busy selection.
+
+    A replica that fails to connect is taken out of rotation for
+    `retry_after` seconds; while no replica is healthy, reads go to the
+    primary.
+    """
+    def __init__(self, replicas: list[AsyncEngine], strategy: str = ROUND_ROBIN, retry_after: float = 30.0):
+        """Initialize the replica set.
+
+        Args:
+            replicas: Async engines pointing at read replicas.
+            strategy: Either "round_robin" or "least_busy". Defaults to "round_robin".
+            retry_after: Seconds an unhealthy replica stays out of rotation. Defaults to 30.
+
+        Raises:
+            ValueError: If `strategy` is unknown.
+        """
+        if strategy not in (ROUND_ROBIN, LEAST_BUSY):
+            raise ValueError(f"Unknown replica selection strategy: {strategy}")
+        self.replicas = list(replicas)
+        self.strategy = strategy
+        self.retry_after = retry_after
+        self._unhealthy_until: dict[AsyncEngine, float] = {}
+        self._cycle = itertools.cycle(self.replicas)
+        for replica in self.replicas:
+            event.listen(replica.sync_engine, "handle_error", functools.partial(self._on_error, replica))
+
+    def healthy(self) -> list[AsyncEngine]:
+        """Return the replicas currently in rotation."""
+        now = time.monotonic()
+        return [r for r in self.replicas if self._unhealthy_until.get(r, 0.0) <= now]
+
+    def choose(self) -> AsyncEngine | None:
+        """Pick a healthy replica according to the selection strategy.
+
+        Returns:
+            A replica engine, or None if every replica is unhealthy.
+        """
+        healthy = self.healthy()
+        if not healthy:
+            return None
+        if self.strategy == LEAST_BUSY:
+            return min(healthy, key=lambda r: getattr(r.sync_engine.pool, "checkedout", lambda: 0)())
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica in healthy:
+                return replica
+        return None
+
+    def mark_unhealthy(self, replica: AsyncEngine) -> None:
+        """Take a replica out of rotation for `retry_after` seconds."""
+        self._unhealthy_until[replica] = time.monotonic() + self.retry_after
+
+    def mark_healthy(self, replica: AsyncEngine) -> None:
+        """Put a replica back into rotation immediately."""
+        self._unhealthy_until.pop(replica, None)
+
+    async def check_health(self) -> None:
+        """Ping every replica and update its health; meant for a periodic task."""
+        for replica in self.replicas:
+            try:
+                async with replica.connect() as conn:
+                    await conn.execute(text("SELECT 1"))
+            except Exception:
+                self.mark_unhealthy(replica)
+            else:
+                self.mark_healthy(replica)
+
+    def _on_error(self, replica: AsyncEngine, context) -> None:
+        if context.is_disconnect or context.connection is None:
+            self.mark_unhealthy(replica)
+
+
+class RoutingSession(Session):
+    """Session that sends reads from `read_only` repository methods to replicas.
+
+    Everything else - writes, flushes and reads outside a `read_only`
+    method - goes to the primary bind. Once the session has written, it
+    sticks to the primary for the rest of its life so callers always read
+    their own writes.
+    """
+    def __init__(self, *args, replicas: ReplicaSet | None = None, **kwargs):
+        """Initialize the session.
+
+        Args:
+            replicas: Replica set to route reads to. Without one, the session
+                behaves like a plain `Session`.
+        """
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, *, clause=None, **kwargs):
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.info[WROTE_KEY] = True
+        elif self.replicas is not None and self.info.get(READ_ONLY_KEY) and not self.info.get(WROTE_KEY):
+            replica = self.replicas.choose()
+            if replica is not None:
+                return replica.sync_engine
+        return super().get_bind(mapper, clause=clause, **kwargs)
+
+
+def read_only(method):
+    """Mark an async repository method as safe to serve from a read replica.
+
+    The decorated method's instance must expose the `AsyncSession` it uses
+    as `self.session`.
+    """
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        info = self.session.info
+        previous = info.get(READ_ONLY_KEY, False)
+        info[READ_ONLY_KEY] = True
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            info[READ_ONLY_KEY] = previous
+    return wrapper
@@ -0,0 +1,108 @@
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from project_management_core.infrastructure.repositories.db.routing import ReplicaSet
+
+# Applied to every connection. WAL lets readers run alongside the writer;
+# synchronous=NORMAL is durable in WAL mode except for the last commits
+# before a power loss; mmap and a large page cache keep hot pages out of
+# read() calls.
+DEFAULT_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 256 * 1024 * 1024,
+    "cache_size": -64 * 1024,
+    "temp_store": "MEMORY",
+    "busy_timeout": 5000,
+}
+
+
+def is_sqlite_url(url: str) -> bool:
+    """Return whether `url` points at a SQLite database."""
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def _is_memory(url: str) -> bool:
+    database = make_url(url).database
+    return not database or database == ":memory:" or "mode=memory" in url
+
+
+def _set_pragmas(engine: AsyncEngine, pragmas: dict[str, str | int]) -> None:
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def _begin_immediate(engine: AsyncEngine) -> None:
+    """Take the write lock at BEGIN so a transaction never fails upgrading to it.
+
+    The driver's own transaction handling is switched off so that SQLAlchemy
+    emits BEGIN itself.
+    """
+    @event.listens_for(engine.sync_engine, "connect")
+    def on_connect(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine.sync_engine, "begin")
+    def on_begin(connection):
+        connection.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(
+    url: str,
+    readers: int = 4,
+    pragmas: dict[str, str | int] | None = None,
+    **engine_kwargs,
+) -> tuple[AsyncEngine, ReplicaSet | None]:
+    """Create the engines of the embedded SQLite profile.
+
+    Writes go through a single connection, so they queue in the pool
+    instead of failing with "database is locked". Reads from `read_only`
+    repository methods go to a separate pool of `readers` query-only
+    connections, used like a read replica by `RoutingSession`; in WAL mode
+    they see the last committed state without blocking the writer.
+
+    An in-memory database can't be shared between connections, so for one
+    everything goes through the single writer connection and there are no
+    readers. Sessions take turns on it: a session waits in the pool until
+    the one before it has finished its transaction.
+
+    Args:
+        url: SQLite URL, e.g. "sqlite+aiosqlite:///data/app.db".
+        readers: Number of reader connections kept open.
+        pragmas: Pragmas set on every connection. Defaults to `DEFAULT_PRAGMAS`.
+        **engine_kwargs: Passed on to both `create_async_engine` calls.
+
+    Returns:
+        The writer engine, and a `ReplicaSet` of the reader engine (None
+        for an in-memory database).
+
+    Raises:
+        ValueError: If `url` is not a SQLite URL.
+    """
+    if not is_sqlite_url(url):
+        raise ValueError(f"Not a SQLite URL: {url}")
+    pragmas = dict(DEFAULT_PRAGMAS if pragmas is None else pragmas)
+
+    if _is_memory(url):
+        # The connection stays in the pool between sessions and holds the
+        # database, so it must never be handed to two sessions at once.
+        writer = create_async_engine(
+            url, poolclass=AsyncAdaptedQueuePool, pool_size=1, max_overflow=0, **engine_kwargs
+        )
+        _set_pragmas(writer, {k: v for k, v in pragmas.items() if k != "journal_mode"})
+        _begin_immediate(writer)
+        return writer, None
+
+    writer = create_async_engine(url, pool_size=1, max_overflow=0, **engine_kwargs)
+    _set_pragmas(writer, pragmas)
+    _begin_immediate(writer)
+
+    reader = create_async_engine(url, pool_size=readers, max_overflow=0, **engine_kwargs)
+    _set_pragmas(reader, {**pragmas, "query_only": "ON"})
+    return writer, ReplicaSet([reader])
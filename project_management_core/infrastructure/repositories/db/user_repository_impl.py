@@ -1,40 +1,65 @@
-from sqlalchemy import select
+from collections.abc import AsyncIterator
+
+from sqlalchemy import bindparam, delete, func, select, update
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from project_management_core.domain.entities.user import User
-from project_management_core.domain.repositories.user_repository import UserRepository
+from project_management_core.domain.repositories.errors import RepositoryError
+from project_management_core.domain.repositories.user_repository import (
+    UserRecordNotFoundError as UserRecordNotFoundError,
+    UserRepository,
+    UserVersionConflictError as UserVersionConflictError,
+)
+from project_management_core.domain.value_objects.email import normalize_email
+from project_management_core.infrastructure.invalidation import user_email_key, user_key
+from project_management_core.infrastructure.repositories.db.db_repository import (
+    AsyncRepository,
+)
 from project_management_core.infrastructure.repositories.db.models.db_models import (
     UserModel,
 )
+from project_management_core.infrastructure.repositories.db.routing import read_only
 
 
-class RepositoryError(Exception):
-    pass
-
-class UserRecordNotFoundError(RepositoryError):
-    """User not found in database."""
-
 class UserRepositoryError(RepositoryError):
     """Problem with saving/loading user from database."""
 
 class UserDataIntegrityError(RepositoryError):
     """Constraints validation"""
 
-class UserRepositoryImpl(UserRepository):
+
+def _to_user(row) -> User:
+    """Build a `User` entity from a stored row, marked as persisted."""
+    user = User(
+        id=row.id,
+        email=row.email,
+        password_hash=row.password_hash,
+        is_active=True,
+        version=row.version,
+    )
+    user.mark_persisted()
+    return user
+
+class UserRepositoryImpl(AsyncRepository, UserRepository):
     """SQLAlchemy-based implementation of the `UserRepository` interface."""
+    model = UserModel
+
     def __init__(self, session: AsyncSession) -> None:
         """Initialize the repository with an async database session.
 
         Args:
             session: Async SQLAlchemy session.
         """
-        self.session = session
+        super().__init__(session)
 
     
     async def create(self, user: User) -> User:
         """Persist a new user and return the stored entity.
 
+        The email is stored normalized (see `normalize_email`), so the stored
+        value, the `lower(email)` unique index and every lookup agree.
+
         Args:
             user: Domain user to persist.
 
@@ -47,25 +72,26 @@ class UserRepositoryImpl(UserRepository):
         """
         orm_user = UserModel(
             id = user.id,
-            email = user.email,
+            email = normalize_email(user.email),
             password_hash = user.password_hash,
         )
         try:
             self.session.add(orm_user)
+            await self.session.flush()
+            self._record_event("user.created", orm_user.id, {"id": orm_user.id, "email": orm_user.email})
+            self._invalidate(user_email_key(orm_user.email))
             await self.session.commit()
             await self.session.refresh(orm_user)
         except IntegrityError as e:
+            await self.session.rollback()
             raise UserDataIntegrityError(f"Integrity error: {e}")
         except SQLAlchemyError as e:
+            await self.session.rollback()
             raise UserRepositoryError(f"Database error: {e}")
 
-        return User(
-            id = orm_user.id,
-            email= orm_user.email,
-            password_hash= orm_user.password_hash,
-            is_active= True
-        )
+        return _to_user(orm_user)
 
+    @read_only
     async def get_by_id(self, user_id: int) -> User | None:
         """Fetch a user by ID.
 
@@ -78,16 +104,12 @@ class UserRepositoryImpl(UserRepository):
         Raises:
             UserRecordNotFoundError: If no user exists with the given ID.
         """
-        result = await self.session.get(UserModel, user_id)
+        result = await self.get_row(user_id)
         if result is None:
             raise UserRecordNotFoundError(f"No user found with ID: {user_id}")
-        return User(
-            id = result.id,
-            email= result.email,
-            password_hash= result.password_hash,
-            is_active= True
-        )
+        return _to_user(result)
 
+    @read_only
     async def get_by_email(self, email: str) -> User | None:
         """Fetch a user by email.
 
@@ -100,18 +122,59 @@ class UserRepositoryImpl(UserRepository):
         Raises:
             UserRecordNotFoundError: If no user exists with the given email.
         """
-        query = select(UserModel).where(UserModel.email == email)
-        result = await self.session.execute(query)
-        orm_user = result.scalar_one_or_none()
+        stmt = self._statement(
+            "get_by_email", lambda t: select(t).where(func.lower(t.c.email) == bindparam("email"))
+        )
+        orm_user = (await self.session.execute(stmt, {"email": normalize_email(email)})).one_or_none()
         if orm_user is None:
             raise UserRecordNotFoundError(f"No user found with email: {email}")
-        return User(
-            id = orm_user.id,
-            email= orm_user.email,
-            password_hash= orm_user.password_hash,
-            is_active= True
-        )
+        return _to_user(orm_user)
+
+    @read_only
+    async def email_exists(self, email: str) -> bool:
+        """Check whether a user is registered with an email, ignoring case.
+
+        Args:
+            email: Email address to look for.
+
+        Returns:
+            True if a user has that email.
+        """
+        return await self.exists(func.lower(UserModel.email) == normalize_email(email))
+
+    async def stream_emails(self, batch_size: int = 1000) -> AsyncIterator[str]:
+        """Iterate over the normalized emails of all users.
+
+        Rows are fetched `batch_size` at a time, so memory use does not
+        grow with the number of users.
+
+        Args:
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            Lowercased email addresses, in no particular order.
+        """
+        stmt = select(func.lower(UserModel.email)).execution_options(yield_per=batch_size)
+        result = await self.session.stream_scalars(stmt)
+        async for email in result:
+            yield email
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[User]:
+        """Iterate over all users in ID order using a server-side cursor.
+
+        Unlike `list_all`, at most `batch_size` rows are held in memory at
+        a time, so this is safe for exports of any size.
+
+        Args:
+            batch_size: Number of rows fetched per round trip.
+
+        Yields:
+            `User` entities.
+        """
+        async for row in self.stream(batch_size=batch_size):
+            yield _to_user(row)
 
+    @read_only
     async def list_all(self) -> list[User] :
         """List all users in the system.
 
@@ -126,48 +189,66 @@ class UserRepositoryImpl(UserRepository):
         orm_users = result.scalars().all()
         if not orm_users:
             raise UserRecordNotFoundError("No users found")
-        users = []
-        for orm_user in orm_users:
-            user = User(
-                id=orm_user.id,
-                email=orm_user.email,
-                password_hash=orm_user.password_hash,
-                is_active=True
-            )
-            users.append(user)
-        return users
+        return [_to_user(orm_user) for orm_user in orm_users]
 
 
     async def update(self, user: User) -> User | None:
-        """Update an existing user.
+        """Update an existing user with a single versioned `UPDATE ... RETURNING`.
+
+        Only fields changed since the user was loaded are written, and
+        nothing is sent at all if none changed. When `user.version` is set,
+        the row is only updated if its version still matches.
 
         Args:
             user: User with updated fields to persist.
 
         Returns:
-            The updated `User` entity.
+            The updated `User` entity with its new version.
 
         Raises:
             UserRecordNotFoundError: If the user does not exist.
+            UserVersionConflictError: If the user changed since it was loaded.
             UserRepositoryError: On general database errors.
         """
-        result = await self.session.get(UserModel, user.id)
-        if result is None:
-            raise UserRecordNotFoundError(f"Could not find user: {user}")
+        changes = user.changed_fields()
+        if not changes:
+            return user
+        if "email" in changes:
+            changes["email"] = normalize_email(changes["email"])
+
+        stmt = update(UserModel).where(UserModel.id == user.id)
+        if user.version is not None:
+            stmt = stmt.where(UserModel.version == user.version)
+        stmt = stmt.values(**changes, version=UserModel.version + 1).returning(
+            UserModel.id, UserModel.email, UserModel.password_hash, UserModel.version
+        )
         try:
-            result.email = user.email
-            result.password_hash = user.password_hash
+            row = (await self.session.execute(stmt)).one_or_none()
+            if row is not None:
+                # Never publish password hashes; only say which fields changed.
+                self._record_event(
+                    "user.updated", row.id, {"id": row.id, "email": row.email, "changed": sorted(changes)}
+                )
+                # A changed email frees the old address as well.
+                emails = {row.email, user.persisted_value("email", row.email)}
+                self._invalidate(user_key(row.id), *(user_email_key(email) for email in emails))
             await self.session.commit()
-            await self.session.refresh(result)
+        except IntegrityError as e:
+            await self.session.rollback()
+            raise UserDataIntegrityError(f"Integrity error: {e}")
         except SQLAlchemyError as e:
+            await self.session.rollback()
             raise UserRepositoryError(f"Could not update user {user.id}: {e}")
 
-        return User(
-            id = result.id,
-            email= result.email,
-            password_hash= result.password_hash,
-            is_active= True
-        )
+        if row is None:
+            if user.version is not None and await self.exists(UserModel.id == user.id):
+                raise UserVersionConflictError(
+                    f"User {user.id} was modified concurrently (expected version {user.version})"
+                )
+            raise UserRecordNotFoundError(f"Could not find user: {user}")
+        updated = _to_user(row)
+        updated.is_active = user.is_active
+        return updated
 
     async def delete(self, user_id: int) -> None:
         """Delete a user by ID.
@@ -177,10 +258,21 @@ class UserRepositoryImpl(UserRepository):
 
         Raises:
             UserRecordNotFoundError: If the user does not exist.
+            UserRepositoryError: On general database errors.
         """
-        result = await self.session.get(UserModel, user_id)
-        if result is None:
-            raise UserRecordNotFoundError(f'User {user_id} could not be found.') 
-        await self.session.delete(result)
-        await self.session.commit()
-        
\ No newline at end of file
+        stmt = self._statement(
+            "delete_returning_email",
+            lambda t: delete(t).where(t.c.id == bindparam("user_id")).returning(t.c.email),
+        )
+        try:
+            email = (await self.session.execute(stmt, {"user_id": user_id})).scalar_one_or_none()
+            deleted = email is not None
+            if deleted:
+                self._record_event("user.deleted", user_id, {"id": user_id})
+                self._invalidate(user_key(user_id), user_email_key(email))
+            await self.session.commit()
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            raise UserRepositoryError(f"Could not delete user {user_id}: {e}")
+        if not deleted:
+            raise UserRecordNotFoundError(f'User {user_id} could not be found.')
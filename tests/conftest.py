@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from project_management_core.infrastructure.repositories.db.models.db_models import Base
+from project_management_core.infrastructure.repositories.db.routing import RoutingSession
+from project_management_core.infrastructure.repositories.db.sqlite import create_sqlite_engines
+
+
+@pytest.fixture(params=["file", "memory"])
+async def sqlite_profile(request, tmp_path):
+    """A session maker over the embedded SQLite profile, with the schema created.
+
+    Runs once against a database file (one writer, pooled readers) and once
+    in memory (a single connection, no readers).
+    """
+    if request.param == "file":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'app.db'}"
+    else:
+        url = "sqlite+aiosqlite:///:memory:"
+    writer, replicas = create_sqlite_engines(url, readers=2)
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(writer, expire_on_commit=False, sync_session_class=RoutingSession, replicas=replicas)
+    await writer.dispose()
+    for reader in replicas.replicas if replicas else []:
+        await reader.dispose()
@@ -0,0 +1,158 @@
+import io
+import json
+import tarfile
+
+import pytest
+from sqlalchemy import select
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.services.document_service import DocumentService
+from project_management_core.infrastructure.archive import ProjectArchiveError, ProjectArchiver
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    OutboxEventModel,
+    ProjectMember,
+    ProjectModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+CONTENTS = {"a.txt": b"a" * 1000, "b.png": b"b" * 700, "c.txt": b"c" * 1500}
+
+
+@pytest.fixture
+async def source(sqlite_profile, tmp_path):
+    """A project with a member and three documents, one of them uploaded by the member."""
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        member = await UserRepositoryImpl(session).create(User(id=None, email="member@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(
+            Project(name="P", description="Archived", owner_id=owner.id)
+        )
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).add_user_to_project(project.id, member.id)
+    for (filename, content), uploader in zip(CONTENTS.items(), (owner, owner, member)):
+        async with sqlite_profile() as session:
+            await DocumentService(DocumentRepositoryImpl(session), str(tmp_path / "source")).upload_document(
+                io.BytesIO(content), filename, "text/plain", project.id, uploader.id, processing_priority=None
+            )
+    return owner, member, project
+
+
+async def export(session_maker, project_id, offset=0):
+    archiver = ProjectArchiver(session_maker, batch_size=2)
+    return b"".join([chunk async for chunk in archiver.export_project(project_id, offset=offset)])
+
+
+async def restored_documents(session_maker, project_id):
+    async with session_maker() as session:
+        documents = await DocumentRepositoryImpl(session).get_by_project(project_id)
+    return {document.original_filename: document for document in documents}
+
+
+async def events(session_maker, aggregate_ids, event_type):
+    async with session_maker() as session:
+        return list((await session.scalars(
+            select(OutboxEventModel.aggregate_id)
+            .where(OutboxEventModel.event_type == event_type, OutboxEventModel.aggregate_id.in_(aggregate_ids))
+        )).all())
+
+
+def with_manifest(archive, change):
+    """Rebuild `archive` with only its `project.json`, altered by `change`."""
+    with tarfile.open(fileobj=io.BytesIO(archive)) as tar:
+        manifest = json.load(tar.extractfile("project.json"))
+    data = change(manifest)
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w", format=tarfile.USTAR_FORMAT) as tar:
+        info = tarfile.TarInfo("project.json")
+        info.size = len(data)
+        tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+async def test_an_exported_project_is_restored_with_its_members_documents_and_events(
+    sqlite_profile, source, tmp_path
+):
+    owner, member, project = source
+    archive = await export(sqlite_profile, project.id)
+
+    progress = await ProjectArchiver(sqlite_profile, str(tmp_path / "restored")).import_project(io.BytesIO(archive))
+
+    assert (progress.documents, progress.documents_skipped) == (3, 0)
+    async with sqlite_profile() as session:
+        restored = await ProjectRepositoryImpl(session).get_by_id(progress.project_id)
+    assert (restored.name, restored.description, restored.owner_id) == ("P", "Archived", owner.id)
+    async with sqlite_profile() as session:
+        members = (await session.execute(
+            select(ProjectMember.user_id, ProjectMember.role).where(ProjectMember.project_id == progress.project_id)
+        )).all()
+    assert members == [(member.id, "participant")]
+    documents = await restored_documents(sqlite_profile, progress.project_id)
+    assert {name: open(d.file_path, "rb").read() for name, d in documents.items()} == CONTENTS
+    assert all(d.file_path.startswith(str(tmp_path / "restored")) for d in documents.values())
+    assert documents["c.txt"].uploaded_by == member.id
+    async with sqlite_profile() as session:
+        stats = await DocumentRepositoryImpl(session).get_project_stats(progress.project_id)
+    assert (stats.document_count, stats.total_bytes) == (3, sum(map(len, CONTENTS.values())))
+
+    assert await events(sqlite_profile, [progress.project_id], "project.created") == [progress.project_id]
+    assert await events(sqlite_profile, [progress.project_id], "project.member_added") == [progress.project_id]
+    document_ids = [d.id for d in documents.values()]
+    assert sorted(await events(sqlite_profile, document_ids, "document.uploaded")) == sorted(document_ids)
+
+
+async def test_an_interrupted_import_resumes_without_duplicates(sqlite_profile, source, tmp_path):
+    _, _, project = source
+    archive = await export(sqlite_profile, project.id)
+    cut = archive.index(b"documents/00000002/content") + 2 * tarfile.BLOCKSIZE
+    archiver = ProjectArchiver(sqlite_profile, str(tmp_path / "restored"), batch_size=1)
+
+    with pytest.raises(ProjectArchiveError) as interrupted:
+        await archiver.import_project(io.BytesIO(archive[:cut]))
+    project_id = interrupted.value.project_id
+    assert project_id is not None
+    assert set(await restored_documents(sqlite_profile, project_id)) == {"a.txt", "b.png"}
+    assert len(list((tmp_path / "restored").iterdir())) == 2
+
+    progress = await archiver.import_project(io.BytesIO(archive), resume_project_id=project_id)
+
+    assert (progress.project_id, progress.documents, progress.documents_skipped) == (project_id, 1, 2)
+    documents = await restored_documents(sqlite_profile, project_id)
+    assert {name: open(d.file_path, "rb").read() for name, d in documents.items()} == CONTENTS
+    assert len(list((tmp_path / "restored").iterdir())) == 3
+    assert await events(sqlite_profile, [project_id], "project.member_added") == [project_id]
+    async with sqlite_profile() as session:
+        stats = await DocumentRepositoryImpl(session).get_project_stats(project_id)
+    assert stats.document_count == 3
+
+
+async def test_an_export_resumes_from_an_offset(sqlite_profile, source):
+    _, _, project = source
+    archive = await export(sqlite_profile, project.id)
+
+    for offset in (0, 700, archive.index(b"b" * 700) + 100, len(archive) - 10, len(archive)):
+        assert await export(sqlite_profile, project.id, offset) == archive[offset:]
+
+
+@pytest.mark.parametrize("change", [
+    lambda manifest: json.dumps({**manifest, "project": {"name": "P", "description": None}}).encode(),
+    lambda manifest: json.dumps({k: v for k, v in manifest.items() if k != "owner"}).encode(),
+    lambda manifest: json.dumps({**manifest, "users": ["owner@example.com"]}).encode(),
+    lambda manifest: json.dumps({**manifest, "format": 2}).encode(),
+    lambda manifest: json.dumps([manifest]).encode(),
+    lambda manifest: b"{not json",
+])
+async def test_an_invalid_manifest_is_rejected_before_anything_is_written(sqlite_profile, source, tmp_path, change):
+    _, _, project = source
+    archive = with_manifest(await export(sqlite_profile, project.id), change)
+
+    with pytest.raises(ProjectArchiveError) as rejected:
+        await ProjectArchiver(sqlite_profile, str(tmp_path / "restored")).import_project(io.BytesIO(archive))
+
+    assert rejected.value.project_id is None
+    async with sqlite_profile() as session:
+        assert (await session.scalars(select(ProjectModel.id))).all() == [project.id]
@@ -0,0 +1,92 @@
+import pytest
+from sqlalchemy import select, update
+
+from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.repositories.document_repository import ProjectQuotaExceededError
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.models.db_models import (
+    ProjectDocumentStatsModel,
+    ProjectDocumentTypeStatsModel,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+@pytest.fixture
+async def project(sqlite_profile):
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        return await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=owner.id))
+
+
+async def add_document(session_maker, project, size, content_type="text/plain", quota_bytes=None):
+    document = Document(
+        original_filename="f", generated_filename="f", file_path="/nonexistent/f", file_size=size,
+        content_type=content_type, project_id=project.id, uploaded_by=project.owner_id,
+    )
+    async with session_maker() as session:
+        return await DocumentRepositoryImpl(session).create(
+            document, processing_priority=None, quota_bytes=quota_bytes
+        )
+
+
+async def stats(session_maker, project):
+    async with session_maker() as session:
+        return await DocumentRepositoryImpl(session).get_project_stats(project.id)
+
+
+async def test_counters_follow_creates_and_deletes(sqlite_profile, project):
+    first = await add_document(sqlite_profile, project, 100)
+    await add_document(sqlite_profile, project, 50, "image/png")
+
+    totals = await stats(sqlite_profile, project)
+    assert (totals.document_count, totals.total_bytes) == (2, 150)
+    assert totals.bytes_by_content_type == {"text/plain": 100, "image/png": 50}
+
+    async with sqlite_profile() as session:
+        await DocumentRepositoryImpl(session).delete(first.id)
+    totals = await stats(sqlite_profile, project)
+    assert (totals.document_count, totals.total_bytes) == (1, 50)
+    assert totals.bytes_by_content_type == {"image/png": 50}
+
+
+async def test_quota_rejects_a_document_that_does_not_fit(sqlite_profile, project):
+    await add_document(sqlite_profile, project, 60, quota_bytes=100)
+    with pytest.raises(ProjectQuotaExceededError):
+        await add_document(sqlite_profile, project, 41, quota_bytes=100)
+    await add_document(sqlite_profile, project, 40, quota_bytes=100)
+
+    async with sqlite_profile() as session:
+        assert len(await DocumentRepositoryImpl(session).get_by_project(project.id)) == 2
+    totals = await stats(sqlite_profile, project)
+    assert (totals.document_count, totals.total_bytes) == (2, 100)
+
+
+async def test_rebuild_restores_drifted_counters(sqlite_profile, project):
+    await add_document(sqlite_profile, project, 100)
+    await add_document(sqlite_profile, project, 50, "image/png")
+    async with sqlite_profile() as session:
+        await session.execute(update(ProjectDocumentStatsModel).values(document_count=7, total_bytes=1))
+        await session.execute(update(ProjectDocumentTypeStatsModel).values(total_bytes=0))
+        await session.commit()
+
+    async with sqlite_profile() as session:
+        await DocumentRepositoryImpl(session).rebuild_project_stats(project.id)
+    totals = await stats(sqlite_profile, project)
+    assert (totals.document_count, totals.total_bytes) == (2, 150)
+    assert totals.bytes_by_content_type == {"text/plain": 100, "image/png": 50}
+
+
+async def test_deleting_a_project_deletes_its_counters(sqlite_profile, project):
+    document = await add_document(sqlite_profile, project, 100)
+    async with sqlite_profile() as session:
+        await DocumentRepositoryImpl(session).delete(document.id)
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).delete(project.id)
+
+    async with sqlite_profile() as session:
+        for model in (ProjectDocumentStatsModel, ProjectDocumentTypeStatsModel):
+            assert (await session.execute(select(model))).all() == []
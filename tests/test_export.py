@@ -0,0 +1,118 @@
+import bz2
+import csv
+import gzip
+import io
+import json
+import lzma
+import os
+
+import pytest
+
+from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.infrastructure.export import ExportError, RecordExporter
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+DECOMPRESS = {None: lambda data: data, "gzip": gzip.decompress, "bz2": bz2.decompress, "xz": lzma.decompress}
+
+
+@pytest.fixture
+async def users(sqlite_profile):
+    created = []
+    for i in range(25):
+        async with sqlite_profile() as session:
+            created.append(await UserRepositoryImpl(session).create(
+                User(id=None, email=f"user{i}@example.com", password_hash="secret-hash")
+            ))
+    return created
+
+
+@pytest.fixture
+def exporter(sqlite_profile):
+    return RecordExporter(sqlite_profile, batch_size=4, buffer_size=64)
+
+
+@pytest.mark.parametrize("compression", list(DECOMPRESS))
+async def test_users_are_exported_with_each_compression(exporter, users, tmp_path, compression):
+    path = tmp_path / "users.jsonl"
+
+    result = await exporter.export_users(str(path), compression=compression)
+
+    data = path.read_bytes()
+    assert (result.rows, result.bytes) == (len(users), len(data))
+    lines = [json.loads(line) for line in DECOMPRESS[compression](data).splitlines()]
+    assert lines == [{"id": user.id, "email": user.email, "is_active": True} for user in users]
+    assert not os.path.exists(f"{path}.part")
+
+
+async def test_documents_are_exported_as_compressed_csv(sqlite_profile, exporter, users):
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=users[0].id))
+    for i in range(3):
+        async with sqlite_profile() as session:
+            await DocumentRepositoryImpl(session).create(Document(
+                original_filename=f"doc,{i}.pdf", generated_filename=f"{i}.pdf", file_path=f"/secret/{i}.pdf",
+                file_size=i, content_type="application/pdf", project_id=project.id, uploaded_by=users[0].id,
+            ), processing_priority=None)
+    output = io.BytesIO()
+
+    result = await exporter.export_documents(project.id, output, format="csv", compression="gzip")
+
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(output.getvalue()).decode())))
+    assert result.rows == 3
+    assert [row["original_filename"] for row in rows] == ["doc,0.pdf", "doc,1.pdf", "doc,2.pdf"]
+    assert "file_path" not in rows[0]
+
+
+def after_each_user(monkeypatch, callback):
+    """Call `callback` with each user as the export reads it."""
+    stream_all = UserRepositoryImpl.stream_all
+
+    async def observed_stream_all(self, batch_size=1000):
+        async for user in stream_all(self, batch_size):
+            yield user
+            callback(user)
+    monkeypatch.setattr(UserRepositoryImpl, "stream_all", observed_stream_all)
+
+
+async def test_output_is_written_to_a_part_file_and_renamed_once_complete(exporter, users, tmp_path, monkeypatch):
+    path = tmp_path / "users.jsonl.xz"
+    during = []
+    after_each_user(monkeypatch, lambda user: during.append((path.exists(), os.path.exists(f"{path}.part"))))
+
+    await exporter.export_users(str(path), compression="xz")
+
+    assert set(during) == {(False, True)}
+    assert lzma.decompress(path.read_bytes()).count(b"\n") == len(users)
+    assert not os.path.exists(f"{path}.part")
+
+
+async def test_a_failed_export_keeps_the_previous_file(exporter, users, tmp_path, monkeypatch):
+    path = tmp_path / "users.jsonl"
+    path.write_bytes(b"previous export\n")
+    during = []
+
+    def fail_after_eleven(user):
+        if user.id == users[10].id:
+            during.append((path.read_bytes(), os.path.exists(f"{path}.part")))
+            raise ConnectionError("connection lost")
+    after_each_user(monkeypatch, fail_after_eleven)
+
+    with pytest.raises(ExportError, match="after 11 rows"):
+        await exporter.export_users(str(path))
+
+    assert during == [(b"previous export\n", True)]
+    assert path.read_bytes() == b"previous export\n"
+    assert not os.path.exists(f"{path}.part")
+
+
+async def test_unknown_format_or_compression_is_rejected(exporter, tmp_path):
+    path = tmp_path / "users"
+    with pytest.raises(ValueError):
+        await exporter.export_users(str(path), format="xml")
+    with pytest.raises(ValueError):
+        await exporter.export_users(str(path), compression="zip")
+    assert not path.exists() and not os.path.exists(f"{path}.part")
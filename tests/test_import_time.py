@@ -0,0 +1,8 @@
+import pytest
+
+from benchmarks.import_time import CHECKS, run
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=lambda check: check.module)
+def test_import_stays_within_budget_and_dependencies(check):
+    assert run([check], runs=3)
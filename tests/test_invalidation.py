@@ -0,0 +1,165 @@
+import asyncio
+import json
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.services.email_filter import EmailBloomFilter
+from project_management_core.domain.services.password_hasher import UnknownEmailCache
+from project_management_core.infrastructure.invalidation import (
+    InMemoryHub,
+    InvalidationBus,
+    UnixSocketBroker,
+    UnixSocketTransport,
+    email_cache_subscriber,
+    project_key,
+    user_projects_key,
+)
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+class RecordingHub(InMemoryHub):
+    """An `InMemoryHub` that keeps every message sent through it."""
+    def __init__(self):
+        super().__init__()
+        self.sent: list[str] = []
+
+    def transport(self):
+        transport = super().transport()
+        send = transport.send
+
+        async def recording_send(message):
+            self.sent.append(message)
+            await send(message)
+        transport.send = recording_send
+        return transport
+
+
+async def start_bus(hub, **kwargs):
+    bus = InvalidationBus(hub.transport(), flush_interval=0.01, **kwargs)
+    received = []
+    bus.subscribe(received.append)
+    await bus.start()
+    return bus, received
+
+
+async def settle():
+    await asyncio.sleep(0.05)
+
+
+async def test_keys_published_together_are_coalesced_into_one_message():
+    hub = RecordingHub()
+    publisher, local = await start_bus(hub)
+    listener, remote = await start_bus(hub)
+
+    publisher.publish(["user:1", "project:1"])
+    publisher.publish(["project:1", "user_projects:1"])
+    await settle()
+
+    assert local == [frozenset({"user:1", "project:1"}), frozenset({"project:1", "user_projects:1"})]
+    assert len(hub.sent) == 1
+    assert remote == [frozenset({"user:1", "project:1", "user_projects:1"})]
+    await publisher.close()
+    await listener.close()
+
+
+async def test_a_bus_ignores_its_own_messages():
+    hub = RecordingHub()
+    bus, received = await start_bus(hub)
+
+    bus.publish(["user:1"])
+    await settle()
+
+    assert len(hub.sent) == 1
+    assert received == [frozenset({"user:1"})]
+    await bus.close()
+
+
+async def test_messages_are_split_under_the_payload_limit():
+    hub = RecordingHub()
+    publisher, _ = await start_bus(hub, max_message_bytes=200)
+    listener, remote = await start_bus(hub)
+    keys = {f"user:{i}" for i in range(100)}
+
+    publisher.publish(keys)
+    await settle()
+
+    assert len(hub.sent) > 1
+    assert all(len(message) <= 200 for message in hub.sent)
+    assert frozenset().union(*remote) == keys
+    assert sum(len(json.loads(message)["keys"]) for message in hub.sent) == len(keys)
+    await publisher.close()
+    await listener.close()
+
+
+async def test_close_sends_pending_keys():
+    hub = RecordingHub()
+    publisher = InvalidationBus(hub.transport(), flush_interval=60)
+    await publisher.start()
+    listener, remote = await start_bus(hub)
+
+    publisher.publish(["user:1"])
+    await publisher.close()
+    await settle()
+
+    assert remote == [frozenset({"user:1"})]
+    await listener.close()
+
+
+async def test_unix_socket_transport_relays_between_buses(tmp_path):
+    broker = UnixSocketBroker(str(tmp_path / "bus.sock"))
+    await broker.start()
+    publisher = InvalidationBus(UnixSocketTransport(broker.path), flush_interval=0.01)
+    listener = InvalidationBus(UnixSocketTransport(broker.path), flush_interval=0.01)
+    remote = []
+    listener.subscribe(remote.append)
+    await publisher.start()
+    await listener.start()
+
+    publisher.publish(["user:1"])
+    await settle()
+
+    assert remote == [frozenset({"user:1"})]
+    await publisher.close()
+    await listener.close()
+    await broker.close()
+
+
+def test_email_cache_subscriber_forgets_registered_emails():
+    unknown = UnknownEmailCache()
+    unknown.add("new@example.com")
+    unknown.add("other@example.com")
+    email_filter = EmailBloomFilter(capacity=100)
+    on_invalidate = email_cache_subscriber(unknown, email_filter)
+
+    on_invalidate(frozenset({"user_email:new@example.com", "user:7"}))
+
+    assert "new@example.com" not in unknown
+    assert "other@example.com" in unknown
+    assert email_filter.might_contain("new@example.com")
+
+
+async def test_project_update_invalidates_the_project_and_its_audience(sqlite_profile):
+    bus = InvalidationBus(InMemoryHub().transport())
+    bus.install(sqlite_profile)
+    received = []
+    bus.subscribe(received.append)
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        member = await UserRepositoryImpl(session).create(User(id=None, email="member@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=owner.id))
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).add_user_to_project(project.id, member.id)
+    received.clear()
+
+    async with sqlite_profile() as session:
+        repository = ProjectRepositoryImpl(session)
+        loaded = await repository.get_by_id(project.id)
+        loaded.change_name("Renamed")
+        await repository.update(loaded)
+
+    assert received == [frozenset({
+        project_key(project.id), user_projects_key(owner.id), user_projects_key(member.id),
+    })]
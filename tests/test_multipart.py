@@ -0,0 +1,145 @@
+import hashlib
+import os
+from datetime import datetime
+
+import pytest
+from sqlalchemy import update
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.infrastructure.multipart import (
+    OPEN,
+    MultipartChecksumMismatchError,
+    MultipartUploadError,
+    MultipartUploadManager,
+    MultipartUploadNotFoundError,
+    UploadedPart,
+)
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.models.db_models import UploadSessionModel
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+@pytest.fixture
+async def project(sqlite_profile):
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        return await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=owner.id))
+
+
+@pytest.fixture
+def uploads(sqlite_profile, tmp_path):
+    return MultipartUploadManager(sqlite_profile, upload_dir=str(tmp_path / "uploads"))
+
+
+async def initiate(uploads, project, filename="video.mp4"):
+    return await uploads.initiate(project.id, project.owner_id, filename, "video/mp4")
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def staged(uploads, upload):
+    return os.path.exists(os.path.join(uploads.staging_dir, upload.id))
+
+
+async def test_parts_sent_out_of_order_are_joined_by_part_number(sqlite_profile, uploads, project):
+    upload = await initiate(uploads, project)
+    contents = {5: b"third", 1: b"first-", 2: b"second-"}
+    sent = [
+        await uploads.upload_part(upload.id, number, data, checksum=sha256(data)) for number, data in contents.items()
+    ]
+    await uploads.upload_part(upload.id, 2, b"SECOND-")
+
+    assert [part.part_number for part in await uploads.list_parts(upload.id)] == [1, 2, 5]
+
+    document = await uploads.complete(upload.id)
+
+    with open(document.file_path, "rb") as f:
+        assert f.read() == b"first-SECOND-third"
+    assert (document.original_filename, document.file_size) == ("video.mp4", 18)
+    assert not staged(uploads, upload)
+    assert (await uploads.complete(upload.id, sent)).id == document.id
+    async with sqlite_profile() as session:
+        assert (await DocumentRepositoryImpl(session).get_project_stats(project.id)).total_bytes == 18
+
+
+async def test_completion_requires_every_listed_part(uploads, project):
+    upload = await initiate(uploads, project)
+    with pytest.raises(MultipartUploadError):
+        await uploads.complete(upload.id)
+    first = await uploads.upload_part(upload.id, 1, b"first-")
+    expected_second = UploadedPart(part_number=2, size=6, checksum=sha256(b"second"))
+
+    with pytest.raises(MultipartUploadError):
+        await uploads.complete(upload.id, [first, expected_second])
+    await uploads.upload_part(upload.id, 2, b"SECOND")
+    with pytest.raises(MultipartUploadError):
+        await uploads.complete(upload.id, [first, expected_second])
+
+    assert (await uploads.get_upload(upload.id)).status == OPEN
+    second = await uploads.upload_part(upload.id, 2, b"second")
+    document = await uploads.complete(upload.id, [second, first])
+    with open(document.file_path, "rb") as f:
+        assert f.read() == b"first-second"
+
+
+async def test_a_part_with_the_wrong_checksum_is_discarded(uploads, project):
+    upload = await initiate(uploads, project)
+
+    with pytest.raises(MultipartChecksumMismatchError):
+        await uploads.upload_part(upload.id, 1, b"data", checksum=sha256(b"other"))
+
+    assert await uploads.list_parts(upload.id) == []
+    assert os.listdir(os.path.join(uploads.staging_dir, upload.id)) == []
+
+
+async def test_abort_deletes_the_upload_and_its_parts(uploads, project):
+    upload = await initiate(uploads, project)
+    await uploads.upload_part(upload.id, 1, b"data")
+
+    await uploads.abort(upload.id)
+
+    assert not staged(uploads, upload)
+    with pytest.raises(MultipartUploadNotFoundError):
+        await uploads.list_parts(upload.id)
+    with pytest.raises(MultipartUploadNotFoundError):
+        await uploads.upload_part(upload.id, 2, b"data")
+    with pytest.raises(MultipartUploadNotFoundError):
+        await uploads.abort(upload.id)
+
+
+async def test_a_completed_upload_cannot_be_aborted(uploads, project):
+    upload = await initiate(uploads, project)
+    await uploads.upload_part(upload.id, 1, b"data")
+    document = await uploads.complete(upload.id)
+
+    with pytest.raises(MultipartUploadError):
+        await uploads.abort(upload.id)
+    assert (await uploads.complete(upload.id)).id == document.id
+
+
+async def test_collect_expired_deletes_only_expired_uploads(sqlite_profile, uploads, project):
+    expired = await initiate(uploads, project)
+    await uploads.upload_part(expired.id, 1, b"data")
+    live = await initiate(uploads, project)
+    await uploads.upload_part(live.id, 1, b"data")
+    async with sqlite_profile() as session:
+        await session.execute(
+            update(UploadSessionModel)
+            .where(UploadSessionModel.id == expired.id)
+            .values(expires_at=datetime(2000, 1, 1))
+        )
+        await session.commit()
+
+    assert await uploads.collect_expired() == 1
+
+    assert not staged(uploads, expired)
+    with pytest.raises(MultipartUploadNotFoundError):
+        await uploads.get_upload(expired.id)
+    assert staged(uploads, live)
+    assert [part.part_number for part in await uploads.list_parts(live.id)] == [1]
+    assert await uploads.collect_expired() == 0
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.infrastructure.outbox import (
+    EventSink,
+    FileSink,
+    OutboxDispatcher,
+    QueueSink,
+    UnixSocketSink,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import OutboxEventModel
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+class FailingSink(EventSink):
+    async def publish(self, events):
+        raise ConnectionError("sink unavailable")
+
+
+@pytest.fixture
+async def recorded(sqlite_profile):
+    """A user created and a project created and deleted through the repositories: three outbox events."""
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=owner.id))
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).delete(project.id)
+    return owner, project
+
+
+async def unpublished(session_maker):
+    async with session_maker() as session:
+        return (await session.execute(
+            select(OutboxEventModel.id).where(OutboxEventModel.published_at.is_(None))
+        )).all()
+
+
+async def test_recorded_events_are_dispatched_in_order_to_a_queue(sqlite_profile, recorded):
+    owner, project = recorded
+    sink = QueueSink()
+
+    assert await OutboxDispatcher(sqlite_profile, [sink]).drain() == 3
+
+    events = [sink.queue.get_nowait() for _ in range(sink.queue.qsize())]
+    assert [(e.event_type, e.aggregate_id) for e in events] == [
+        ("user.created", owner.id), ("project.created", project.id), ("project.deleted", project.id),
+    ]
+    assert events[1].payload["name"] == "P"
+    assert await unpublished(sqlite_profile) == []
+    assert await OutboxDispatcher(sqlite_profile, [sink]).dispatch_once() == 0
+
+
+async def test_events_are_claimed_in_batches(sqlite_profile, recorded):
+    dispatcher = OutboxDispatcher(sqlite_profile, [QueueSink()], batch_size=2)
+
+    assert await dispatcher.dispatch_once() == 2
+    assert len(await unpublished(sqlite_profile)) == 1
+    assert await dispatcher.dispatch_once() == 1
+
+
+async def test_a_failed_sink_leaves_the_batch_for_the_next_dispatch(sqlite_profile, recorded):
+    sink = QueueSink()
+    with pytest.raises(ConnectionError):
+        await OutboxDispatcher(sqlite_profile, [sink, FailingSink()]).dispatch_once()
+    assert len(await unpublished(sqlite_profile)) == 3
+
+    assert await OutboxDispatcher(sqlite_profile, [sink]).drain() == 3
+    assert sink.queue.qsize() == 6
+
+
+async def test_file_sink_appends_json_lines(sqlite_profile, recorded, tmp_path):
+    path = tmp_path / "events.jsonl"
+
+    await OutboxDispatcher(sqlite_profile, [FileSink(str(path))], batch_size=2).drain()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [line["event_type"] for line in lines] == ["user.created", "project.created", "project.deleted"]
+
+
+async def test_unix_socket_sink_streams_json_lines(sqlite_profile, recorded, tmp_path):
+    received = []
+
+    async def listen(reader, writer):
+        while line := await reader.readline():
+            received.append(json.loads(line))
+        writer.close()
+    server = await asyncio.start_unix_server(listen, str(tmp_path / "events.sock"))
+    sink = UnixSocketSink(str(tmp_path / "events.sock"))
+
+    await OutboxDispatcher(sqlite_profile, [sink]).drain()
+    await sink.close()
+    await asyncio.sleep(0.05)
+    server.close()
+    await server.wait_closed()
+
+    assert [event["event_type"] for event in received] == ["user.created", "project.created", "project.deleted"]
+
+
+async def test_purge_deletes_only_published_events(sqlite_profile, recorded):
+    dispatcher = OutboxDispatcher(sqlite_profile, [QueueSink()], batch_size=2)
+    await dispatcher.dispatch_once()
+
+    assert await dispatcher.purge_published(older_than=timedelta(0)) == 2
+    async with sqlite_profile() as session:
+        assert len((await session.execute(select(OutboxEventModel))).all()) == 1
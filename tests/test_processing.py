@@ -0,0 +1,129 @@
+import asyncio
+import io
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.services.document_service import DocumentService
+from project_management_core.infrastructure.processing import (
+    DONE,
+    FAILED,
+    PENDING,
+    RUNNING,
+    DocumentProcessingWorker,
+    DocumentProcessor,
+)
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.models.db_models import DocumentJobModel, DocumentModel
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+class FlakyProcessor(DocumentProcessor):
+    """Fails `failures` times, then tags the document with `tag`."""
+    def __init__(self, failures=0, tag="done", gate=None):
+        self.failures = failures
+        self.tag = tag
+        self.gate = gate
+
+    def process(self, path, document):
+        if self.gate is not None:
+            self.gate.wait(5)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("flaky")
+        return {"by": self.tag}
+
+
+@pytest.fixture
+async def document(sqlite_profile, tmp_path):
+    async with sqlite_profile() as session:
+        owner = await UserRepositoryImpl(session).create(User(id=None, email="owner@example.com", password_hash="h"))
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(Project(name="P", description="", owner_id=owner.id))
+    async with sqlite_profile() as session:
+        return await DocumentService(DocumentRepositoryImpl(session), str(tmp_path)).upload_document(
+            io.BytesIO(b"data"), "a.txt", "text/plain", project.id, owner.id
+        )
+
+
+async def job(session_maker):
+    async with session_maker() as session:
+        return (await session.execute(select(DocumentJobModel))).scalar_one()
+
+
+async def make_due(session_maker):
+    async with session_maker() as session:
+        await session.execute(update(DocumentJobModel).values(run_after=datetime(2000, 1, 1)))
+        await session.commit()
+
+
+def utcnow():
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def test_failed_jobs_back_off_exponentially_then_fail(sqlite_profile, document):
+    worker = DocumentProcessingWorker(sqlite_profile, [FlakyProcessor(failures=3)], max_attempts=3, retry_delay=60)
+
+    delays = []
+    for _ in range(2):
+        assert await worker.process_once() == 1
+        queued = await job(sqlite_profile)
+        assert (queued.status, queued.last_error) == (PENDING, "RuntimeError: flaky")
+        delays.append((queued.run_after - utcnow()).total_seconds())
+        assert await worker.process_once() == 0
+        await make_due(sqlite_profile)
+    assert 55 < delays[0] <= 60 and 115 < delays[1] <= 120
+
+    assert await worker.process_once() == 1
+    failed = await job(sqlite_profile)
+    assert (failed.status, failed.attempts) == (FAILED, 3)
+    await make_due(sqlite_profile)
+    assert await worker.process_once() == 0
+
+
+async def test_a_retried_job_records_its_result(sqlite_profile, document):
+    worker = DocumentProcessingWorker(sqlite_profile, [FlakyProcessor(failures=1)], retry_delay=0)
+
+    assert await worker.drain() == 2
+
+    finished = await job(sqlite_profile)
+    assert (finished.status, finished.attempts, finished.last_error) == (DONE, 2, None)
+    async with sqlite_profile() as session:
+        assert (await session.get(DocumentModel, document.id)).file_metadata == {"by": "done"}
+
+
+async def test_a_stale_worker_does_not_overwrite_the_worker_that_took_over(sqlite_profile, document):
+    gate = threading.Event()
+    stale = DocumentProcessingWorker(sqlite_profile, [FlakyProcessor(tag="stale", gate=gate)], lease=0)
+    fresh = DocumentProcessingWorker(sqlite_profile, [FlakyProcessor(tag="fresh")])
+
+    running = asyncio.create_task(stale.process_once())
+    await asyncio.sleep(0.2)
+    assert await fresh.process_once() == 1
+    gate.set()
+    await running
+
+    finished = await job(sqlite_profile)
+    assert (finished.status, finished.attempts) == (DONE, 2)
+    async with sqlite_profile() as session:
+        assert (await session.get(DocumentModel, document.id)).file_metadata == {"by": "fresh"}
+
+
+async def test_an_expired_lease_on_the_last_attempt_fails_the_job(sqlite_profile, document):
+    async with sqlite_profile() as session:
+        await session.execute(update(DocumentJobModel).values(
+            status=RUNNING, attempts=3, run_after=utcnow() - timedelta(seconds=1),
+        ))
+        await session.commit()
+    worker = DocumentProcessingWorker(sqlite_profile, [FlakyProcessor()], max_attempts=3)
+
+    assert await worker.process_once() == 0
+
+    failed = await job(sqlite_profile)
+    assert (failed.status, failed.attempts) == (FAILED, 3)
+    assert failed.last_error == "Lease expired on the last attempt"
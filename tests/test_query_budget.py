@@ -0,0 +1,81 @@
+import pytest
+from sqlalchemy import LABEL_STYLE_TABLENAME_PLUS_COL, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from project_management_core.infrastructure.repositories.db.models.db_models import Base, DocumentModel, UserModel
+from project_management_core.infrastructure.repositories.db.query_budget import (
+    QueryBudget,
+    QueryBudgetExceededError,
+    statement_shape,
+)
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+@pytest.fixture
+async def session_maker(tmp_path):
+    """A SQLite database holding three users."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'budget.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            UserModel.__table__.insert(),
+            [{"id": i, "email": f"user{i}@example.com", "password_hash": "h"} for i in (1, 2, 3)],
+        )
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def get_users(session_maker, user_ids):
+    async with session_maker() as session:
+        return [await UserRepositoryImpl(session).get_by_id(user_id) for user_id in user_ids]
+
+
+def test_statement_shape_ignores_values_and_aliases():
+    assert statement_shape("SELECT * FROM t WHERE a = 5 AND b IN (?, ?, ?) AND c = 'x''y'") == (
+        "SELECT * FROM t WHERE a = ? AND b IN (?) AND c = ?"
+    )
+    assert statement_shape("INSERT INTO t (a, b) VALUES (?, ?), (?, ?)") == "INSERT INTO t (a, b) VALUES (?, ?)"
+    assert statement_shape("SELECT CAST(a AS INTEGER) FROM t") == "SELECT CAST(a AS INTEGER) FROM t"
+
+    # The same row read through Core and through `session.get`.
+    core = str(select(DocumentModel.__table__).where(DocumentModel.id == 1))
+    orm = str(select(DocumentModel).where(DocumentModel.id == 1).set_label_style(LABEL_STYLE_TABLENAME_PLUS_COL))
+    assert " AS documents_id" in orm
+    assert statement_shape(core) == statement_shape(orm)
+
+
+async def test_within_budget(session_maker):
+    async with QueryBudget(max_queries=1) as budget:
+        await get_users(session_maker, [1])
+    assert budget.count == 1
+    assert budget.repeated == {}
+
+
+async def test_over_budget_raises(session_maker):
+    with pytest.raises(QueryBudgetExceededError, match="2 statements, budget 1"):
+        async with QueryBudget(max_queries=1, max_repeats=None):
+            await get_users(session_maker, [1, 2])
+
+
+async def test_repeated_statement_is_an_n_plus_one(session_maker):
+    with pytest.raises(QueryBudgetExceededError, match="N\\+1: 3x") as raised:
+        async with QueryBudget():
+            await get_users(session_maker, [1, 2, 3])
+    assert raised.value.budget.count == 3
+
+
+async def test_decorator_checks_every_call(session_maker):
+    @QueryBudget(max_queries=1)
+    async def load(user_ids):
+        return await get_users(session_maker, user_ids)
+
+    assert len(await load([1])) == 1
+    with pytest.raises(QueryBudgetExceededError, match="load"):
+        await load([1, 2])
+
+
+async def test_non_strict_budget_only_warns(session_maker, caplog):
+    async with QueryBudget(max_queries=1, strict=False) as budget:
+        await get_users(session_maker, [1, 2])
+    assert budget.violations()
+    assert "Query budget exceeded" in caplog.text
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.repositories.user_repository import UserRecordNotFoundError
+from project_management_core.infrastructure.repositories.db.models.db_models import Base, UserModel
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.routing import ReplicaSet, RoutingSession
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+@pytest.fixture
+async def databases(tmp_path):
+    """A primary and a replica SQLite file holding different copies of user 1."""
+    primary = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'primary.db'}")
+    replica = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    for engine, email in ((primary, "primary@example.com"), (replica, "replica@example.com")):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(UserModel.__table__.insert(), {"id": 1, "email": email, "password_hash": "h"})
+    replicas = ReplicaSet([replica])
+    session_maker = async_sessionmaker(
+        primary, expire_on_commit=False, sync_session_class=RoutingSession, replicas=replicas
+    )
+    yield session_maker, replicas
+    await primary.dispose()
+    await replica.dispose()
+
+
+async def test_read_only_methods_read_from_the_replica(databases):
+    session_maker, _ = databases
+    async with session_maker() as session:
+        user = await UserRepositoryImpl(session).get_by_id(1)
+    assert user.email == "replica@example.com"
+
+
+async def test_writes_go_to_the_primary_and_the_session_then_sticks_to_it(databases):
+    session_maker, _ = databases
+    async with session_maker() as session:
+        repository = UserRepositoryImpl(session)
+        await repository.create(User(id=2, email="new@example.com", password_hash="h"))
+        assert (await repository.get_by_id(1)).email == "primary@example.com"
+        assert (await repository.get_by_id(2)).email == "new@example.com"
+
+    async with session_maker() as session:
+        with pytest.raises(UserRecordNotFoundError):
+            await UserRepositoryImpl(session).get_by_id(2)
+
+
+async def test_reads_fall_back_to_the_primary_while_the_replica_is_unhealthy(databases):
+    session_maker, replicas = databases
+    replicas.mark_unhealthy(replicas.replicas[0])
+    async with session_maker() as session:
+        assert (await UserRepositoryImpl(session).get_by_id(1)).email == "primary@example.com"
+
+    replicas.mark_healthy(replicas.replicas[0])
+    async with session_maker() as session:
+        assert (await UserRepositoryImpl(session).get_by_id(1)).email == "replica@example.com"
+
+
+async def test_change_feed_is_read_from_the_primary(databases):
+    session_maker, _ = databases
+    async with session_maker() as session:
+        await ProjectRepositoryImpl(session).create(Project(name="Primary only", description="", owner_id=1))
+
+    async with session_maker() as session:
+        changes = await ProjectRepositoryImpl(session).changes_since(1)
+    assert [project.name for project in changes.projects] == ["Primary only"]
@@ -0,0 +1,160 @@
+import pytest
+from sqlalchemy import text, update
+
+from project_management_core.domain.entities.document import Document
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.models.db_models import DocumentModel
+from project_management_core.infrastructure.repositories.db.project_repository_impl import ProjectRepositoryImpl
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+async def create_user(session_maker, email):
+    async with session_maker() as session:
+        return await UserRepositoryImpl(session).create(User(id=None, email=email, password_hash="h"))
+
+
+async def create_project(session_maker, owner, name, description=""):
+    async with session_maker() as session:
+        return await ProjectRepositoryImpl(session).create(
+            Project(name=name, description=description, owner_id=owner.id)
+        )
+
+
+async def search_projects(session_maker, user, query):
+    async with session_maker() as session:
+        return [project.name for project in await ProjectRepositoryImpl(session).search_projects(user.id, query)]
+
+
+async def search_documents(session_maker, project, query, content_type=None):
+    async with session_maker() as session:
+        documents = await DocumentRepositoryImpl(session).search_by_filename(project.id, query, content_type)
+    return [document.original_filename for document in documents]
+
+
+async def fts_rowids(session_maker, table, match):
+    """Rowids the FTS5 index itself returns, without joining the content table."""
+    async with session_maker() as session:
+        return (await session.scalars(
+            text(f"SELECT rowid FROM {table} WHERE {table} MATCH :match ORDER BY rowid"), {"match": match}
+        )).all()
+
+
+async def assert_fts_in_sync(session_maker, table):
+    async with session_maker() as session:
+        await session.execute(text(f"INSERT INTO {table}({table}) VALUES ('integrity-check')"))
+        await session.commit()
+
+
+@pytest.fixture
+async def owner(sqlite_profile):
+    return await create_user(sqlite_profile, "owner@example.com")
+
+
+@pytest.fixture
+async def project(sqlite_profile, owner):
+    return await create_project(sqlite_profile, owner, "Documents")
+
+
+async def add_document(session_maker, project, filename, content_type="application/pdf"):
+    document = Document(
+        original_filename=filename, generated_filename=filename, file_path=f"/nonexistent/{filename}",
+        file_size=1, content_type=content_type, project_id=project.id, uploaded_by=project.owner_id,
+    )
+    async with session_maker() as session:
+        return await DocumentRepositoryImpl(session).create(document, processing_priority=None)
+
+
+async def test_project_name_matches_rank_above_description_matches(sqlite_profile, owner):
+    await create_project(sqlite_profile, owner, "Launch plan", "Apollo mission notes")
+    await create_project(sqlite_profile, owner, "Apollo", "Flight hardware")
+    await create_project(sqlite_profile, owner, "Unrelated", "Nothing to see")
+
+    assert await search_projects(sqlite_profile, owner, "apollo") == ["Apollo", "Launch plan"]
+
+
+async def test_project_search_requires_every_term_and_completes_the_last(sqlite_profile, owner):
+    await create_project(sqlite_profile, owner, "Apollo", "Flight hardware")
+    await create_project(sqlite_profile, owner, "Apollo archive", "Mission photos")
+
+    assert await search_projects(sqlite_profile, owner, "apollo miss") == ["Apollo archive"]
+    assert await search_projects(sqlite_profile, owner, "APOL") == ["Apollo", "Apollo archive"]
+    assert await search_projects(sqlite_profile, owner, '"*()') == []
+
+
+async def test_project_search_only_covers_accessible_projects(sqlite_profile, owner):
+    other = await create_user(sqlite_profile, "other@example.com")
+    member = await create_user(sqlite_profile, "member@example.com")
+    shared = await create_project(sqlite_profile, other, "Apollo shared")
+    await create_project(sqlite_profile, other, "Apollo private")
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).add_user_to_project(shared.id, member.id)
+
+    assert await search_projects(sqlite_profile, owner, "apollo") == []
+    assert await search_projects(sqlite_profile, member, "apollo") == ["Apollo shared"]
+
+
+async def test_project_index_follows_updates_and_deletes(sqlite_profile, owner):
+    project = await create_project(sqlite_profile, owner, "Apollo", "Flight hardware")
+
+    async with sqlite_profile() as session:
+        repository = ProjectRepositoryImpl(session)
+        loaded = await repository.get_by_id(project.id)
+        loaded.change_name("Gemini")
+        await repository.update(loaded)
+
+    assert await search_projects(sqlite_profile, owner, "apollo") == []
+    assert await search_projects(sqlite_profile, owner, "gemini") == ["Gemini"]
+    assert await fts_rowids(sqlite_profile, "projects_fts", "apollo") == []
+    await assert_fts_in_sync(sqlite_profile, "projects_fts")
+
+    async with sqlite_profile() as session:
+        await ProjectRepositoryImpl(session).delete(project.id)
+
+    assert await fts_rowids(sqlite_profile, "projects_fts", "gemini OR hardware") == []
+    await assert_fts_in_sync(sqlite_profile, "projects_fts")
+
+
+async def test_filename_prefix_matches_rank_above_substring_matches(sqlite_profile, project):
+    for filename in ("annual_report.pdf", "report.pdf", "summary.txt", "Reporting.txt"):
+        await add_document(sqlite_profile, project, filename)
+
+    results = await search_documents(sqlite_profile, project, "report")
+
+    assert set(results[:2]) == {"report.pdf", "Reporting.txt"}
+    assert results[2:] == ["annual_report.pdf"]
+    assert await search_documents(sqlite_profile, project, "REPORT.PDF") == ["report.pdf", "annual_report.pdf"]
+
+
+async def test_filename_search_filters_and_falls_back_for_short_terms(sqlite_profile, owner, project):
+    elsewhere = await create_project(sqlite_profile, owner, "Elsewhere")
+    await add_document(sqlite_profile, project, "summary.txt", "text/plain")
+    await add_document(sqlite_profile, project, "sum.pdf")
+    await add_document(sqlite_profile, elsewhere, "summary.pdf")
+
+    assert await search_documents(sqlite_profile, project, "summ") == ["summary.txt"]
+    assert await search_documents(sqlite_profile, project, "su") == ["sum.pdf", "summary.txt"]
+    assert await search_documents(sqlite_profile, project, "sum", content_type="application/pdf") == ["sum.pdf"]
+    assert await search_documents(sqlite_profile, project, 'su"m') == []
+
+
+async def test_filename_index_follows_renames_and_deletes(sqlite_profile, project):
+    document = await add_document(sqlite_profile, project, "draft.pdf")
+
+    async with sqlite_profile() as session:
+        await session.execute(
+            update(DocumentModel).where(DocumentModel.id == document.id).values(original_filename="final.pdf")
+        )
+        await session.commit()
+
+    assert await search_documents(sqlite_profile, project, "draft") == []
+    assert await search_documents(sqlite_profile, project, "final") == ["final.pdf"]
+    assert await fts_rowids(sqlite_profile, "documents_fts", '"draft"') == []
+    await assert_fts_in_sync(sqlite_profile, "documents_fts")
+
+    async with sqlite_profile() as session:
+        await DocumentRepositoryImpl(session).delete(document.id)
+
+    assert await fts_rowids(sqlite_profile, "documents_fts", '"final"') == []
+    await assert_fts_in_sync(sqlite_profile, "documents_fts")
@@ -0,0 +1,111 @@
+import asyncio
+import io
+
+import pytest
+
+from project_management_core.domain.entities.document import DocumentFilter
+from project_management_core.domain.entities.project import Project
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.repositories.user_repository import UserRecordNotFoundError
+from project_management_core.domain.services.document_service import DocumentQuotaExceededError, DocumentService
+from project_management_core.infrastructure.repositories.db.document_repository_impl import DocumentRepositoryImpl
+from project_management_core.infrastructure.repositories.db.project_repository_impl import (
+    ProjectNotFoundError,
+    ProjectRepositoryImpl,
+)
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+async def create_user(session_maker, email):
+    async with session_maker() as session:
+        return await UserRepositoryImpl(session).create(User(id=None, email=email, password_hash="h"))
+
+
+async def test_user_crud(sqlite_profile):
+    user = await create_user(sqlite_profile, "Ada@Example.com")
+
+    async with sqlite_profile() as session:
+        repository = UserRepositoryImpl(session)
+        loaded = await repository.get_by_email("ada@example.com")
+        assert loaded.id == user.id
+        loaded.email = "lovelace@example.com"
+        await repository.update(loaded)
+
+    async with sqlite_profile() as session:
+        repository = UserRepositoryImpl(session)
+        assert (await repository.get_by_id(user.id)).email == "lovelace@example.com"
+        await repository.delete(user.id)
+
+    async with sqlite_profile() as session:
+        with pytest.raises(UserRecordNotFoundError):
+            await UserRepositoryImpl(session).get_by_id(user.id)
+
+
+async def test_concurrent_writes_queue_for_the_writer(sqlite_profile):
+    users = await asyncio.gather(*(create_user(sqlite_profile, f"user{i}@example.com") for i in range(5)))
+
+    assert len({user.id for user in users}) == 5
+    async with sqlite_profile() as session:
+        assert len(await UserRepositoryImpl(session).list_all()) == 5
+
+
+async def test_membership_and_change_feed(sqlite_profile):
+    owner = await create_user(sqlite_profile, "owner@example.com")
+    member = await create_user(sqlite_profile, "member@example.com")
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(
+            Project(name="Shared", description="", owner_id=owner.id)
+        )
+    async with sqlite_profile() as session:
+        membership = await ProjectRepositoryImpl(session).add_user_to_project(project.id, member.id)
+    assert membership.added
+
+    async with sqlite_profile() as session:
+        repository = ProjectRepositoryImpl(session)
+        assert [p.id for p in await repository.get_for_user(member.id)] == [project.id]
+        changes = await repository.changes_since(member.id)
+    assert [p.id for p in changes.projects] == [project.id]
+
+    async with sqlite_profile() as session:
+        assert await ProjectRepositoryImpl(session).remove_user_from_project(project.id, member.id)
+    async with sqlite_profile() as session:
+        with pytest.raises(ProjectNotFoundError):
+            await ProjectRepositoryImpl(session).get_for_user(member.id)
+
+
+async def test_document_listing_feed_and_quota(sqlite_profile, tmp_path):
+    owner = await create_user(sqlite_profile, "owner@example.com")
+    async with sqlite_profile() as session:
+        project = await ProjectRepositoryImpl(session).create(
+            Project(name="Docs", description="", owner_id=owner.id)
+        )
+
+    def documents(session):
+        return DocumentService(DocumentRepositoryImpl(session), str(tmp_path / "uploads"), project_quota_bytes=10)
+
+    uploaded = []
+    for name, content in (("a.txt", b"aaa"), ("b.txt", b"bbbb"), ("c.txt", b"cc")):
+        async with sqlite_profile() as session:
+            uploaded.append(await documents(session).upload_document(
+                io.BytesIO(content), name, "text/plain", project.id, owner.id
+            ))
+
+    async with sqlite_profile() as session:
+        service = documents(session)
+        page = await service.list_documents(project.id, DocumentFilter(min_size=3), sort="file_size")
+        feed = await service.get_recent_documents(owner.id)
+        stats = await service.get_project_stats(project.id)
+    assert [d.original_filename for d in page.documents] == ["b.txt", "a.txt"]
+    assert page.total == 2
+    assert [d.original_filename for d in feed.documents] == ["c.txt", "b.txt", "a.txt"]
+    assert (stats.document_count, stats.total_bytes) == (3, 9)
+
+    async with sqlite_profile() as session:
+        with pytest.raises(DocumentQuotaExceededError):
+            await documents(session).upload_document(io.BytesIO(b"dd"), "d.txt", "text/plain", project.id, owner.id)
+
+    async with sqlite_profile() as session:
+        await documents(session).delete_document(uploaded[1].id, owner.id)
+    async with sqlite_profile() as session:
+        stats = await documents(session).get_project_stats(project.id)
+    assert (stats.document_count, stats.total_bytes) == (2, 5)
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from sqlalchemy import update
+
+from project_management_core.domain.entities.user import User
+from project_management_core.domain.repositories.user_repository import UserVersionConflictError
+from project_management_core.domain.services.password_hasher import PasswordHasher, UnknownEmailCache
+from project_management_core.domain.services.user_service import (
+    InvalidCredentialsError,
+    UserConflictError,
+    UserService,
+)
+from project_management_core.infrastructure.repositories.db.models.db_models import UserModel
+from project_management_core.infrastructure.repositories.db.query_budget import QueryBudget
+from project_management_core.infrastructure.repositories.db.user_repository_impl import UserRepositoryImpl
+
+
+class ConcurrentlyModifiedUserRepository(UserRepositoryImpl):
+    """Bumps the stored version right after each load, as a concurrent writer would."""
+    async def get_by_id(self, user_id):
+        user = await super().get_by_id(user_id)
+        await self.session.execute(
+            update(UserModel).where(UserModel.id == user_id).values(version=UserModel.version + 1)
+        )
+        await self.session.commit()
+        return user
+
+
+class CountingHasher(PasswordHasher):
+    """Counts real and dummy verifications."""
+    def __init__(self, rounds=4):
+        super().__init__(rounds=rounds)
+        self.verified = 0
+        self.dummy_verified = 0
+
+    async def verify(self, password, password_hash):
+        self.verified += 1
+        return await super().verify(password, password_hash)
+
+    async def verify_dummy(self, password):
+        self.dummy_verified += 1
+        await super().verify_dummy(password)
+
+
+async def create_user(session_maker, email="user@example.com"):
+    async with session_maker() as session:
+        return await UserRepositoryImpl(session).create(User(id=None, email=email, password_hash="h"))
+
+
+async def test_update_of_a_stale_copy_is_a_version_conflict(sqlite_profile):
+    user = await create_user(sqlite_profile)
+    async with sqlite_profile() as session:
+        first = await UserRepositoryImpl(session).get_by_id(user.id)
+    async with sqlite_profile() as session:
+        second = await UserRepositoryImpl(session).get_by_id(user.id)
+
+    first.password_hash = "first"
+    async with sqlite_profile() as session:
+        assert (await UserRepositoryImpl(session).update(first)).version == first.version + 1
+    second.password_hash = "second"
+    async with sqlite_profile() as session:
+        with pytest.raises(UserVersionConflictError):
+            await UserRepositoryImpl(session).update(second)
+
+    async with sqlite_profile() as session:
+        assert (await UserRepositoryImpl(session).get_by_id(user.id)).password_hash == "first"
+
+
+async def test_change_user_password_reports_a_concurrent_change(sqlite_profile):
+    user = await create_user(sqlite_profile)
+    async with sqlite_profile() as session:
+        service = UserService(ConcurrentlyModifiedUserRepository(session), PasswordHasher(rounds=4))
+        with pytest.raises(UserConflictError):
+            await service.change_user_password(user.id, "a new password")
+
+
+async def register(session_maker, email, password, rounds=4):
+    async with session_maker() as session:
+        return await UserService(UserRepositoryImpl(session), PasswordHasher(rounds=rounds)).register_user(
+            email, password
+        )
+
+
+async def test_unknown_emails_are_cached_and_still_cost_a_verification(sqlite_profile):
+    hasher = CountingHasher()
+    unknown = UnknownEmailCache()
+    async with sqlite_profile() as session:
+        service = UserService(UserRepositoryImpl(session), hasher, unknown_email_cache=unknown)
+        with pytest.raises(InvalidCredentialsError):
+            await service.authenticate("Nobody@Example.com", "password")
+        assert "nobody@example.com" in unknown
+
+        async with QueryBudget(max_queries=0):
+            with pytest.raises(InvalidCredentialsError):
+                await service.authenticate("nobody@example.com", "password")
+    assert (hasher.dummy_verified, hasher.verified) == (2, 0)
+
+
+async def test_wrong_password_is_rejected_with_a_real_verification(sqlite_profile):
+    await register(sqlite_profile, "user@example.com", "right password")
+    hasher = CountingHasher()
+    async with sqlite_profile() as session:
+        service = UserService(UserRepositoryImpl(session), hasher, unknown_email_cache=UnknownEmailCache())
+        with pytest.raises(InvalidCredentialsError):
+            await service.authenticate("user@example.com", "wrong password")
+    assert (hasher.dummy_verified, hasher.verified) == (0, 1)
+
+
+async def test_login_rehashes_a_password_made_with_another_work_factor(sqlite_profile):
+    registered = await register(sqlite_profile, "user@example.com", "right password", rounds=4)
+    hasher = PasswordHasher(rounds=5)
+    async with sqlite_profile() as session:
+        service = UserService(UserRepositoryImpl(session), hasher, unknown_email_cache=UnknownEmailCache())
+        user = await service.authenticate("user@example.com", "right password")
+    assert user.version == registered.version + 1
+    assert not hasher.needs_rehash(user.password_hash)
+
+    async with sqlite_profile() as session:
+        service = UserService(UserRepositoryImpl(session), hasher, unknown_email_cache=UnknownEmailCache())
+        again = await service.authenticate("user@example.com", "right password")
+    assert again.version == user.version
+
+
+def test_a_hasher_can_be_shared_by_several_event_loops():
+    hasher = PasswordHasher(rounds=4, max_concurrency=1)
+
+    async def hash_concurrently():
+        return await asyncio.gather(*(hasher.hash("password") for _ in range(3)))
+    for _ in range(2):
+        assert len(asyncio.run(hash_concurrently())) == 3